@@ -0,0 +1,100 @@
+"""Memory benchmark for in-memory rule records.
+
+Builds a synthetic corpus by cycling the template rules under new names,
+then measures (with tracemalloc) the bytes per rule held by:
+
+- dicts: the per-rule dicts single-file generation used to build (name,
+  priority, description and the full body)
+- records: ``lib.rule.Rule`` slots records with interned values and bodies
+  left on disk
+
+Usage:
+    python benchmarks/rule_memory.py [--rules 10000]
+"""
+
+import argparse
+import gc
+import os
+import re
+import shutil
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SRC_DIR))
+
+from lib.common import extract_frontmatter  # noqa: E402
+from lib.rule import Rule, extract_priority  # noqa: E402
+
+
+def make_corpus(folder: Path, count: int):
+    templates = sorted(
+        path for path in (SRC_DIR / "rules").glob("**/*.md") if path.name != "README.md"
+    )
+    paths = []
+    for i in range(count):
+        path = folder / f"{i % 100:02d}-rule{i}.md"
+        shutil.copyfile(templates[i % len(templates)], path)
+        paths.append(str(path))
+    return paths
+
+
+def load_dicts(paths):
+    rules = []
+    for file in paths:
+        with open(file, "r") as f:
+            frontmatter, body = extract_frontmatter(f.read())
+        body = re.sub(r"\[([^\]]+)\]\(rules\/([^\)]+)\)", r"**\1**", body)
+        rules.append(
+            {
+                "name": os.path.basename(file).replace(".md", ""),
+                "priority": extract_priority(file),
+                "description": frontmatter.get("description", ""),
+                "body": body,
+            }
+        )
+    return rules
+
+
+def load_records(paths):
+    return [Rule.load(file) for file in paths]
+
+
+def retained_bytes(load, paths):
+    """Bytes still allocated after load(paths), with its result kept alive."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = load(paths)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=10000, help="Rules in the corpus")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="llm-memory-bank-rules-") as tmp:
+        # Long temporary paths are shared by both layouts; they are the floor
+        paths = make_corpus(Path(tmp), options.rules)
+        results = {
+            "dicts": retained_bytes(load_dicts, paths),
+            "records": retained_bytes(load_records, paths),
+        }
+
+    print(f"Rules: {options.rules}")
+    for name, total in results.items():
+        print(
+            f"  {name:8} {total / options.rules:8.0f} bytes/rule  {total / 2**20:8.1f} MiB"
+        )
+    print(f"Saved: {1 - results['records'] / results['dicts']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Latency benchmark for the pre-commit hook (``main.py hook``).
+
+Builds a large git repository (a template with many rules, a memory-bank
+and the rendered .cursor rules, plus unrelated source files), stages a
+typical commit (edited rules, a rename, edited Cursor rules) and times
+``lib.staged.StagedCheck.run`` in-process. Interpreter startup is not
+included; run the daemon to avoid it. Exits non-zero over budget.
+
+Usage:
+    python benchmarks/staged_hook.py [--rules 2000] [--files 20000] [--runs 5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SRC_DIR))
+
+from lib import cursor, staged  # noqa: E402
+from lib.staged import LATENCY_BUDGET_MS, StagedCheck  # noqa: E402
+
+RULE = """---
+description: Rule {i}
+activation: always
+---
+# Rule {i}
+
+Follow [the previous rule](rules/core/{prev:02d}-rule{prev_i}.md) too.
+"""
+
+
+def git(root, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=b", "-c", "user.email=b@b", *args],
+        cwd=root,
+        check=True,
+    )
+
+
+def build(root: Path, rules: int, files: int):
+    core = root / "src" / "rules" / "core"
+    core.mkdir(parents=True)
+    rendered = root / ".cursor" / "rules" / "core"
+    rendered.mkdir(parents=True)
+    for i in range(rules):
+        prev = max(i - 1, 0)
+        path = core / f"{i % 100:02d}-rule{i}.md"
+        path.write_text(RULE.format(i=i, prev=prev % 100, prev_i=prev))
+    for path in core.iterdir():
+        cursor.transform_to_project(path, rendered / path.with_suffix(".mdc").name)
+    (root / "memory-bank").mkdir()
+    for i in range(rules // 4):
+        (root / "memory-bank" / f"notes{i}.md").write_text(
+            f"# Notes {i}\n\nSee [rule](src/rules/core/{i % 100:02d}-rule{i}.md).\n"
+        )
+    for i in range(files):
+        directory = root / "app" / f"pkg{i % 200}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"module{i}.py").write_text(f"VALUE = {i}\n")
+    git(root, "init", "-q")
+    git(root, "add", ".")
+    git(root, "commit", "-q", "-m", "init")
+
+
+def stage_commit(root: Path):
+    core = root / "src" / "rules" / "core"
+    for i in range(20):
+        path = core / f"{i % 100:02d}-rule{i}.md"
+        path.write_text(path.read_text() + "One more line.\n")
+    git(root, "mv", "src/rules/core/21-rule21.md", "src/rules/core/21-renamed.md")
+    for i in range(30, 35):
+        path = root / ".cursor" / "rules" / "core" / f"{i:02d}-rule{i}.mdc"
+        path.write_text(path.read_text() + "Edited in the editor.\n")
+    git(root, "add", ".")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=2000, help="Rules in the template")
+    parser.add_argument("--files", type=int, default=20000, help="Other tracked files")
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Timed runs (median reported)"
+    )
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="llm-memory-bank-hook-") as tmp:
+        root = Path(tmp)
+        build(root, options.rules, options.files)
+        stage_commit(root)
+        staged.TEMPLATE_FOLDER = root / "src"
+        timings, findings = [], []
+        for _ in range(options.runs):
+            start = time.perf_counter()
+            findings = StagedCheck(root).run()
+            timings.append((time.perf_counter() - start) * 1000)
+
+    median = statistics.median(timings)
+    print(f"Repository: {options.rules} rules, {options.files} other files")
+    print(f"Findings: {len(findings)} (links to the renamed rule)")
+    print(f"Median: {median:.0f} ms (budget {LATENCY_BUDGET_MS} ms)")
+    sys.exit(0 if median <= LATENCY_BUDGET_MS else 1)
+
+
+if __name__ == "__main__":
+    main()
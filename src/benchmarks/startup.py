@@ -0,0 +1,90 @@
+"""Startup benchmark for the CLI.
+
+Runs a command (default: ``main.py lint --help``) under ``python -X importtime``
+and reports the import time the CLI adds on top of the bare interpreter,
+the slowest imports, and the median wall-clock time. Exits non-zero when the
+added import time is over budget, so it can gate CI.
+
+Usage:
+    python benchmarks/startup.py [--budget-ms 50] [--runs 10] [-- ARGS...]
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_ARGS = ["lint", "--help"]
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def import_times(argv):
+    """Map top-level module -> cumulative import microseconds for one run."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match and not match.group(3):
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+def wall_time_ms(argv, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *argv], cwd=SRC_DIR, capture_output=True, check=True
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget-ms", type=float, default=50.0, help="Import time budget"
+    )
+    parser.add_argument("--runs", type=int, default=10, help="Runs per measurement")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("args", nargs="*", help="CLI arguments (default: lint --help)")
+    options = parser.parse_args()
+    cli_argv = ["main.py", *(options.args or DEFAULT_ARGS)]
+
+    # Imports done by the interpreter itself (site, encodings, ...) are not ours
+    baseline = import_times(["-c", "pass"])
+    added = {}
+    for _ in range(options.runs):
+        for name, us in import_times(cli_argv).items():
+            if name not in baseline:
+                added.setdefault(name, []).append(us)
+    medians = {name: statistics.median(samples) for name, samples in added.items()}
+    total_ms = sum(medians.values()) / 1000
+
+    interpreter_ms = wall_time_ms(["-c", "pass"], options.runs)
+    cli_ms = wall_time_ms(cli_argv, options.runs)
+
+    print(f"Command:      python {' '.join(cli_argv)}")
+    print(f"Wall time:    {cli_ms:.1f} ms (bare interpreter {interpreter_ms:.1f} ms)")
+    print(f"Import time:  {total_ms:.1f} ms (budget {options.budget_ms:.0f} ms)")
+    print("Slowest imports:")
+    for name, us in sorted(medians.items(), key=lambda item: -item[1])[: options.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    if total_ms > options.budget_ms:
+        print(f"Over budget by {total_ms - options.budget_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Python API for syncing rules in-process, without the CLI.
+
+The CLI commands print progress, render diffs and exit on errors; this
+module wraps the same implementations for automation (scripts, CI jobs,
+other tools) with explicit roots, structured results and exceptions
+instead::
+
+    from lib.api import Project, RuleSet
+
+    rules = RuleSet("/path/to/template/src")
+    changes = Project("/path/to/project", rules).sync(["cursor"], compare=True)
+    for path in changes.paths("differs"):
+        ...
+    print(changes.diffs.to_json())
+
+Console output is suppressed while API calls run (see ``console.quiet``)
+and invalid input raises ValueError (``DirtyTemplateError`` for pulls into
+a template with uncommitted rule changes, ``RuleCheckError`` for syncs of
+a template whose rules fail ``RuleSet.check``).
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from .check import (
+    Finding,
+    RuleCheckError,  # noqa: F401  (re-exported)
+    check_rules,
+    ensure_valid,
+)
+from .commands import (
+    TEMPLATE_FOLDER,
+    DirtyTemplateError,  # noqa: F401  (re-exported)
+    generate_impl,
+    project_to_rules_impl,
+    render_rule,
+    resolve_rule,
+)
+from .common import output_lock, scan_tree
+from .console import quiet
+from .diff_report import DiffReport
+from .editors import select_editors
+from .glob_match import RuleMatcher
+from .lint import BrokenLink, find_broken_links
+from .rule import Rule, load_rules
+from .shard import Shard
+
+# Outcomes recorded for each file, in reporting order
+OUTCOMES = (
+    "created",
+    "updated",
+    "removed",
+    "differs",
+    "conflict",
+    "skipped",
+    "missing",
+    "unchanged",
+)
+
+
+class ChangeSet(NamedTuple):
+    """Files touched (or not) by a sync, by outcome, plus compare-mode diffs."""
+
+    changes: Dict[str, List[Path]]
+    diffs: DiffReport
+
+    def paths(self, outcome: str) -> List[Path]:
+        return self.changes.get(outcome, [])
+
+    @property
+    def changed(self) -> bool:
+        """Whether anything was written or removed."""
+        return any(self.paths(outcome) for outcome in ("created", "updated", "removed"))
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            outcome: len(self.paths(outcome))
+            for outcome in OUTCOMES
+            if self.paths(outcome)
+        }
+
+
+class RuleSet:
+    """A template: rules/ and LLM-README.md under root, memory-bank/ next to it.
+
+    Defaults to the template shipped with this package.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else TEMPLATE_FOLDER
+        self.rules_dir = self.root / "rules"
+        self.memory_bank = self.root.parent / "memory-bank"
+
+    def rules(self) -> List[str]:
+        """Template-relative paths of all rules (core/foo.md), sorted."""
+        return sorted(
+            rel
+            for rel, path in scan_tree(self.rules_dir, ".md").items()
+            if path.name != "README.md"
+        )
+
+    def records(self) -> List[Rule]:
+        """Compact records (frontmatter fields, body on disk) of all rules."""
+        return load_rules(self.rules_dir)
+
+    def rule_name(self, rule: Rule) -> str:
+        """A record's template-relative path (core/foo.md)."""
+        return Path(rule.path).relative_to(self.rules_dir).as_posix()
+
+    def matcher(self) -> RuleMatcher:
+        """The glob rules compiled into one matcher (see lib.glob_match)."""
+        return RuleMatcher(self.records())
+
+    def which_rules(self, paths: Iterable[str]) -> Dict[str, List[Rule]]:
+        """Glob-activated rules applying to each repository-relative path."""
+        return self.matcher().match_many(paths)
+
+    def render(self, rule: str, editor: str) -> str:
+        """A rule ('core/foo', 'core/foo.md' or a unique stem) rendered for a rule-directory editor."""
+        [selected] = select_editors([editor])
+        if selected.output_file:
+            raise ValueError(f"{editor} is a single-file editor; use Project.sync")
+        return render_rule(selected.load(), resolve_rule(rule, self.rules_dir))
+
+    def check(self, jobs: Optional[int] = None) -> List[Finding]:
+        """Frontmatter errors and duplicate-priority warnings of all rules."""
+        return check_rules(self.rules_dir, jobs)
+
+    def lint(self, shard: Optional[Shard] = None) -> List[BrokenLink]:
+        """Broken markdown links in the rules and the memory-bank (with a shard, its files only)."""
+        return find_broken_links(self.root, self.memory_bank.parent, shard)
+
+
+class Project:
+    """A project folder kept in sync with a RuleSet."""
+
+    def __init__(self, root, ruleset: Optional[RuleSet] = None, object_store=None):
+        self.root = Path(root)
+        self.ruleset = ruleset or RuleSet()
+        self.object_store = object_store
+
+    def sync(
+        self,
+        editors: Iterable[str] = (),
+        force: bool = False,
+        compare: bool = False,
+        sync_state: bool = False,
+        git_index: bool = False,
+        shard: Optional[Shard] = None,
+    ) -> ChangeSet:
+        """Write the rules of the named editors (default: all) into the project.
+
+        Outputs are written under the project root itself (e.g.
+        ``<root>/.cursor/rules``, ``<root>/CLAUDE.md``). With sync_state, only
+        rules changed since the last sync are touched, as with
+        ``generate --sync-state``; git_index adds ``--git-index`` and shard
+        (a ``lib.shard.Shard``) ``--shard``.
+        """
+        selected = select_editors(editors)
+        ensure_valid(self.ruleset.rules_dir)
+        result = ChangeSet({}, DiffReport())
+        self.root.mkdir(parents=True, exist_ok=True)
+        state = None
+        if sync_state and any(not editor.output_file for editor in selected):
+            from .sync_state import SyncState
+
+            state = SyncState(self.root, use_git=git_index)
+        try:
+            with quiet():
+                generate_impl(
+                    self.root,
+                    selected,
+                    force,
+                    compare,
+                    sync_state=state,
+                    diff_report=result.diffs,
+                    object_store=self.object_store,
+                    template_folder=self.ruleset.root,
+                    changes=result.changes,
+                    check=False,
+                    shard=shard,
+                )
+        finally:
+            if state is not None:
+                state.close()
+        return result
+
+    def pull(
+        self,
+        editor: str,
+        force: bool = False,
+        compare: bool = False,
+        sync_state: bool = False,
+        git_index: bool = False,
+    ) -> ChangeSet:
+        """Copy rules edited in the project back into the template (paths are template files)."""
+        [selected] = select_editors([editor])
+        if selected.output_file:
+            raise ValueError(f"{editor} is a single-file editor and cannot be pulled")
+        result = ChangeSet({}, DiffReport())
+        state = None
+        if sync_state:
+            from .sync_state import SyncState
+
+            state = SyncState(self.root, use_git=git_index)
+        try:
+            editor_module = selected.load()
+            with quiet(), output_lock(self.root, editor_module.RULES_DIR):
+                project_to_rules_impl(
+                    self.root,
+                    force,
+                    compare,
+                    editor_module,
+                    selected.name,
+                    sync_state=state,
+                    diff_report=result.diffs,
+                    template_folder=self.ruleset.root,
+                    changes=result.changes,
+                )
+        finally:
+            if state is not None:
+                state.close()
+        return result
@@ -0,0 +1,231 @@
+"""Precompiled, content-addressed bundles of generated rules.
+
+A bundle is a deterministic tar archive holding everything ``generate``
+writes for a set of editors: rule directories, single-file outputs (and
+their section files) and the memory-bank seed. Members are sorted, with
+zeroed timestamps and owners and normalized modes, so the same inputs
+always produce the same bytes. The file is named by the SHA-256 of the
+uncompressed archive.
+
+Bundles are cached under ``$LLM_MEMORY_BANK_CACHE`` (default
+``~/.cache/llm-memory-bank``). Each build is also indexed by a hash of its
+inputs (template rules, memory-bank, the transform code and the editor
+list), so rebuilding an unchanged template is a cache lookup, not a
+transform run.
+
+``apply_bundle`` streams an archive into a project with the same rules as
+a sync: identical files are skipped, differing files are overwritten only
+when forced or reported in compare mode, and memory-bank seed files are
+only added when missing.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import os
+import tarfile
+import tempfile
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional
+
+from .common import cache_dir, file_digest, open_atomic, write_atomic
+from .diff_report import DiffReport
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = ".llm-memory-bank-bundle.json"
+COMPRESSIONS = {"gzip": ".tar.gz", "xz": ".tar.xz", "none": ".tar"}
+
+SRC_DIR = Path(__file__).parent.parent
+
+
+def _tree_digests(root: Path, pattern: str):
+    for path in sorted(root.glob(pattern)):
+        if path.is_file() and "__pycache__" not in path.parts:
+            yield path.relative_to(root).as_posix(), file_digest(path)
+
+
+def inputs_key(editor_names: List[str], compression: str) -> str:
+    """Hash of everything a bundle is built from."""
+    digest = hashlib.sha256(f"{FORMAT_VERSION}\0{compression}\0".encode())
+    digest.update("\0".join(editor_names).encode() + b"\0")
+    for root, pattern in (
+        (SRC_DIR / "rules", "**/*"),
+        (SRC_DIR.parent / "memory-bank", "**/*"),
+        (SRC_DIR / "lib", "**/*.py"),
+    ):
+        for rel, file_hash in _tree_digests(root, pattern):
+            digest.update(f"{root.name}/{rel}\0{file_hash}\0".encode())
+    return digest.hexdigest()
+
+
+def _tar_info(name: str, size: int) -> tarfile.TarInfo:
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mode = 0o644
+    info.mtime = 0
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    return info
+
+
+def write_archive(staging: Path, manifest: Dict) -> bytes:
+    """Deterministic uncompressed tar of staging, manifest first."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w", format=tarfile.PAX_FORMAT) as tar:
+        data = json.dumps(manifest, indent=2, sort_keys=True).encode()
+        tar.addfile(_tar_info(MANIFEST_NAME, len(data)), io.BytesIO(data))
+        for rel in manifest["files"]:
+            data = (staging / rel).read_bytes()
+            tar.addfile(_tar_info(rel, len(data)), io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def compress(data: bytes, compression: str) -> bytes:
+    if compression == "gzip":
+        # mtime=0 and no file name keep the gzip header reproducible
+        out = io.BytesIO()
+        with gzip.GzipFile(filename="", mode="wb", fileobj=out, mtime=0) as f:
+            f.write(data)
+        return out.getvalue()
+    if compression == "xz":
+        return lzma.compress(data)
+    return data
+
+
+def build_bundle(editors, compression: str = "gzip", render=None):
+    """Return (path, cached) for the bundle of the given editors (lib.editors.Editor).
+
+    Args:
+        editors: Editors whose outputs go into the bundle
+        compression: One of gzip, xz or none
+        render: Callable(output_folder, editors) that generates into a folder;
+            defaults to commands.generate_impl
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(
+            f"Invalid compression: {compression}. Must be one of: {', '.join(COMPRESSIONS)}"
+        )
+    names = [editor.name for editor in editors]
+    key = inputs_key(names, compression)
+    cache = cache_dir()
+    index_file = cache / "index" / key
+    if index_file.exists():
+        cached = cache / index_file.read_text().strip()
+        if cached.exists():
+            return cached, True
+
+    if render is None:
+        from .commands import generate_impl as render
+
+    with tempfile.TemporaryDirectory(prefix="llm-memory-bank-bundle-") as tmp:
+        staging = Path(tmp)
+        render(staging, editors)
+        files = sorted(
+            path.relative_to(staging).as_posix()
+            for path in staging.rglob("*")
+            if path.is_file()
+        )
+        mb_src = SRC_DIR.parent / "memory-bank"
+        manifest = {
+            "format": FORMAT_VERSION,
+            "editors": names,
+            "files": files,
+            # Starter files a project owns once copied; never overwritten
+            "seed": [
+                rel
+                for rel in files
+                if rel.startswith("memory-bank/") and (mb_src.parent / rel).is_file()
+            ],
+        }
+        archive = write_archive(staging, manifest)
+
+    name = (
+        f"rules-{hashlib.sha256(archive).hexdigest()[:16]}{COMPRESSIONS[compression]}"
+    )
+    path = cache / name
+    if not path.exists():
+        cache.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache / f".{name}.{os.getpid()}.tmp"
+        tmp_path.write_bytes(compress(archive, compression))
+        os.replace(tmp_path, path)
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(index_file, name)
+    return path, False
+
+
+def _member_target(project: Path, name: str) -> Path:
+    rel = PurePosixPath(name)
+    if rel.is_absolute() or ".." in rel.parts:
+        raise ValueError(f"Unsafe path in bundle: {name}")
+    return project.joinpath(*rel.parts)
+
+
+def apply_bundle(
+    bundle: Path,
+    project: Path,
+    force: bool = False,
+    compare: bool = False,
+    diff_report: Optional[DiffReport] = None,
+    object_store=None,
+) -> Dict[str, List[str]]:
+    """Stream a bundle into a project folder.
+
+    Returns the member paths by outcome: created, updated, unchanged and
+    skipped. In compare mode, differing files go to diff_report. With an
+    ObjectStore, rendered files (not the memory-bank seed, which projects
+    edit) are hardlinked from the store instead of written.
+    """
+    project = Path(project)
+    results: Dict[str, List[str]] = {
+        k: [] for k in ("created", "updated", "unchanged", "skipped")
+    }
+    seed = set()
+    with tarfile.open(bundle, mode="r|*") as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            data = tar.extractfile(member).read()
+            if member.name == MANIFEST_NAME:
+                manifest = json.loads(data)
+                if manifest.get("format") != FORMAT_VERSION:
+                    raise ValueError(
+                        f"Unsupported bundle format: {manifest.get('format')}"
+                    )
+                seed = set(manifest.get("seed", []))
+                continue
+
+            dst = _member_target(project, member.name)
+            linked = object_store is not None and member.name not in seed
+
+            def install():
+                if linked:
+                    object_store.link(object_store.put_bytes(data), dst)
+                else:
+                    # Not the mode of a read-only store object this replaces
+                    with open_atomic(dst, "wb", keep_mode=False) as f:
+                        f.write(data)
+
+            if not dst.exists():
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                install()
+                results["created"].append(member.name)
+                continue
+            current = dst.read_bytes()
+            if current == data:
+                if linked:
+                    install()
+                results["unchanged"].append(member.name)
+            elif force and member.name not in seed:
+                install()
+                results["updated"].append(member.name)
+            else:
+                if compare and member.name not in seed and diff_report is not None:
+                    diff_report.add_text(
+                        member.name,
+                        current.decode(errors="replace"),
+                        data.decode(errors="replace"),
+                    )
+                results["skipped"].append(member.name)
+    return results
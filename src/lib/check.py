@@ -0,0 +1,159 @@
+"""Whole-corpus validation of template rules.
+
+``check_rules`` validates every rule's frontmatter once and collects all
+problems into one report, instead of stopping at the first bad file after
+earlier outputs were written. Each file is checked independently, in a
+process pool once the corpus is large enough to pay for starting one;
+duplicate filename priorities are then found across the results.
+
+Errors make ``generate_impl`` refuse to write anything. Duplicate
+priorities are only warnings: the rules still generate, but their order
+relative to each other in single-file outputs is not defined.
+"""
+
+import os
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from .common import (
+    FRONTMATTER_RE,
+    frontmatter_errors,
+    parse_frontmatter,
+    scan_tree,
+)
+from .rule import DEFAULT_PRIORITY, TRIGGERS, extract_priority
+
+ACTIVATIONS = tuple(TRIGGERS)
+SINGLE_FILE_VALUES = (True, False, "true", "false", "skip")
+# Any leading number, so prefixes extract_priority ignores (100-foo.md) are caught
+NUMBER_PREFIX_RE = re.compile(r"^(\d+)-")
+# Below this many rules, starting worker processes costs more than it saves
+PARALLEL_THRESHOLD = 256
+
+
+class Finding(NamedTuple):
+    path: Path
+    message: str
+    error: bool = True  # False for warnings
+
+
+class RuleCheckError(ValueError):
+    """The template rules have errors; findings lists all of them."""
+
+    def __init__(self, findings: List[Finding]):
+        self.findings = findings
+        first = findings[0]
+        more = f" (and {len(findings) - 1} more)" if len(findings) > 1 else ""
+        super().__init__(f"{first.path}: {first.message}{more}")
+
+
+def rule_files(rules_dir) -> List[str]:
+    """Every template rule (README.md excluded), sorted."""
+    return [
+        str(path)
+        for rel, path in sorted(scan_tree(rules_dir, ".md").items())
+        if path.name != "README.md"
+    ]
+
+
+def single_file_errors(value) -> List[str]:
+    if value is None or value in SINGLE_FILE_VALUES:
+        return []
+    if isinstance(value, str) and value.startswith("section:"):
+        section = value[8:].strip()
+        if not section:
+            return ["single_file: section: needs a path (section:<folder>)"]
+        if section.startswith("/") or ".." in Path(section).parts:
+            return [
+                f"single_file: section path must stay inside the project: {section}"
+            ]
+        return []
+    return [
+        f"Unknown single_file value: {value!r}. Must be one of: true, false, skip, section:<folder>"
+    ]
+
+
+def check_file(path: str) -> List[Finding]:
+    """All problems of one rule file."""
+    try:
+        with open(path, "r") as f:
+            content = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return [Finding(Path(path), f"Cannot read rule: {e}")]
+    return check_text(path, content)
+
+
+def check_text(path: str, content: str) -> List[Finding]:
+    """All problems of a rule with the given content (path only names it)."""
+    match = FRONTMATTER_RE.match(content)
+    frontmatter = parse_frontmatter(match.group(1)) if match else {}
+    messages = frontmatter_errors(frontmatter)
+
+    activation = frontmatter.get("activation")
+    if activation and activation not in ACTIVATIONS:
+        messages.append(
+            f"Invalid activation type: {activation}. Must be one of: {', '.join(ACTIVATIONS)}"
+        )
+    messages += single_file_errors(frontmatter.get("single_file"))
+
+    number = NUMBER_PREFIX_RE.match(os.path.basename(path))
+    if number and extract_priority(path) != int(number.group(1)):
+        messages.append(
+            f"Filename priority {number.group(1)} is out of range; use 0-99 (##-RuleName.md)"
+        )
+    return [Finding(Path(path), message) for message in messages]
+
+
+def duplicate_priorities(paths: List[str]) -> List[Finding]:
+    """Warnings for rules sharing a filename priority within a directory."""
+    groups = defaultdict(list)
+    for path in paths:
+        priority = extract_priority(path)
+        if priority != DEFAULT_PRIORITY:
+            groups[(os.path.dirname(path), priority)].append(path)
+    findings = []
+    for (directory, priority), group in sorted(groups.items()):
+        for path in group[1:]:
+            findings.append(
+                Finding(
+                    Path(path),
+                    f"Priority {priority:02d} is also used by {os.path.basename(group[0])}",
+                    error=False,
+                )
+            )
+    return findings
+
+
+def check_rules(rules_dir, jobs: Optional[int] = None) -> List[Finding]:
+    """Errors and warnings for every rule under rules_dir, in path order.
+
+    Files are checked by up to jobs worker processes (default: one per
+    CPU) when there are at least PARALLEL_THRESHOLD of them; jobs=1 always
+    checks in-process.
+    """
+    paths = rule_files(rules_dir)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(paths) >= PARALLEL_THRESHOLD:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunksize = max(1, len(paths) // (jobs * 4))
+            per_file = list(pool.map(check_file, paths, chunksize=chunksize))
+    else:
+        per_file = [check_file(path) for path in paths]
+
+    findings = [finding for found in per_file for finding in found]
+    findings += duplicate_priorities(paths)
+    findings.sort(key=lambda finding: (str(finding.path), not finding.error))
+    return findings
+
+
+def ensure_valid(rules_dir, jobs: Optional[int] = None) -> List[Finding]:
+    """Raise RuleCheckError if any rule has errors; returns the warnings."""
+    findings = check_rules(rules_dir, jobs)
+    errors = [finding for finding in findings if finding.error]
+    if errors:
+        raise RuleCheckError(errors)
+    return findings
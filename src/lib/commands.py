@@ -3,79 +3,294 @@
 import os
 import shutil
 import subprocess
-import sys
 import tempfile
 from pathlib import Path
 
-from rich.console import Console
-from rich.prompt import Prompt
+from .check import ensure_valid
+from .common import (
+    copy_atomic,
+    extract_frontmatter,
+    filecmp,
+    output_lock,
+    replace_dir,
+    scan_tree,
+    tmp_sibling,
+)
+from .diff_report import DiffReport
+from .shard import owns
+from .single_file import transform_to_project_single_file
+from .sync_state import (
+    CONFLICT,
+    PROJECT_CHANGED,
+    TEMPLATE_CHANGED,
+    UNCHANGED,
+    RuleState,
+    classify,
+    hash_file,
+)
+from .console import console
 
-from .common import extract_frontmatter, filecmp, run_compare
+TEMPLATE_FOLDER = Path(__file__).parent.parent
 
-console = Console()
 
+class DirtyTemplateError(ValueError):
+    """The template rules have uncommitted changes."""
 
-def rules_to_project_impl(project_folder, force, compare, editor_module, editor_name):
-    """Implementation of rules-to-project command."""
-    src_folder = Path(__file__).parent.parent
+
+def record_change(changes, outcome, path):
+    """Add path under outcome (created, updated, skipped, ...) when collecting changes."""
+    if changes is not None:
+        changes.setdefault(outcome, []).append(Path(path))
+
+
+def generate_impl(
+    output_folder,
+    editors,
+    force=False,
+    compare=False,
+    sync_state=None,
+    diff_report=None,
+    object_store=None,
+    template_folder=None,
+    changes=None,
+    check=True,
+    shard=None,
+):
+    """Build the outputs of the given editors (lib.editors.Editor) into output_folder.
+
+    Single-file editors are written first, then each rule-directory editor
+    is synced with rules_to_project_impl. Single-file outputs are always
+    regenerated; force, compare and sync_state only decide what happens to
+    rule files. Each output is written under its output_lock, so concurrent
+    runs on one project take turns per output.
+    Unless the caller already did (check=False), the whole template is
+    checked first: RuleCheckError is raised, with every error found, before
+    anything is written.
+
+    With a lib.shard.Shard, only that shard's work items are built: the
+    single-file outputs, rules and memory-bank files whose keys (output
+    file name, rules/..., memory-bank/...) it owns. The template is still
+    checked as a whole.
+    """
+    if check:
+        ensure_valid(Path(template_folder or TEMPLATE_FOLDER) / "rules")
+    for editor in editors:
+        if editor.output_file and owns(shard, editor.output_file):
+            dst = Path(output_folder) / editor.output_file
+            with output_lock(output_folder, editor.output_file):
+                existed = dst.exists()
+                transform_to_project_single_file(
+                    output_folder, editor.output_file, template_folder=template_folder
+                )
+            record_change(changes, "updated" if existed else "created", dst)
+    for editor in editors:
+        if not editor.output_file:
+            editor_module = editor.load()
+            with output_lock(output_folder, editor_module.RULES_DIR):
+                rules_to_project_impl(
+                    output_folder,
+                    force=force,
+                    compare=compare,
+                    editor_module=editor_module,
+                    editor_name=editor.name,
+                    sync_state=sync_state,
+                    diff_report=diff_report,
+                    object_store=object_store,
+                    template_folder=template_folder,
+                    changes=changes,
+                    shard=shard,
+                )
+
+
+def rules_to_project_impl(
+    project_folder,
+    force,
+    compare,
+    editor_module,
+    editor_name,
+    sync_state=None,
+    diff_report=None,
+    object_store=None,
+    template_folder=None,
+    changes=None,
+    shard=None,
+):
+    """Implementation of rules-to-project command.
+
+    With a SyncState, the target directory is kept rather than cleared and
+    only rules whose template or project file changed since the last sync
+    are transformed; rules edited in the project are left alone unless
+    forced. Without one, every rule is rendered and compared against the
+    file in place: files that differ are overwritten, as are README files,
+    except in compare mode, where they are reported and kept unless forced.
+
+    In compare mode, differences go to diff_report; without one, a report
+    is created and shown when the command finishes.
+
+    With an ObjectStore, rendered rules are stored once and hardlinked into
+    the target (copied where linking fails); identical files already in
+    place are relinked to share the stored copy.
+
+    template_folder holds rules/ (default: this package); the memory-bank
+    seed is read from its parent. With a changes dict, every output path is
+    recorded by outcome (see record_change).
+
+    With a shard, only the rules and memory-bank files it owns are synced
+    and the target directory is shared with the other shards: instead of
+    replacing it, only this shard's files are cleared.
+    """
+    report = diff_report if diff_report is not None else DiffReport()
+    src_folder = Path(template_folder) if template_folder else TEMPLATE_FOLDER
     rules_dir = src_folder / "rules"
-    rules_files = list(rules_dir.glob("**/*.md"))
+    rules_files = [
+        path
+        for path in rules_dir.glob("**/*.md")
+        if owns(shard, path.relative_to(src_folder).as_posix())
+    ]
+
+    target_dir = Path(project_folder) / editor_module.RULES_DIR
+    suffix = editor_module.RULE_SUFFIX
 
-    if editor_name == "cursor":
-        target_dir = Path(project_folder) / ".cursor" / "rules"
-    elif editor_name == "windsurf":
-        target_dir = Path(project_folder) / ".windsurf" / "rules"
+    def install(rendered, dst):
+        if object_store is not None:
+            object_store.install(rendered, dst)
+        else:
+            copy_atomic(rendered, dst)
+
+    if sync_state is None and shard is None:
+        # Render into a fresh sibling directory that replaces the target at
+        # the end, so the target always holds one complete set of rules
+        out_dir = tmp_sibling(target_dir)
+        out_dir.mkdir(parents=True)
+    elif sync_state is None:
+        out_dir = target_dir
+        target_dir.mkdir(parents=True, exist_ok=True)
+        clear_shard(rules_dir, target_dir, suffix, shard)
     else:
-        raise ValueError(f"Unsupported editor: {editor_name}")
+        out_dir = target_dir
+        target_dir.mkdir(parents=True, exist_ok=True)
+        sync_state.index_tree(rules_dir)
+        sync_state.index_tree(target_dir)
+        prune_removed_rules(
+            sync_state, editor_name, rules_dir, target_dir, suffix, changes, shard
+        )
+
+    try:
+        for src in rules_files:
+            if src.name == "README.md":
+                continue
+            rel = Path(src).relative_to(rules_dir)
+            dst = out_dir / rel
+            if rel.suffix == ".md":
+                dst = dst.with_suffix(suffix)
 
-    # Clear target directory
-    if target_dir.exists():
-        shutil.rmtree(target_dir)
-    target_dir.mkdir(parents=True)
+            status = None
+            if sync_state is not None:
+                template_hash, project_hash = (
+                    sync_state.hash_file(src),
+                    sync_state.hash_file(dst),
+                )
+                status = classify(
+                    sync_state.get(editor_name, rel.as_posix()),
+                    template_hash,
+                    project_hash,
+                )
+                if status == UNCHANGED:
+                    console.print(f"[green]Unchanged since last sync, skipping {dst}")
+                    record_change(changes, "unchanged", dst)
+                    continue
+                if status == PROJECT_CHANGED and not (force or compare):
+                    console.print(
+                        f"[cyan]Skipping {dst}: edited in project since last sync "
+                        "(use project-to-rules, --compare to review or --force to overwrite)"
+                    )
+                    record_change(changes, "skipped", dst)
+                    continue
 
-    for src in rules_files:
-        if src.name == "README.md":
-            continue
-        rel = Path(src).relative_to(rules_dir)
-        dst = target_dir / rel
-        if editor_name == "cursor" and rel.suffix == ".md":
-            dst = dst.with_suffix(".mdc")
-        dst.parent.mkdir(parents=True, exist_ok=True)
-        with tempfile.NamedTemporaryFile("w+", delete=False) as tf:
-            editor_module.transform_to_project(src, tf.name)
-            tf.flush()
-            if dst.exists():
-                if filecmp(tf.name, dst):
-                    console.print(f"[green]Identical, skipping {dst}")
-                elif force:
-                    shutil.copy(tf.name, dst)
-                    console.print(f"[yellow]Overwriting {dst}")
-                elif compare:
-                    console.print(f"[red]Diff for {dst}")
-                    run_compare(tf.name, dst)
+            # The file in place now: in a fresh out_dir, dst does not exist yet
+            current = target_dir / dst.relative_to(out_dir)
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w+", delete=False) as tf:
+                editor_module.transform_to_project(src, tf.name)
+                tf.flush()
+                synced = True
+                if current.exists():
+                    if filecmp(tf.name, current):
+                        console.print(f"[green]Identical, skipping {current}")
+                        if object_store is not None or dst != current:
+                            install(tf.name, dst)
+                        record_change(changes, "unchanged", current)
+                    elif (
+                        force
+                        or status == TEMPLATE_CHANGED
+                        or (sync_state is None and not compare)
+                    ):
+                        # A template-only change is safe to apply: the project
+                        # file still matches what the last sync wrote. Without
+                        # sync state the template always wins, as for CLAUDE.md
+                        install(tf.name, dst)
+                        console.print(f"[yellow]Overwriting {current}")
+                        record_change(changes, "updated", current)
+                    else:
+                        if compare:
+                            console.print(f"[red]Diff for {current}")
+                            report.add(
+                                current,
+                                tf.name,
+                                label=current.relative_to(project_folder),
+                            )
+                            record_change(changes, "differs", current)
+                        else:
+                            console.print(
+                                f"[cyan]Skipping {current} (use --force or --compare)"
+                            )
+                            record_change(changes, "skipped", current)
+                        if dst != current:
+                            copy_atomic(current, dst)
+                        synced = False
                 else:
-                    console.print(f"[cyan]Skipping {dst} (use --force or --compare)")
-            else:
-                shutil.copy(tf.name, dst)
-        os.unlink(tf.name)
+                    install(tf.name, dst)
+                    record_change(changes, "created", current)
+                if sync_state is not None and synced:
+                    sync_state.record(
+                        editor_name,
+                        rel.as_posix(),
+                        RuleState(template_hash, hash_file(dst)),
+                    )
+            os.unlink(tf.name)
 
-    # README files
-    for src in rules_files:
-        if src.name != "README.md":
-            continue
-        rel = Path(src).relative_to(rules_dir)
-        dst = target_dir / rel
-        dst.parent.mkdir(parents=True, exist_ok=True)
-        if not dst.exists() or force:
-            shutil.copy(src, dst)
+        # README files
+        for src in rules_files:
+            if src.name != "README.md":
+                continue
+            rel = Path(src).relative_to(rules_dir)
+            dst, current = out_dir / rel, target_dir / rel
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            if not current.exists() or force or (sync_state is None and not compare):
+                record_change(
+                    changes, "updated" if current.exists() else "created", current
+                )
+                copy_atomic(src, dst)
+            elif dst != current:
+                copy_atomic(current, dst)
+    except BaseException:
+        if out_dir != target_dir:
+            shutil.rmtree(out_dir, ignore_errors=True)
+        raise
+    if out_dir != target_dir:
+        replace_dir(out_dir, target_dir)
+    if sync_state is not None:
+        sync_state.commit()
 
-    # memory-bank (copy from root if doesn't exist)
+    # memory-bank (copy from root if doesn't exist; a concurrent run may win the copy)
     mb_src = src_folder.parent / "memory-bank"
     mb_dst = Path(project_folder) / "memory-bank"
     if mb_src.exists():
-        if not mb_dst.exists():
-            shutil.copytree(mb_src, mb_dst)
+        if shard is None and not mb_dst.exists() and copy_tree_once(mb_src, mb_dst):
             console.print(f"[green]Copied memory-bank to {mb_dst}")
+            for path in sorted(mb_dst.rglob("*")):
+                if path.is_file():
+                    record_change(changes, "created", path)
         else:
             for src_dir, _, files in os.walk(mb_src):
                 rel_dir = Path(src_dir).relative_to(mb_src)
@@ -84,69 +299,210 @@ def rules_to_project_impl(project_folder, force, compare, editor_module, editor_
                 for file in files:
                     src_file = Path(src_dir) / file
                     dst_file = dst_dir / file
+                    if not owns(shard, src_file.relative_to(mb_src.parent).as_posix()):
+                        continue
                     if not dst_file.exists():
-                        shutil.copy(src_file, dst_file)
+                        copy_atomic(src_file, dst_file)
                         console.print(f"[green]Copied {src_file} to {dst_file}")
+                        record_change(changes, "created", dst_file)
+
+    if diff_report is None:
+        report.render()
+
+
+# (editor module, template path) -> ((mtime_ns, size, inode), rendered text)
+_render_cache = {}
+
+
+def copy_tree_once(src, dst) -> bool:
+    """Copy the tree src to a new dst, unless another process creates dst first.
+
+    The tree is copied beside dst and renamed into place, so dst is either
+    missing or complete. Returns False (and copies nothing) if dst exists.
+    """
+    tmp = tmp_sibling(dst)
+    try:
+        shutil.copytree(src, tmp)
+        os.rename(tmp, dst)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if Path(dst).is_dir():
+            return False
+        raise
+    return True
+
 
+def render_rule(editor_module, template_file):
+    """A template rule rendered for an editor, as text.
 
-def project_to_rules_impl(project_folder, force, compare, editor_module, editor_name):
-    """Implementation of project-to-rules command."""
-    template_folder = Path(__file__).parent.parent
+    Renders are memoized per template (path, mtime, size), so long-running
+    processes only re-run transforms for rules that changed.
+    """
+    st = os.stat(template_file)
+    key = (st.st_mtime_ns, st.st_size, st.st_ino)
+    cache_key = (editor_module.__name__, str(template_file))
+    cached = _render_cache.get(cache_key)
+    if cached and cached[0] == key:
+        return cached[1]
+    with tempfile.NamedTemporaryFile("w+", delete=False) as tf:
+        editor_module.transform_to_project(template_file, tf.name)
+    with open(tf.name, "r") as f:
+        rendered = f.read()
+    os.unlink(tf.name)
+    _render_cache[cache_key] = (key, rendered)
+    return rendered
 
-    # Check if git repo is clean
+
+def resolve_rule(name, rules_dir=None):
+    """Template rule path for 'core/foo.md', 'core/foo' or a unique stem like 'foo'."""
+    rules_dir = Path(rules_dir) if rules_dir else TEMPLATE_FOLDER / "rules"
+    rel = name if name.endswith(".md") else f"{name}.md"
+    if (rules_dir / rel).is_file():
+        return rules_dir / rel
+    matches = [
+        path
+        for rel_path, path in sorted(scan_tree(rules_dir, ".md").items())
+        if path.stem == Path(rel).stem or rel_path.endswith("/" + rel)
+    ]
+    if len(matches) != 1:
+        found = "no rule" if not matches else f"{len(matches)} rules"
+        raise ValueError(f"{name!r} matches {found} in {rules_dir}")
+    return matches[0]
+
+
+def prune_removed_rules(
+    sync_state, editor_name, rules_dir, target_dir, suffix, changes=None, shard=None
+):
+    """Delete outputs of rules removed from the template, unless edited locally."""
+    for rule in sync_state.rules(editor_name):
+        if (rules_dir / rule).exists() or not owns(shard, f"rules/{rule}"):
+            continue
+        dst = target_dir / (rule[: -len(".md")] + suffix)
+        previous = sync_state.get(editor_name, rule)
+        if dst.exists() and sync_state.hash_file(dst) != previous.project_hash:
+            console.print(
+                f"[cyan]Keeping {dst}: template rule removed but file edited in project"
+            )
+            record_change(changes, "skipped", dst)
+            continue
+        dst.unlink(missing_ok=True)
+        sync_state.forget(editor_name, rule)
+        console.print(f"[yellow]Removed {dst} (rule no longer in template)")
+        record_change(changes, "removed", dst)
+
+
+def clear_shard(rules_dir, target_dir, suffix, shard):
+    """Delete the files of shard in a rules directory that have no template rule.
+
+    The others stay for the sync to compare against, as a full run compares
+    against the directory it replaces.
+    """
+    for rel, path in scan_tree(target_dir, "").items():
+        if rel.endswith(suffix):
+            rel = rel[: -len(suffix)] + ".md"
+        if shard.owns(f"rules/{rel}") and not (rules_dir / rel).is_file():
+            path.unlink()
+
+
+def project_to_rules_impl(
+    project_folder,
+    force,
+    compare,
+    editor_module,
+    editor_name,
+    sync_state=None,
+    diff_report=None,
+    template_folder=None,
+    changes=None,
+):
+    """Implementation of project-to-rules command.
+
+    With a SyncState, rules unchanged since the last sync are skipped without
+    transforming, and rules changed only in the template are left for
+    rules-to-project unless forced. Compare-mode diffs, template_folder and
+    changes work as in rules_to_project_impl; changes are recorded against
+    template paths.
+
+    Raises DirtyTemplateError if the template rules have uncommitted changes.
+    """
+    report = diff_report if diff_report is not None else DiffReport()
+    template_folder = Path(template_folder) if template_folder else TEMPLATE_FOLDER
+    rules_dir = template_folder / "rules"
+
+    # Check that the template rules are clean (other template changes don't matter)
     try:
         result = subprocess.run(
-            ["git", "status", "--porcelain"],
+            ["git", "status", "--porcelain", "--", "rules"],
             cwd=template_folder,
             capture_output=True,
             text=True,
             check=True,
         )
         if result.stdout.strip():
-            console.print(
-                "[red]Git repository is not clean. Please commit or stash changes before proceeding."
+            raise DirtyTemplateError(
+                "Git repository is not clean. Please commit or stash changes before proceeding."
             )
-            sys.exit(1)
     except subprocess.CalledProcessError:
         console.print("[yellow]Warning: Not in a git repository or git command failed.")
     except FileNotFoundError:
         console.print("[yellow]Warning: git command not found.")
 
-    rules_dir = template_folder / "rules"
-    if editor_name == "cursor":
-        editor_dir = Path(project_folder) / ".cursor"
-        file_extension = ".mdc"
-    elif editor_name == "windsurf":
-        editor_dir = Path(project_folder) / ".windsurf"
-        file_extension = ".md"
-    else:
-        raise ValueError(f"Unsupported editor: {editor_name}")
+    editor_rules_dir = Path(project_folder) / editor_module.RULES_DIR
+    editor_dir = editor_rules_dir.parent
+    file_extension = editor_module.RULE_SUFFIX
 
     project_basename = Path(project_folder).name
-    rules_files = list(rules_dir.glob("**/*.md"))
 
-    # 1) Gather all files to process as source: dest dict
-    files_to_process = {}
-    for src in rules_files:
-        if src.name == "README.md":
+    # 1) One sweep of each tree: template rules and editor rules, keyed by the
+    #    template-relative path (core/foo.md)
+    template_files = scan_tree(rules_dir, ".md")
+    if sync_state is not None:
+        sync_state.index_tree(rules_dir)
+        sync_state.index_tree(editor_rules_dir)
+    editor_files = {
+        rel[: -len(file_extension)] + ".md": path
+        for rel, path in scan_tree(editor_rules_dir, file_extension).items()
+    }
+
+    # 2) Sync rules that exist on both sides
+    for rel, dest_file in sorted(template_files.items()):
+        if dest_file.name == "README.md":
             continue
-        rel = Path(src).relative_to(rules_dir)
-        if editor_name == "cursor":
-            source_file = editor_dir / ("rules" / rel).with_suffix(rel.suffix + "c")
-        else:  # windsurf
-            source_file = editor_dir / ("rules" / rel)
-
-        if source_file.exists():
-            files_to_process[source_file] = src
-        else:
-            console.print(f"[red]Missing {source_file}")
+        source_file = editor_files.get(rel)
+        if source_file is None:
+            console.print(f"[red]Missing {editor_rules_dir / rel[:-3]}{file_extension}")
+            record_change(changes, "missing", dest_file)
+            continue
+
+        status = None
+        if sync_state is not None:
+            template_hash = sync_state.hash_file(dest_file)
+            project_hash = sync_state.hash_file(source_file)
+            status = classify(
+                sync_state.get(editor_name, rel), template_hash, project_hash
+            )
+            if status == UNCHANGED:
+                console.print(f"[green]Unchanged since last sync, skipping {dest_file}")
+                record_change(changes, "unchanged", dest_file)
+                continue
+            if status == TEMPLATE_CHANGED and not (force or compare):
+                console.print(
+                    f"[cyan]Skipping {dest_file}: changed in template since last sync "
+                    "(use rules-to-project, --compare to review or --force to overwrite)"
+                )
+                record_change(changes, "skipped", dest_file)
+                continue
+            if status == CONFLICT:
+                console.print(
+                    f"[red]Conflict: {dest_file} and {source_file} both changed"
+                )
+                record_change(changes, "conflict", dest_file)
 
-    # 2) Loop through and process using the separate functions
-    for source_file, dest_file in files_to_process.items():
-        # Load master description
-        with open(dest_file, "r") as f:
+        # Read and parse the template once: its description fills in blank
+        # project descriptions and its content is the comparison baseline
+        with open(dest_file, "rb") as f:
             master_content = f.read()
-        master_frontmatter, _ = extract_frontmatter(master_content)
+        master_frontmatter, _ = extract_frontmatter(master_content.decode())
         master_description = master_frontmatter.get("description")
 
         with tempfile.NamedTemporaryFile("w+", delete=False) as tf:
@@ -156,73 +512,83 @@ def project_to_rules_impl(project_folder, force, compare, editor_module, editor_
                 project_basename=project_basename,
                 master_description=master_description,
             )
-            tf.flush()
-            if filecmp(tf.name, dest_file):
+            synced = True
+            with open(tf.name, "rb") as f:
+                identical = f.read() == master_content
+            if identical:
                 console.print(f"[green]Identical, skipping {dest_file}")
+                record_change(changes, "unchanged", dest_file)
             elif force:
-                shutil.copy(tf.name, dest_file)
+                copy_atomic(tf.name, dest_file)
                 console.print(f"[yellow]Updated {dest_file}")
+                record_change(changes, "updated", dest_file)
             elif compare:
                 console.print(f"[red]Diff for {dest_file}")
-                run_compare(tf.name, dest_file)
+                report.add(
+                    dest_file, tf.name, label=dest_file.relative_to(template_folder)
+                )
+                record_change(changes, "differs", dest_file)
+                synced = False
             else:
                 console.print(f"[cyan]Skipping {dest_file} (use --force or --compare)")
+                record_change(changes, "skipped", dest_file)
+                synced = False
         os.unlink(tf.name)
 
-    # Then check for new files in editor_dir
-    if editor_name == "cursor":
-        editor_files = [
-            f
-            for f in list(editor_dir.glob("rules/**/*.mdc"))
-            if str(f).find("/project/") == -1
-        ]
-    else:  # windsurf
-        editor_files = [
-            f
-            for f in list(editor_dir.glob("rules/**/*.md"))
-            if str(f).find("/project/") == -1
-        ]
-
-    for editor_file in editor_files:
-        if editor_file.name == "README.md":
+        if sync_state is not None and synced:
+            sync_state.record(
+                editor_name,
+                rel,
+                RuleState(hash_file(dest_file), project_hash),
+            )
+
+    # 3) New files in the editor tree (project-specific rules stay in the project)
+    for rel, editor_file in sorted(editor_files.items()):
+        if editor_file.name == "README.md" or rel in template_files:
             continue
-        rel = Path(editor_file).relative_to(editor_dir / "rules")
-        if editor_name == "cursor":
-            target_md = rules_dir / rel.with_suffix(".md")
-        else:  # windsurf
-            target_md = rules_dir / rel
-
-        if not target_md.exists():
-            console.print(f"[yellow]Found new file: {editor_file}")
-            if force:
-                with tempfile.NamedTemporaryFile("w+", delete=False) as tf:
-                    editor_module.transform_from_project(
-                        editor_file,
-                        tf.name,
-                        project_basename=project_basename,
-                    )
-                    target_md.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy(tf.name, target_md)
-                    console.print(f"[green]Copied new file to {target_md}")
-                os.unlink(tf.name)
-            else:
-                console.print(
-                    f"[cyan]Skipping new file {target_md} (use --force to create)"
+        if "project" in Path(rel).parts[:-1]:
+            continue
+        target_md = rules_dir / rel
+        console.print(f"[yellow]Found new file: {editor_file}")
+        if force:
+            with tempfile.NamedTemporaryFile("w+", delete=False) as tf:
+                editor_module.transform_from_project(
+                    editor_file,
+                    tf.name,
+                    project_basename=project_basename,
                 )
+                target_md.parent.mkdir(parents=True, exist_ok=True)
+                copy_atomic(tf.name, target_md)
+                console.print(f"[green]Copied new file to {target_md}")
+            os.unlink(tf.name)
+            record_change(changes, "created", target_md)
+        else:
+            console.print(
+                f"[cyan]Skipping new file {target_md} (use --force to create)"
+            )
+            record_change(changes, "skipped", target_md)
 
     # Handle LLM-README.md
-    src = src_folder / "LLM-README.md"
+    src = template_folder / "LLM-README.md"
     dst = editor_dir / "LLM-README.md"
     if dst.exists():
         if filecmp(src, dst):
             console.print(f"[green]Identical, skipping {src}")
+            record_change(changes, "unchanged", src)
         elif force:
-            shutil.copy(dst, src)
+            copy_atomic(dst, src)
             console.print(f"[yellow]Updated {src}")
+            record_change(changes, "updated", src)
         elif compare:
             console.print(f"[red]Diff for {src}")
-            run_compare(dst, src)
+            report.add(src, dst, label=src.relative_to(template_folder))
+            record_change(changes, "differs", src)
         else:
             console.print(f"[cyan]Skipping {src} (use --force or --compare)")
+            record_change(changes, "skipped", src)
 
+    if sync_state is not None:
+        sync_state.commit()
+    if diff_report is None:
+        report.render()
     console.print(f"[bold green]Done.")
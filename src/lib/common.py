@@ -1,101 +1,105 @@
 """Common utilities used by both cursor and windsurf modules."""
 
+import hashlib
+import os
 import re
 import shutil
-import subprocess
+import time
+import uuid
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
 
-from rich.console import Console
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writes are still atomic
+    fcntl = None
 
-console = Console()
+from .console import console  # noqa: F401  (re-exported for lib modules)
 
+CACHE_ENV = "LLM_MEMORY_BANK_CACHE"
 
-def run_compare(file1, file2):
-    """Run file comparison tool."""
-    if shutil.which("bcompare"):
-        subprocess.run(["bcompare", file1, file2])
-    else:
-        subprocess.run(["diff", file1, file2])
-        # TODO: after showing diff, then what?
+FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n(.*)", re.DOTALL)
 
 
 def extract_frontmatter(content):
     """Extract frontmatter from markdown content as a dictionary."""
-    match = re.match(r"^---\s*\n(.*?)\n---\s*\n(.*)", content, re.DOTALL)
+    match = FRONTMATTER_RE.match(content)
     if match:
-        frontmatter_text = match.group(1)
-        body = match.group(2)
-
-        # Parse frontmatter manually
-        frontmatter = {}
-        lines = frontmatter_text.split("\n")
-        i = 0
-
-        while i < len(lines):
-            line = lines[i].strip()
-
-            if ":" in line and not line.startswith("#"):
-                key, value = line.split(":", 1)
-                key = key.strip()
-                value = value.strip()
-
-                # Handle multi-line values (if line ends with incomplete value)
-                if value and not value.endswith(",") and not value.endswith("|"):
-                    # Single line value
-                    if value.lower() == "true":
-                        frontmatter[key] = True
-                    elif value.lower() == "false":
-                        frontmatter[key] = False
-                    elif value.lower() == "null" or value == "":
-                        frontmatter[key] = (
-                            "null" if value.lower() == "null" else ""
-                        )  # Preserve null as string, empty as empty
-                    elif value.startswith('"') and value.endswith('"'):
-                        frontmatter[key] = value[1:-1]  # Remove quotes
+        return parse_frontmatter(match.group(1)), match.group(2)
+    return {}, content
+
+
+def parse_frontmatter(frontmatter_text):
+    """Parse the text between the --- fences into a dictionary."""
+    # Parse frontmatter manually
+    frontmatter = {}
+    lines = frontmatter_text.split("\n")
+    i = 0
+
+    while i < len(lines):
+        line = lines[i].strip()
+
+        if ":" in line and not line.startswith("#"):
+            key, value = line.split(":", 1)
+            key = key.strip()
+            value = value.strip()
+
+            # Handle multi-line values (if line ends with incomplete value)
+            if value and not value.endswith(",") and not value.endswith("|"):
+                # Single line value
+                if value.lower() == "true":
+                    frontmatter[key] = True
+                elif value.lower() == "false":
+                    frontmatter[key] = False
+                elif value.lower() == "null" or value == "":
+                    frontmatter[key] = (
+                        "null" if value.lower() == "null" else ""
+                    )  # Preserve null as string, empty as empty
+                elif value.startswith('"') and value.endswith('"'):
+                    frontmatter[key] = value[1:-1]  # Remove quotes
+                else:
+                    frontmatter[key] = value
+            elif value == "|":
+                # Multi-line literal block
+                multiline_value = []
+                i += 1
+                while i < len(lines) and (
+                    lines[i].startswith("  ") or lines[i].strip() == ""
+                ):
+                    if lines[i].strip():
+                        multiline_value.append(lines[i][2:])  # Remove 2-space indent
                     else:
-                        frontmatter[key] = value
-                elif value == "|":
-                    # Multi-line literal block
-                    multiline_value = []
+                        multiline_value.append("")
                     i += 1
-                    while i < len(lines) and (
-                        lines[i].startswith("  ") or lines[i].strip() == ""
-                    ):
-                        if lines[i].strip():
-                            multiline_value.append(
-                                lines[i][2:]
-                            )  # Remove 2-space indent
-                        else:
-                            multiline_value.append("")
-                        i += 1
-                    frontmatter[key] = "\n".join(multiline_value)
-                    i -= 1  # Adjust for the outer loop increment
+                frontmatter[key] = "\n".join(multiline_value)
+                i -= 1  # Adjust for the outer loop increment
+            else:
+                # Handle incomplete/continuing values or empty values
+                if value == "" or value.lower() == "null":
+                    frontmatter[key] = "null" if value.lower() == "null" else ""
                 else:
-                    # Handle incomplete/continuing values or empty values
-                    if value == "" or value.lower() == "null":
-                        frontmatter[key] = "null" if value.lower() == "null" else ""
-                    else:
-                        # Handle incomplete/continuing values (like description ending with comma)
-                        full_value = value
+                    # Handle incomplete/continuing values (like description ending with comma)
+                    full_value = value
+                    i += 1
+                    # Look ahead for continuation lines (non-key lines)
+                    while i < len(lines):
+                        next_line = lines[i].strip()
+                        if ":" in next_line and not next_line.startswith(" "):
+                            # This is a new key, stop collecting
+                            i -= 1
+                            break
+                        if next_line:
+                            full_value += " " + next_line
                         i += 1
-                        # Look ahead for continuation lines (non-key lines)
-                        while i < len(lines):
-                            next_line = lines[i].strip()
-                            if ":" in next_line and not next_line.startswith(" "):
-                                # This is a new key, stop collecting
-                                i -= 1
-                                break
-                            if next_line:
-                                full_value += " " + next_line
-                            i += 1
-
-                        # Clean up the full value
-                        full_value = full_value.strip().rstrip(",")
-                        frontmatter[key] = full_value if full_value else None
-
-            i += 1
-
-        return frontmatter, body
-    return {}, content
+
+                    # Clean up the full value
+                    full_value = full_value.strip().rstrip(",")
+                    frontmatter[key] = full_value if full_value else None
+
+        i += 1
+
+    return frontmatter
 
 
 def derive_editor_fields(activation, globs=None, description=""):
@@ -125,27 +129,31 @@ def derive_editor_fields(activation, globs=None, description=""):
         )
 
 
-def validate_frontmatter(frontmatter_dict):
-    """Validate frontmatter for the new activation-based system."""
+def frontmatter_errors(frontmatter_dict):
+    """Every problem validate_frontmatter would raise for, in the same order."""
     activation = frontmatter_dict.get("activation")
 
     if not activation:
-        raise ValueError(
+        return [
             "Missing required 'activation' field. Must be one of: always, glob, agent-requested, manual"
-        )
+        ]
 
     globs = frontmatter_dict.get("globs", "")
+    if globs is not None and not isinstance(globs, str):
+        return [f"globs must be a comma-separated list, not {globs!r}"]
+
+    errors = []
 
     # Validate activation/globs combinations
     if activation == "glob" and (not globs or not globs.strip()):
-        raise ValueError("activation: glob requires non-empty globs: field")
+        errors.append("activation: glob requires non-empty globs: field")
 
     if (
         activation in ["always", "agent-requested", "manual"]
         and globs
         and globs.strip()
     ):
-        raise ValueError(f"activation: {activation} should not have globs field")
+        errors.append(f"activation: {activation} should not have globs field")
 
     # Validate priority is an integer when present (optional since we now use filename priority)
     priority = frontmatter_dict.get("priority")
@@ -153,82 +161,353 @@ def validate_frontmatter(frontmatter_dict):
         try:
             int(priority)
         except (ValueError, TypeError):
-            raise ValueError("priority field must be an integer")
+            errors.append("priority field must be an integer")
+
+    return errors
+
 
+def validate_frontmatter(frontmatter_dict):
+    """Validate frontmatter for the new activation-based system."""
+    errors = frontmatter_errors(frontmatter_dict)
+    if errors:
+        raise ValueError(errors[0])
     return True
 
 
-def create_cursor_frontmatter(frontmatter_dict):
-    """Create Cursor-style frontmatter from activation-based dictionary."""
-    validate_frontmatter(frontmatter_dict)
+# Distinct (activation, description, globs) headers kept per codec
+HEADER_CACHE_SIZE = 4096
 
-    activation = frontmatter_dict["activation"]
-    globs = frontmatter_dict.get("globs", "")
-    description = frontmatter_dict.get("description", "")
 
-    lines = ["---"]
+class FrontmatterCodec:
+    """Frontmatter headers of one output format, rendered from a table.
 
-    # Description (always include)
-    if description.strip():
-        # Always use unquoted single-line format
-        lines.append(f"description: {description}")
-    else:
-        lines.append("description: ")
+    Only four activations exist, so a header is a function of (activation,
+    description, globs): headers maps each activation to a precomputed
+    template with {description}, {globs} and {activation} fields, and
+    rendered headers are kept in an LRU cache, so emitting a header again
+    is a lookup. Activations missing from the table use fallback, or raise
+    ValueError without one.
 
-    # Handle each activation type
-    if activation == "always":
-        lines.append("globs: ")
-        lines.append("alwaysApply: true")
+    The {globs} field is globs_field[0] with the globs filled in, or
+    globs_field[1] when there are none. Whitespace-only descriptions are
+    written empty unless blank_descriptions is False.
+    """
 
-    elif activation == "glob":
-        lines.append(f"globs: {globs}")
-        # Omit alwaysApply for Auto-Attached behavior
+    def __init__(
+        self,
+        headers,
+        fallback=None,
+        default_activation=None,
+        globs_field=("globs: {}\n", "globs: \n"),
+        strip_globs=False,
+        blank_descriptions=True,
+        validate=False,
+    ):
+        self.headers = headers
+        self.fallback = fallback
+        self.default_activation = default_activation
+        self.globs_field = globs_field
+        self.strip_globs = strip_globs
+        self.blank_descriptions = blank_descriptions
+        self.validate = validate
+        self.render = lru_cache(maxsize=HEADER_CACHE_SIZE)(self._render)
+
+    def header(self, frontmatter_dict):
+        """The header for a frontmatter dictionary (validated first if the codec validates)."""
+        return self.render(
+            frontmatter_dict.get("activation", self.default_activation),
+            frontmatter_dict.get("description", ""),
+            frontmatter_dict.get("globs", ""),
+            frontmatter_dict.get("priority") if self.validate else None,
+        )
 
-    elif activation in ["agent-requested", "manual"]:
-        lines.append("globs: ")
-        lines.append("alwaysApply: false")
+    def _render(self, activation, description, globs, priority):
+        if self.validate:
+            validate_frontmatter(
+                {"activation": activation, "globs": globs, "priority": priority}
+            )
+
+        template = self.headers.get(activation, self.fallback)
+        if template is None:
+            raise ValueError(
+                f"Invalid activation type: {activation}. Must be one of: {', '.join(self.headers)}"
+            )
+
+        if globs and self.strip_globs:
+            globs = globs.strip()
+        if not description or (self.blank_descriptions and not description.strip()):
+            description = ""
+        return template.format(
+            activation=activation,
+            # Always use unquoted single-line format
+            description=description,
+            globs=self.globs_field[0].format(globs) if globs else self.globs_field[1],
+        )
 
-    lines.append("---")
-    lines.append("")  # First blank line after frontmatter
-    lines.append("")  # Second blank line for Cursor
-    return "\n".join(lines)
+
+# Cursor: alwaysApply is omitted for glob rules (Auto-Attached), and a
+# second blank line follows the header
+CURSOR_FRONTMATTER = FrontmatterCodec(
+    {
+        "always": "---\ndescription: {description}\nglobs: \nalwaysApply: true\n---\n\n",
+        "glob": "---\ndescription: {description}\n{globs}---\n\n",
+        "agent-requested": "---\ndescription: {description}\nglobs: \nalwaysApply: false\n---\n\n",
+        "manual": "---\ndescription: {description}\nglobs: \nalwaysApply: false\n---\n\n",
+    },
+    fallback="---\ndescription: {description}\n---\n\n",
+    validate=True,
+)
+
+# Windsurf as written by lib.windsurf: current trigger names, globs only on glob rules
+WINDSURF_FRONTMATTER = FrontmatterCodec(
+    {
+        "always": "---\ntrigger: always_on\ndescription: {description}\n---",
+        "glob": "---\ntrigger: glob\ndescription: {description}\n{globs}---",
+        "agent-requested": "---\ntrigger: model_decision\ndescription: {description}\n---",
+        "manual": "---\ntrigger: manual\ndescription: {description}\n---",
+    },
+    fallback="---\ntrigger: {activation}\ndescription: {description}\n---",
+    default_activation="manual",
+    globs_field=("globs: {}\n", ""),
+)
+
+# Windsurf with the earlier trigger names of derive_editor_fields
+WINDSURF_LEGACY_FRONTMATTER = FrontmatterCodec(
+    {
+        "always": "---\ntrigger: always\ndescription: {description}\nglobs: \n---",
+        "glob": "---\ntrigger: glob\ndescription: {description}\n{globs}---",
+        "agent-requested": "---\ntrigger: model\ndescription: {description}\nglobs: \n---",
+        "manual": "---\ntrigger: manual\ndescription: {description}\nglobs: \n---",
+    },
+    strip_globs=True,
+    validate=True,
+)
+
+# The activation-based template format, written when pulling rules back
+TEMPLATE_FRONTMATTER = FrontmatterCodec(
+    {
+        "always": "---\ndescription: {description}\nactivation: always\n---\n",
+        "glob": "---\ndescription: {description}\nactivation: glob\n{globs}---\n",
+        "agent-requested": "---\ndescription: {description}\nactivation: agent-requested\n---\n",
+        "manual": "---\ndescription: {description}\nactivation: manual\n---\n",
+    },
+    fallback="---\ndescription: {description}\nactivation: {activation}\n---\n",
+    default_activation="manual",
+    globs_field=('globs: "{}"\n', "globs: \n"),
+    blank_descriptions=False,
+)
+
+
+def create_cursor_frontmatter(frontmatter_dict):
+    """Create Cursor-style frontmatter from activation-based dictionary."""
+    return CURSOR_FRONTMATTER.header(frontmatter_dict)
 
 
 def create_windsurf_frontmatter(frontmatter_dict):
     """Create Windsurf-style frontmatter from activation-based dictionary."""
-    validate_frontmatter(frontmatter_dict)
+    return WINDSURF_LEGACY_FRONTMATTER.header(frontmatter_dict)
 
-    activation = frontmatter_dict["activation"]
-    globs = frontmatter_dict.get("globs", "")
-    description = frontmatter_dict.get("description", "")
 
-    editor_fields = derive_editor_fields(activation, globs, description)
+def dump_frontmatter(frontmatter, body):
+    """Dump frontmatter in new activation-based template format."""
+    if not frontmatter:
+        return body
+    return TEMPLATE_FRONTMATTER.header(frontmatter) + body
 
-    lines = ["---"]
-    lines.append(f"trigger: {editor_fields['trigger']}")
 
-    # Description
-    if description.strip():
-        # Always use unquoted single-line format
-        lines.append(f"description: {description}")
-    else:
-        lines.append("description: ")
+# Bytes read per step when comparing or hashing files
+CHUNK_SIZE = 64 * 1024
 
-    # Globs
-    if editor_fields["globs"]:
-        lines.append(f"globs: {editor_fields['globs']}")
-    else:
-        lines.append("globs: ")
+# Content hashes memoized, keyed by (path, mtime, size, inode)
+DIGEST_CACHE_SIZE = 4096
+# Files modified this recently are hashed without memoizing: a write in the
+# same mtime tick could change them without changing their stat
+RACY_NS = 2_000_000_000
+
+
+def _stat(path):
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
 
-    lines.append("---")
-    return "\n".join(lines)
+
+def _hash_file(path):
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+@lru_cache(maxsize=DIGEST_CACHE_SIZE)
+def _cached_digest(path, mtime_ns, size, ino):
+    return _hash_file(path)
+
+
+def file_digest(path):
+    """SHA-256 hex digest of a file, or None if it does not exist.
+
+    Digests are memoized per (path, mtime, size, inode), so hashing a file
+    that has not changed since the last call costs only a stat. Files
+    modified within RACY_NS of now are always read, as git does for
+    racily clean index entries.
+    """
+    st = _stat(path)
+    if st is None:
+        return None
+    try:
+        if time.time_ns() - st.st_mtime_ns < RACY_NS:
+            return _hash_file(path)
+        return _cached_digest(os.fspath(path), st.st_mtime_ns, st.st_size, st.st_ino)
+    except FileNotFoundError:
+        return None
 
 
 def filecmp(f1, f2):
-    """Compare two files for equality."""
+    """Compare two files for equality.
+
+    Sizes are checked first and contents compared chunk by chunk, stopping
+    at the first difference.
+    """
+    st1, st2 = _stat(f1), _stat(f2)
+    if st1 is None or st2 is None:
+        # If either file doesn't exist, they're not equal
+        return False
+    if (st1.st_dev, st1.st_ino) == (st2.st_dev, st2.st_ino):
+        return True
+    if st1.st_size != st2.st_size:
+        return False
     try:
         with open(f1, "rb") as a, open(f2, "rb") as b:
-            return a.read() == b.read()
+            while True:
+                chunk = a.read(CHUNK_SIZE)
+                if chunk != b.read(CHUNK_SIZE):
+                    return False
+                if not chunk:
+                    return True
     except FileNotFoundError:
-        # If either file doesn't exist, they're not equal
         return False
+
+
+def tmp_sibling(path) -> Path:
+    """A unique hidden temporary name next to path (same filesystem, so renames are atomic)."""
+    path = Path(path)
+    return path.parent / f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+
+
+@contextmanager
+def open_atomic(path, mode="w", keep_mode=True):
+    """Open a temporary file that replaces path when the block succeeds, keeping the file mode.
+
+    Readers see the old file or the new one, never a partial write; on
+    error the temporary file is removed and path is untouched. Without
+    keep_mode the new file gets the default mode instead.
+    """
+    path = Path(path)
+    tmp_path = tmp_sibling(path)
+    try:
+        with open(tmp_path, mode.replace("w", "x")) as f:
+            yield f
+        if keep_mode and path.exists():
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_atomic(path, content):
+    """Write text to path via a temporary file and rename, keeping the file mode."""
+    with open_atomic(path) as f:
+        f.write(content)
+
+
+def copy_atomic(src, dst):
+    """shutil.copy via a temporary file and rename."""
+    tmp_path = tmp_sibling(dst)
+    try:
+        shutil.copy(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def replace_dir(src, dst):
+    """Move the directory src to dst, replacing dst and removing what it held.
+
+    dst is renamed aside before src takes its place, so dst always holds one
+    complete tree; it is briefly missing between the two renames.
+    """
+    dst = Path(dst)
+    old = tmp_sibling(dst)
+    try:
+        os.rename(dst, old)
+    except FileNotFoundError:
+        old = None
+    os.rename(src, dst)
+    if old is not None:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def scan_tree(root, suffix):
+    """Map posix relative path -> absolute path for files under root with suffix.
+
+    One os.scandir pass over the tree; missing roots yield an empty mapping.
+    """
+    found = {}
+    stack = [(Path(root), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((Path(entry.path), f"{prefix}{entry.name}/"))
+                elif entry.name.endswith(suffix):
+                    found[prefix + entry.name] = Path(entry.path)
+    return found
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Hold an exclusive advisory lock on path for the duration of the block."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def lock_dir(project_folder) -> Path:
+    """Directory of a project's output locks, in the cache keyed by its path.
+
+    Locks stay out of the project so they are never staged, bundled or
+    replaced by a rename while another process holds them.
+    """
+    path = os.fsencode(Path(project_folder).resolve())
+    return cache_dir() / "locks" / hashlib.sha256(path).hexdigest()[:16]
+
+
+def output_lock(project_folder, target):
+    """Lock one generated output of a project (e.g. CLAUDE.md or .cursor/rules).
+
+    Processes writing the same output take turns; different outputs are
+    written in parallel. Lock files live under lock_dir(project_folder).
+    """
+    name = str(target).strip("/").replace("/", "-") + ".lock"
+    return file_lock(lock_dir(project_folder) / name)
+
+
+def cache_dir():
+    """Per-user cache: $LLM_MEMORY_BANK_CACHE, else $XDG_CACHE_HOME or ~/.cache."""
+    if os.environ.get(CACHE_ENV):
+        return Path(os.environ[CACHE_ENV])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "llm-memory-bank"
@@ -0,0 +1,214 @@
+"""Near-duplicate detection and compaction of append-only memory-bank logs.
+
+Entries are heading sections (or the top-level bullets of a section that is
+a bullet list). Each entry gets a MinHash signature over word-bigram shingles, and
+locality-sensitive hashing on signature bands produces candidate pairs, so
+only entries sharing a band bucket are ever compared. Candidates are then
+confirmed with exact Jaccard similarity and grouped into clusters. Only
+entries at least that similar to the entry a cluster keeps are dropped, since
+confirmed pairs chain: A~B and B~C does not make A and C alike.
+"""
+
+import random
+import re
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Set
+
+from .common import write_atomic
+from .sections import FENCE_RE, split_sections
+
+NUM_PERM = 64
+ROWS = 3
+# 21 bands x 3 rows: a 0.6-similar pair collides 99% of the time
+BANDS = NUM_PERM // ROWS
+DEFAULT_THRESHOLD = 0.6
+
+DEFAULT_FILES = [
+    "memory-bank/project/lessons_learned.md",
+    "memory-bank/project/error_documentation.md",
+    "memory-bank/project/troubleshooting_log.md",
+]
+
+# Multiply-shift hashing: ((a * x + b) mod 2**64) >> 32 is 2-universal for
+# 32-bit keys, and numpy's wrapping uint64 math computes it exactly.
+_MASK64 = (1 << 64) - 1
+_rng = random.Random(0x5EED)
+_COEFFS = [(_rng.getrandbits(64) | 1, _rng.getrandbits(64)) for _ in range(NUM_PERM)]
+
+_WORD_RE = re.compile(r"\w+")
+_BULLET_RE = re.compile(r"^[-*+] ")
+
+
+class Entry(NamedTuple):
+    start: int  # Character offsets into the file content
+    end: int
+    line: int
+    text: str
+
+
+class Cluster(NamedTuple):
+    keep: Entry
+    drop: List[Entry]
+    similarity: float  # Lowest Jaccard similarity of a dropped entry to keep
+
+
+def _bullet_starts(text: str) -> List[int]:
+    """Offsets of the top-level bullets of a section, outside code fences."""
+    starts, offset, in_fence = [], 0, False
+    for line in text.splitlines(keepends=True):
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+        elif not in_fence and _BULLET_RE.match(line):
+            starts.append(offset)
+        offset += len(line)
+    return starts
+
+
+def split_entries(content: str) -> List[Entry]:
+    """Split a log file into entries at its shallowest level-2+ heading."""
+    levels = [s.level for s in split_sections(content)[1] if s.level >= 2]
+    if not levels:
+        return []
+    preamble, sections = split_sections(content, max_level=min(levels))
+
+    entries = []
+    offset = len(preamble)
+    for section in sections:
+        if section.level >= 2:
+            bullets = _bullet_starts(section.text)
+            if len(bullets) >= 2:
+                bounds = bullets + [len(section.text)]
+                for begin, end in zip(bounds, bounds[1:]):
+                    text = section.text[begin:end]
+                    line = section.line + section.text.count("\n", 0, begin)
+                    entries.append(Entry(offset + begin, offset + end, line, text))
+            else:
+                entries.append(
+                    Entry(
+                        offset, offset + len(section.text), section.line, section.text
+                    )
+                )
+        offset += len(section.text)
+    return entries
+
+
+def shingles(text: str) -> Set[int]:
+    """32-bit hashes of the word bigrams of an entry.
+
+    Uses the built-in (per-process salted) hash; signatures are only compared
+    within one run, so they never need to be stable across runs.
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < 2:
+        return {hash(tuple(words)) & 0xFFFFFFFF} if words else set()
+    return {hash(pair) & 0xFFFFFFFF for pair in zip(words, words[1:])}
+
+
+def minhash(hashes: Set[int]) -> tuple:
+    """MinHash signature of a shingle set (NUM_PERM values)."""
+    if not hashes:
+        return (1 << 32,) * NUM_PERM
+    try:
+        import numpy as np
+    except ImportError:
+        return tuple(
+            min(((a * x + b) & _MASK64) >> 32 for x in hashes) for a, b in _COEFFS
+        )
+    x = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    a = np.array([c[0] for c in _COEFFS], dtype=np.uint64)[:, None]
+    b = np.array([c[1] for c in _COEFFS], dtype=np.uint64)[:, None]
+    return tuple(((a * x + b) >> np.uint64(32)).min(axis=1).tolist())
+
+
+def find_clusters(
+    entries: List[Entry], threshold: float = DEFAULT_THRESHOLD
+) -> List[Cluster]:
+    """Group near-duplicate entries; the longest entry of each cluster is kept."""
+    shingle_sets = [shingles(e.text) for e in entries]
+    buckets: Dict[tuple, List[int]] = {}
+    for i, hashes in enumerate(shingle_sets):
+        if not hashes:
+            continue
+        signature = minhash(hashes)
+        for band in range(BANDS):
+            key = (band,) + signature[band * ROWS : (band + 1) * ROWS]
+            buckets.setdefault(key, []).append(i)
+
+    parent = list(range(len(entries)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    rejected = set()
+    for members in buckets.values():
+        for pos, i in enumerate(members):
+            for j in members[pos + 1 :]:
+                root_i, root_j = find(i), find(j)
+                if root_i == root_j or (i, j) in rejected:
+                    continue
+                a, b = shingle_sets[i], shingle_sets[j]
+                similarity = len(a & b) / len(a | b)
+                if similarity < threshold:
+                    rejected.add((i, j))
+                    continue
+                parent[root_j] = root_i
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(entries)):
+        groups.setdefault(find(i), []).append(i)
+
+    # A union-find group is only a chain of similar pairs, so split it around
+    # its longest entry: drop what is similar to that, and regroup the rest.
+    clusters = []
+    for members in groups.values():
+        members.sort(key=lambda i: (-len(entries[i].text), i))
+        while len(members) >= 2:
+            keep, rest = members[0], members[1:]
+            similar, members = [], []
+            for i in rest:
+                a, b = shingle_sets[keep], shingle_sets[i]
+                similarity = len(a & b) / len(a | b)
+                if similarity >= threshold:
+                    similar.append((i, similarity))
+                else:
+                    members.append(i)
+            if similar:
+                clusters.append(
+                    Cluster(
+                        entries[keep],
+                        [entries[i] for i, _ in similar],
+                        min(similarity for _, similarity in similar),
+                    )
+                )
+    clusters.sort(key=lambda c: c.keep.start)
+    return clusters
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def compact_file(path: Path, threshold: float = DEFAULT_THRESHOLD, apply: bool = False):
+    """Find near-duplicate entries in a file and optionally remove them.
+
+    Returns (clusters, bytes_saved, tokens_saved).
+    """
+    with open(path, "r") as f:
+        content = f.read()
+    clusters = find_clusters(split_entries(content), threshold)
+    dropped = sorted((e for c in clusters for e in c.drop), key=lambda e: e.start)
+    removed = "".join(e.text for e in dropped)
+
+    if apply and dropped:
+        pieces, cursor = [], 0
+        for entry in dropped:
+            pieces.append(content[cursor : entry.start])
+            cursor = entry.end
+        pieces.append(content[cursor:])
+        write_atomic(path, "".join(pieces))
+
+    return clusters, len(removed.encode()), estimate_tokens(removed)
@@ -0,0 +1,45 @@
+"""Shared rich console, created on first use.
+
+Importing rich costs more than the rest of CLI startup combined, so modules
+import this proxy instead of building their own ``Console()``; rich is only
+loaded once something is actually printed.
+
+``quiet()`` silences it for library callers (``lib.api``), process-wide.
+"""
+
+
+def _discard(*args, **kwargs):
+    pass
+
+
+class _LazyConsole:
+    """Forwards attribute access to a rich Console built on first access."""
+
+    _console = None
+    _quiet = 0
+
+    def __getattr__(self, name):
+        if name == "print" and _LazyConsole._quiet:
+            return _discard
+        if _LazyConsole._console is None:
+            from rich.console import Console
+
+            _LazyConsole._console = Console()
+        return getattr(_LazyConsole._console, name)
+
+
+console = _LazyConsole()
+
+
+class quiet:
+    """Context manager dropping console.print output (without loading rich).
+
+    A class rather than a contextlib generator to keep this module free of
+    imports.
+    """
+
+    def __enter__(self):
+        _LazyConsole._quiet += 1
+
+    def __exit__(self, *exc):
+        _LazyConsole._quiet -= 1
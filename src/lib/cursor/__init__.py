@@ -2,7 +2,11 @@
 
 import re
 
-from ..common import create_cursor_frontmatter, extract_frontmatter
+from ..common import create_cursor_frontmatter, dump_frontmatter, extract_frontmatter
+
+# Where rendered rules live in a project, and their file extension
+RULES_DIR = ".cursor/rules"
+RULE_SUFFIX = ".mdc"
 
 
 def transform_to_project(src_path, dst_path):
@@ -52,7 +56,7 @@ def transform_from_project(
     body = re.sub(r"\((mdc:)?\.cursor/rules/[^)]+\.mdc\)", repl, body)
 
     if not body:
-        from ..common import console
+        from ..console import console
 
         console.print(f"[red]Warning: {src_path} is empty")
         return
@@ -86,35 +90,3 @@ def transform_from_project(
 
     with open(dst_path, "w") as f:
         f.write(dump_frontmatter(new_frontmatter, body))
-
-
-def dump_frontmatter(frontmatter, body):
-    """Dump frontmatter in new activation-based template format."""
-    if not frontmatter:
-        return body
-
-    lines = ["---"]
-
-    # Description (always include)
-    desc = frontmatter.get("description", "")
-    if desc:
-        # Always use unquoted single-line format
-        lines.append(f"description: {desc}")
-    else:
-        lines.append("description: ")
-
-    # Activation (always include)
-    activation = frontmatter.get("activation", "manual")
-    lines.append(f"activation: {activation}")
-
-    # Globs (only for glob activation)
-    if activation == "glob":
-        globs_value = frontmatter.get("globs", "")
-        if globs_value:
-            lines.append(f'globs: "{globs_value}"')
-        else:
-            lines.append("globs: ")
-
-    lines.append("---")
-
-    return "\n".join(lines) + "\n" + body
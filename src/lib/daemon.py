@@ -0,0 +1,174 @@
+"""Long-running rules daemon serving CLI commands over a Unix socket.
+
+The daemon imports everything once and keeps the per-file caches warm:
+parsed links (``lib.lint``), rendered rules (``commands.render_rule``) and
+file digests (``common.file_digest``). A watcher thread polls the template
+and memory-bank trees and re-warms those caches as soon as a file changes,
+so requests rarely parse or transform anything.
+
+Each connection carries one CLI invocation (see ``lib.daemon_client`` for
+the wire format). Invocations run one at a time through the same click CLI
+as in-process calls, so output and exit codes match.
+"""
+
+import contextlib
+import io
+import os
+import socketserver
+import threading
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from .commands import render_rule
+from .common import scan_tree
+from .daemon_client import (
+    PING,
+    SOCKET_NAME,
+    STATE_DIR,
+    STOP,
+    decode_request,
+    encode_response,
+    request_env,
+)
+from .editors import available_editors
+from .lint import find_broken_links
+
+POLL_INTERVAL = 1.0
+
+
+@contextlib.contextmanager
+def client_environment(env):
+    """Replace the daemon's forwarded variables with a client's for the block."""
+    own = request_env(os.environ)
+    for key in own:
+        del os.environ[key]
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for key in request_env(os.environ):
+            del os.environ[key]
+        os.environ.update(own)
+
+
+class RulesDaemon:
+    """Serve a click CLI over a Unix socket, with caches warmed on change."""
+
+    def __init__(
+        self,
+        cli: click.Group,
+        repo_root: Path,
+        poll_interval: float = POLL_INTERVAL,
+        socket_path: Optional[Path] = None,
+    ):
+        self.cli = cli
+        self.repo_root = Path(repo_root)
+        self.src_root = self.repo_root / "src"
+        self.socket_path = Path(socket_path or self.repo_root / STATE_DIR / SOCKET_NAME)
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()  # One command at a time; also guards the caches
+        self.stopped = threading.Event()
+        self.signature = None
+        self.server = None
+
+    def tree_signature(self):
+        """(path, mtime, size) of every template and memory-bank file."""
+        signature = []
+        for root in (self.src_root / "rules", self.repo_root / "memory-bank"):
+            for rel, path in sorted(scan_tree(root, "").items()):
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                signature.append((str(path), st.st_mtime_ns, st.st_size))
+        return signature
+
+    def warm(self):
+        """Re-parse links and re-render rules for files that changed."""
+        find_broken_links(self.src_root, self.repo_root)
+        modules = [e.load() for e in available_editors().values() if not e.output_file]
+        for path in scan_tree(self.src_root / "rules", ".md").values():
+            if path.name == "README.md":
+                continue
+            for module in modules:
+                render_rule(module, path)
+
+    def watch(self):
+        while not self.stopped.wait(self.poll_interval):
+            signature = self.tree_signature()
+            if signature != self.signature:
+                with self.lock:
+                    self.warm()
+                self.signature = signature
+
+    def handle(self, cwd, argv, env=None):
+        """Run one CLI invocation; returns (exit status, stdout, stderr).
+
+        env holds the client's forwarded variables (see request_env), which
+        stand in for the daemon's own while the command runs.
+        """
+        stdout, stderr = io.StringIO(), io.StringIO()
+        code = 0
+        with self.lock:
+            previous_cwd = os.getcwd()
+            try:
+                os.chdir(cwd or previous_cwd)
+                # The shared console writes to sys.stdout, so this captures
+                # rich output along with plain prints
+                with (
+                    client_environment(env or {}),
+                    contextlib.redirect_stdout(stdout),
+                    contextlib.redirect_stderr(stderr),
+                ):
+                    try:
+                        self.cli.main(
+                            args=argv, prog_name="main.py", standalone_mode=False
+                        )
+                    except click.ClickException as e:
+                        e.show()
+                        code = e.exit_code
+                    except click.exceptions.Abort:
+                        code = 1
+                    except SystemExit as e:
+                        code = (
+                            e.code
+                            if isinstance(e.code, int)
+                            else (0 if e.code is None else 1)
+                        )
+            except Exception as e:  # Report, but keep serving
+                stderr.write(f"daemon error: {e!r}\n")
+                code = 1
+            finally:
+                os.chdir(previous_cwd)
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def serve_forever(self):
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                cwd, env, argv = decode_request(self.rfile.read())
+                if argv == [PING]:
+                    response = (0, f"{os.getpid()}\n", "")
+                elif argv == [STOP]:
+                    response = (0, "", "")
+                    threading.Thread(target=daemon.server.shutdown).start()
+                else:
+                    response = daemon.handle(cwd, argv, env)
+                self.wfile.write(encode_response(*response))
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        self.signature = self.tree_signature()
+        self.warm()
+        watcher = threading.Thread(target=self.watch, daemon=True)
+        watcher.start()
+        self.server = socketserver.UnixStreamServer(str(self.socket_path), Handler)
+        try:
+            self.server.serve_forever()
+        finally:
+            self.stopped.set()
+            self.server.server_close()
+            self.socket_path.unlink(missing_ok=True)
@@ -0,0 +1,150 @@
+"""Thin client forwarding CLI calls to a running rules daemon.
+
+Imported by ``main.py`` before click or any other library module, so it
+must stay cheap to import: it uses the C-level ``_socket`` module (the
+``socket`` wrapper pulls in enum, and json pulls in re) and a plain
+length-prefixed wire format instead of JSON. If no daemon answers, the
+caller falls back to running the command in-process, as it does when a
+served command takes longer than ``REQUEST_TIMEOUT``.
+
+Wire format, one request per connection:
+
+- request: NUL-separated ``cwd``, the number of environment entries, those
+  ``KEY=VALUE`` entries and argv, UTF-8; the client then shuts down its
+  write side
+- response: ``b"<exit> <stdout bytes> <stderr bytes>\\n"`` followed by
+  stdout and stderr
+"""
+
+import _socket
+import os
+import sys
+
+SOCKET_NAME = "daemon.sock"
+STATE_DIR = ".llm-memory-bank"
+DISABLE_ENV = "LLM_MEMORY_BANK_NO_DAEMON"
+
+# Variables sent with each request; the daemon runs the command with these
+# in place of its own, so the cache, difftool and so on are the caller's
+ENV_PREFIX = "LLM_MEMORY_BANK_"
+FORWARDED_ENV = ("XDG_CACHE_HOME",)
+
+# Seconds to wait on a served command before running it in-process instead
+REQUEST_TIMEOUT = 30.0
+
+# Control messages understood by the daemon itself
+PING = "__ping__"
+STOP = "__stop__"
+
+# Command prefixes the daemon serves; everything else always runs in-process
+SERVED = (
+    ("generate",),
+    ("check",),
+    ("hook",),
+    ("lint",),
+    ("render",),
+    ("memory-bank", "search"),
+    ("memory-bank", "log", "query"),
+)
+
+
+class Response:
+    __slots__ = ("exit", "stdout", "stderr")
+
+    def __init__(self, exit, stdout, stderr):
+        self.exit = exit
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+def socket_path(repo_root):
+    return os.path.join(repo_root, STATE_DIR, SOCKET_NAME)
+
+
+def is_served(argv):
+    if "--help" in argv:
+        return False
+    return any(tuple(argv[: len(prefix)]) == prefix for prefix in SERVED)
+
+
+def encode_response(exit, stdout, stderr):
+    out, err = stdout.encode(), stderr.encode()
+    return f"{exit} {len(out)} {len(err)}\n".encode() + out + err
+
+
+def request_env(environ):
+    """The entries of environ that are forwarded with a request."""
+    return {
+        key: value
+        for key, value in environ.items()
+        if key.startswith(ENV_PREFIX) or key in FORWARDED_ENV
+    }
+
+
+def encode_request(cwd, argv, env):
+    entries = [f"{key}={value}" for key, value in env.items()]
+    return "\0".join([cwd, str(len(entries)), *entries, *argv]).encode()
+
+
+def decode_request(data):
+    """(cwd, env, argv) from a request."""
+    cwd, count, *fields = data.decode().split("\0")
+    count = int(count)
+    env = dict(entry.split("=", 1) for entry in fields[:count])
+    return cwd, env, fields[count:]
+
+
+def request(path, argv, cwd="", env=None, timeout=None):
+    """Send argv to the daemon and return its Response."""
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(encode_request(cwd, argv, env or {}))
+        sock.shutdown(_socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        sock.close()
+    data = b"".join(chunks)
+    header, _, body = data.partition(b"\n")
+    exit, out_len, err_len = (int(field) for field in header.split())
+    if len(body) != out_len + err_len:
+        raise ValueError("Truncated daemon response")
+    return Response(exit, body[:out_len].decode(), body[out_len:].decode())
+
+
+def run_via_daemon(argv, repo_root):
+    """Run argv on the daemon and exit with its status; return if none answers."""
+    if os.environ.get(DISABLE_ENV) or not is_served(argv):
+        return
+    path = socket_path(repo_root)
+    if not os.path.exists(path):
+        return
+    if (
+        argv[0] == "hook"
+        and os.environ.get("GIT_INDEX_FILE")
+        and "--index-file" not in argv
+    ):
+        # The daemon does not see our environment; pass the hook's index along
+        argv = [*argv, "--index-file", os.path.abspath(os.environ["GIT_INDEX_FILE"])]
+    try:
+        response = request(
+            path,
+            argv,
+            cwd=os.getcwd(),
+            env=request_env(os.environ),
+            timeout=REQUEST_TIMEOUT,
+        )
+    except (OSError, ValueError):
+        # Stale socket, daemon went away mid-request or is stuck (timeouts
+        # are OSErrors too): run in-process
+        return
+    sys.stdout.write(response.stdout)
+    sys.stderr.write(response.stderr)
+    sys.stdout.flush()
+    sys.exit(response.exit)
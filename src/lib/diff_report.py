@@ -0,0 +1,193 @@
+"""In-process diff collection for --compare runs.
+
+Instead of starting one ``diff`` or ``bcompare`` process per differing file,
+sync commands add each pair to a DiffReport. At the end of the run the
+report is shown once: as a single paged unified diff with summary stats, by
+launching one external tool on two directory trees holding every pair, or
+written out as JSON.
+"""
+
+import difflib
+import json
+import os
+import shlex
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import List, NamedTuple
+
+from .console import console
+
+CONTEXT_LINES = 3
+DIFFTOOL_ENV = "LLM_MEMORY_BANK_DIFFTOOL"
+
+
+class FileDiff(NamedTuple):
+    path: str  # Label shown for the pair, usually the file that would change
+    old_text: str
+    new_text: str
+    lines: List[str]  # Unified diff lines without trailing newlines
+    added: int
+    removed: int
+
+
+def unified_diff(old_lines, new_lines, old_name, new_name, n=CONTEXT_LINES):
+    """Unified diff that skips the common head and tail before matching.
+
+    Sync diffs are usually a few edited lines in a long file; trimming the
+    identical prefix and suffix first keeps SequenceMatcher's work
+    proportional to the changed region, not the file size.
+    """
+    prefix = 0
+    limit = min(len(old_lines), len(new_lines))
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < limit - prefix
+        and old_lines[len(old_lines) - 1 - suffix]
+        == new_lines[len(new_lines) - 1 - suffix]
+    ):
+        suffix += 1
+
+    # Keep n lines of context on each side of the changed region
+    start = max(0, prefix - n)
+    old_mid = old_lines[start : len(old_lines) - max(0, suffix - n)]
+    new_mid = new_lines[start : len(new_lines) - max(0, suffix - n)]
+
+    matcher = difflib.SequenceMatcher(None, old_mid, new_mid, autojunk=False)
+    output = []
+    for group in matcher.get_grouped_opcodes(n):
+        if not output:
+            output += [f"--- {old_name}", f"+++ {new_name}"]
+        i1, i2 = group[0][1] + start, group[-1][2] + start
+        j1, j2 = group[0][3] + start, group[-1][4] + start
+        output.append(f"@@ -{_range(i1, i2)} +{_range(j1, j2)} @@")
+        for tag, a1, a2, b1, b2 in group:
+            if tag == "equal":
+                output += [" " + line for line in old_mid[a1:a2]]
+                continue
+            if tag in ("replace", "delete"):
+                output += ["-" + line for line in old_mid[a1:a2]]
+            if tag in ("replace", "insert"):
+                output += ["+" + line for line in new_mid[b1:b2]]
+    return output
+
+
+def _range(start, stop):
+    """Hunk range in unified diff notation (1-based, length omitted when 1)."""
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+class DiffReport:
+    """Collects file pairs that differ and reports them together."""
+
+    def __init__(self):
+        self.diffs: List[FileDiff] = []
+
+    def __bool__(self):
+        return bool(self.diffs)
+
+    def add(self, old_path, new_path, label=None):
+        """Record the difference between two files (read now, so temp files may go)."""
+        with open(old_path, "r") as f:
+            old_text = f.read()
+        with open(new_path, "r") as f:
+            new_text = f.read()
+        self.add_text(label or str(old_path), old_text, new_text)
+
+    def add_text(self, path, old_text, new_text):
+        path = str(path)
+        old_name, new_name = (
+            (path, path) if os.path.isabs(path) else (f"a/{path}", f"b/{path}")
+        )
+        lines = unified_diff(
+            old_text.splitlines(), new_text.splitlines(), old_name, new_name
+        )
+        added = sum(1 for line in lines[2:] if line.startswith("+"))
+        removed = sum(1 for line in lines[2:] if line.startswith("-"))
+        self.diffs.append(FileDiff(path, old_text, new_text, lines, added, removed))
+
+    def summary(self):
+        return {
+            "files": len(self.diffs),
+            "added": sum(d.added for d in self.diffs),
+            "removed": sum(d.removed for d in self.diffs),
+        }
+
+    def to_json(self):
+        return json.dumps(
+            {
+                "summary": self.summary(),
+                "files": [
+                    {
+                        "path": d.path,
+                        "added": d.added,
+                        "removed": d.removed,
+                        "diff": "\n".join(d.lines),
+                    }
+                    for d in self.diffs
+                ],
+            },
+            indent=2,
+        )
+
+    def render(self, difftool=None):
+        """Show the collected diffs once, then the summary stats.
+
+        Args:
+            difftool: External command run once on two directory trees
+                instead of printing a paged unified diff; defaults to
+                $LLM_MEMORY_BANK_DIFFTOOL
+        """
+        if not self.diffs:
+            return
+        difftool = difftool or os.environ.get(DIFFTOOL_ENV)
+        if difftool:
+            self.run_difftool(difftool)
+        else:
+            self.print_text()
+        stats = self.summary()
+        console.print(
+            f"[bold]{stats['files']} files differ, "
+            f"[green]+{stats['added']}[/green] [red]-{stats['removed']}[/red] lines"
+        )
+
+    def print_text(self):
+        def emit():
+            for diff in self.diffs:
+                for line in diff.lines:
+                    if line.startswith(("---", "+++")):
+                        style = "bold"
+                    elif line.startswith("@@"):
+                        style = "cyan"
+                    elif line.startswith("+"):
+                        style = "green"
+                    elif line.startswith("-"):
+                        style = "red"
+                    else:
+                        style = None
+                    console.print(line, style=style, markup=False, highlight=False)
+
+        if console.is_terminal:
+            with console.pager(styles=True):
+                emit()
+        else:
+            emit()
+
+    def run_difftool(self, difftool):
+        """Write every pair into two temp trees and run the tool once on them."""
+        with tempfile.TemporaryDirectory(prefix="llm-memory-bank-diff-") as tmp:
+            old_root, new_root = Path(tmp) / "current", Path(tmp) / "proposed"
+            for diff in self.diffs:
+                rel = Path(diff.path.lstrip("/"))
+                for root, text in (
+                    (old_root, diff.old_text),
+                    (new_root, diff.new_text),
+                ):
+                    (root / rel).parent.mkdir(parents=True, exist_ok=True)
+                    (root / rel).write_text(text)
+            subprocess.run(shlex.split(difftool) + [str(old_root), str(new_root)])
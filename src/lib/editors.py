@@ -0,0 +1,60 @@
+"""Registry of the editors `generate` can build rules for.
+
+Two kinds of editor exist:
+
+- Rule-directory editors (Cursor, Windsurf) render every template rule into
+  their own directory through an editor module that provides
+  ``transform_to_project``, ``transform_from_project``, ``RULES_DIR`` and
+  ``RULE_SUFFIX``.
+- Single-file editors (Claude Code, Aider) concatenate the always-on rules
+  into one file at the project root.
+
+Editor modules are only imported when their editor is selected. Third-party
+packages can add rule-directory editors by exposing such a module under the
+``llm_memory_bank.editors`` entry point group.
+"""
+
+from functools import lru_cache, partial
+from importlib import import_module
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+ENTRY_POINT_GROUP = "llm_memory_bank.editors"
+
+
+class Editor(NamedTuple):
+    name: str
+    # Returns the editor module (rule-directory editors)
+    load: Optional[Callable] = None
+    output_file: Optional[str] = None  # File written at the root (single-file editors)
+
+
+BUILTIN_EDITORS = [
+    Editor("cursor", load=partial(import_module, ".cursor", __package__)),
+    Editor("windsurf", load=partial(import_module, ".windsurf", __package__)),
+    Editor("claude-code", output_file="CLAUDE.md"),
+    Editor("aider-chat", output_file="CONVENTIONS.md"),
+]
+
+
+@lru_cache(maxsize=None)
+def available_editors() -> Dict[str, Editor]:
+    """Built-in editors followed by those registered through entry points."""
+    from importlib.metadata import entry_points
+
+    editors = {editor.name: editor for editor in BUILTIN_EDITORS}
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name not in editors:
+            editors[entry_point.name] = Editor(entry_point.name, load=entry_point.load)
+    return editors
+
+
+def select_editors(names) -> List[Editor]:
+    """Editors for the given names in registry order; all of them when names is empty."""
+    names = list(names)
+    editors = available_editors()
+    unknown = [name for name in names if name not in editors]
+    if unknown:
+        raise ValueError(
+            f"Unknown editor: {', '.join(unknown)}. Must be one of: {', '.join(editors)}"
+        )
+    return [editor for name, editor in editors.items() if not names or name in names]
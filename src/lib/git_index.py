@@ -0,0 +1,62 @@
+"""Content identity of files git already tracks, from git's index.
+
+For a tree under git, ``git ls-files -s`` lists the blob ID of every
+tracked file and ``git diff --name-only`` the files whose worktree content
+no longer matches it. Every other tracked file is known by its blob ID
+without being read. Sync state keeps the SHA-256 of each blob it has seen
+(``SyncState.hash_file``), so unchanged files are never hashed again, in
+this process or the next.
+
+Outside git, or when git fails, ``GitIndex.load`` returns None and callers
+hash files themselves.
+"""
+
+import os
+import subprocess
+from typing import Dict, Optional
+
+# Regular and executable files; symlinks and submodules have other blobs
+FILE_MODES = (b"100644", b"100755")
+
+
+class GitIndex:
+    """Blob IDs of the clean tracked files under one directory."""
+
+    def __init__(self, root: str, blobs: Dict[str, str]):
+        self.root = root
+        self.blobs = blobs  # Absolute path -> blob ID
+
+    @classmethod
+    def load(cls, root) -> Optional["GitIndex"]:
+        """Index of root, or None if it is not inside a git work tree."""
+        root = os.path.abspath(root)
+        if not os.path.isdir(root):
+            return None
+        try:
+            listed = run_git(root, "ls-files", "-s", "-z")
+            dirty = set(
+                run_git(root, "diff", "--name-only", "--relative", "-z").split(b"\0")
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+        blobs = {}
+        for entry in listed.split(b"\0"):
+            if not entry:
+                continue
+            info, _, rel = entry.partition(b"\t")
+            mode, blob, stage = info.split(b" ")
+            if mode in FILE_MODES and stage == b"0" and rel not in dirty:
+                blobs[os.path.join(root, os.fsdecode(rel))] = blob.decode()
+        return cls(root, blobs)
+
+    def blob(self, path) -> Optional[str]:
+        """Blob ID of path if git tracks it and the worktree file matches."""
+        return self.blobs.get(os.path.abspath(path))
+
+
+def run_git(root, *args, input: Optional[bytes] = None, env=None) -> bytes:
+    """Output of a git command run in root; raises CalledProcessError on failure."""
+    return subprocess.run(
+        ["git", *args], cwd=root, input=input, env=env, capture_output=True, check=True
+    ).stdout
@@ -0,0 +1,199 @@
+"""Which glob-activated rules apply to a set of paths.
+
+Rules with ``activation: glob`` carry comma-separated globs. ``RuleMatcher``
+compiles every glob once and indexes it by what a matching path must
+contain, so each path is only tested against a few candidates:
+
+- globs starting with literal directories (``src/api/**/*.ts``) by that
+  directory prefix; a path looks up each of its parent directories
+- other globs ending in ``*.<ext>`` (``**/*.tsx``, ``*.py``) by extension;
+  a path looks up each dotted suffix of its file name
+- anything else is tested against every path
+
+Lookups are dictionary hits, so matching N paths costs about N times the
+path depth plus the few candidate regexes, whatever the number of rules.
+
+Glob syntax: ``*`` and ``?`` stay within a directory, ``**`` spans
+directories, ``[...]`` and ``{a,b}`` work as in shells, a glob without
+``/`` (other than a trailing one) matches at any depth, and a trailing
+``/`` matches everything below a directory.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+from .rule import Rule
+
+WILDCARDS = set("*?[{")
+
+
+def split_globs(globs) -> List[str]:
+    """The individual globs of a rule's comma-separated globs field.
+
+    Commas inside {a,b} belong to the glob.
+    """
+    globs = str(globs or "")
+    parts, depth, begin = [], 0, 0
+    for i, char in enumerate(globs):
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth = max(depth - 1, 0)
+        elif char == "," and depth == 0:
+            parts.append(globs[begin:i])
+            begin = i + 1
+    parts.append(globs[begin:])
+    return [glob.strip() for glob in parts if glob.strip()]
+
+
+def expand_braces(glob: str) -> List[str]:
+    """Expand {a,b} alternatives (nested too) into separate globs."""
+    start = glob.find("{")
+    if start < 0:
+        return [glob]
+    depth = 0
+    options, begin = [], start + 1
+    for i in range(start, len(glob)):
+        char = glob[i]
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                options.append(glob[begin:i])
+                head, tail = glob[:start], glob[i + 1 :]
+                return [
+                    expanded
+                    for option in options
+                    for expanded in expand_braces(head + option + tail)
+                ]
+        elif char == "," and depth == 1:
+            options.append(glob[begin:i])
+            begin = i + 1
+    return [glob]  # Unbalanced: treat the brace literally
+
+
+@lru_cache(maxsize=None)
+def glob_to_regex(glob: str) -> str:
+    """Regex source matching whole posix paths for a brace-free glob."""
+    glob = glob[2:] if glob.startswith("./") else glob.lstrip("/")
+    anchored = "/" in glob.rstrip("/")
+    if glob.endswith("/"):
+        glob += "**"  # A directory: everything below it
+    out = [] if anchored else ["(?:.*/)?"]
+    i = 0
+    while i < len(glob):
+        char = glob[i]
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if glob.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = glob.find("]", i + 2)
+            if end < 0:
+                out.append(re.escape(char))
+            else:
+                body = glob[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return "".join(out) + r"\Z"
+
+
+def literal_prefix(glob: str) -> str:
+    """Leading directories of a glob without wildcards ('src/api/' for src/api/*.ts)."""
+    glob = glob[2:] if glob.startswith("./") else glob.lstrip("/")
+    if "/" not in glob.rstrip("/"):
+        return ""
+    parts = glob.split("/")[:-1]
+    prefix = []
+    for part in parts:
+        if WILDCARDS & set(part):
+            break
+        prefix.append(part + "/")
+    return "".join(prefix)
+
+
+def literal_extension(glob: str) -> str:
+    """'.ts' for globs whose file name part is '*.ts', else ''."""
+    name = glob.rsplit("/", 1)[-1]
+    if name.startswith("*.") and not WILDCARDS & set(name[1:]):
+        return name[1:]
+    return ""
+
+
+def normalize_path(path: str) -> str:
+    path = str(path).replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    return path.lstrip("/")
+
+
+class RuleMatcher:
+    """All glob rules of a rule set, compiled into one indexed matcher."""
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules = [rule for rule in rules if rule.activation == "glob"]
+        # Each entry: (compiled regex, indexes of the rules using that glob)
+        compiled: Dict[str, Tuple[re.Pattern, List[int]]] = {}
+        for index, rule in enumerate(self.rules):
+            for glob in split_globs(rule.globs):
+                for expanded in expand_braces(glob):
+                    entry = compiled.get(expanded)
+                    if entry is None:
+                        entry = compiled[expanded] = (
+                            re.compile(glob_to_regex(expanded)),
+                            [],
+                        )
+                    if index not in entry[1]:
+                        entry[1].append(index)
+
+        self.by_prefix: Dict[str, list] = {}
+        self.by_extension: Dict[str, list] = {}
+        self.unindexed: list = []
+        for glob, entry in compiled.items():
+            prefix = literal_prefix(glob)
+            extension = literal_extension(glob)
+            if prefix:
+                self.by_prefix.setdefault(prefix, []).append(entry)
+            elif extension:
+                self.by_extension.setdefault(extension, []).append(entry)
+            else:
+                self.unindexed.append(entry)
+
+    def candidates(self, path: str):
+        directory_end = path.find("/")
+        while directory_end >= 0:
+            yield from self.by_prefix.get(path[: directory_end + 1], ())
+            directory_end = path.find("/", directory_end + 1)
+        name = path[path.rfind("/") + 1 :]
+        dot = name.find(".")
+        while dot >= 0:
+            yield from self.by_extension.get(name[dot:], ())
+            dot = name.find(".", dot + 1)
+        yield from self.unindexed
+
+    def match(self, path: str) -> List[Rule]:
+        """Glob rules applying to a repository-relative path, in rule order."""
+        path = normalize_path(path)
+        found = set()
+        for regex, indexes in self.candidates(path):
+            if not found.issuperset(indexes) and regex.match(path):
+                found.update(indexes)
+        return [self.rules[index] for index in sorted(found)]
+
+    def match_many(self, paths: Iterable[str]) -> Dict[str, List[Rule]]:
+        return {path: self.match(path) for path in paths}
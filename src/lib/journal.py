@@ -0,0 +1,168 @@
+"""Lock-free concurrent appends to memory-bank logs via per-writer journals.
+
+Each writer appends JSON-line records to its own journal file, opened with
+``O_APPEND`` and written with a single ``os.write`` per record, so writers
+never block each other or interleave partial records. ``merge`` folds every
+journal into the canonical markdown files in timestamp order and then deletes
+the journals it has read to the end, so each writer's journal only holds what
+has not been merged yet. Appends hold a shared lock on their journal, which
+``merge`` takes exclusively while it reads and retires it.
+
+Journals live in ``<project>/.llm-memory-bank/journal/<writer>.jsonl``.
+"""
+
+import json
+import os
+import socket
+import time
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: journals are kept and merged from saved positions
+    fcntl = None
+
+from .common import file_lock, write_atomic
+from .journal_logs import LOGS
+from .segmented_log import SegmentedLog
+
+JOURNAL_DIR = Path(".llm-memory-bank") / "journal"
+CURSORS_FILE = "cursors.json"
+LOCK_FILE = "merge.lock"
+
+
+class Record(NamedTuple):
+    ts: int  # Nanoseconds since the epoch
+    writer: str
+    seq: int  # Byte offset of the record in its writer's journal
+    log: str
+    title: str
+    body: str
+
+
+def default_writer_id() -> str:
+    """Writer id from $MEMORY_BANK_WRITER, else host and process id."""
+    return (
+        os.environ.get("MEMORY_BANK_WRITER") or f"{socket.gethostname()}-{os.getpid()}"
+    )
+
+
+class Journal:
+    """Per-writer journals for one project."""
+
+    def __init__(self, project_root: Path):
+        self.project_root = Path(project_root)
+        self.journal_dir = self.project_root / JOURNAL_DIR
+
+    def append(
+        self, log: str, title: str, body: str, writer: Optional[str] = None
+    ) -> Record:
+        """Append one record to this writer's journal without taking any lock."""
+        if log not in LOGS:
+            raise ValueError(f"Unknown log: {log}. Must be one of: {', '.join(LOGS)}")
+        writer = writer or default_writer_id()
+        if not writer or "/" in writer or writer.startswith("."):
+            raise ValueError(f"Invalid writer id: {writer!r}")
+        path = self.journal_dir / f"{writer}.jsonl"
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        fd = self._open_journal(path)
+        try:
+            seq = os.fstat(fd).st_size
+            record = Record(time.time_ns(), writer, seq, log, title, body)
+            line = (json.dumps(record._asdict()) + "\n").encode()
+            written = os.write(fd, line)
+            if written != len(line):
+                raise OSError(f"Short journal write ({written} of {len(line)} bytes)")
+        finally:
+            os.close(fd)
+        return record
+
+    @staticmethod
+    def _open_journal(path: Path) -> int:
+        """Open a journal for appending, locked so merge cannot retire it meanwhile."""
+        while True:
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            if fcntl is None:
+                return fd
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            if os.fstat(fd).st_nlink:
+                return fd
+            # A merge deleted the journal while we waited; start a new one
+            os.close(fd)
+
+    def _load_cursors(self) -> Dict[str, int]:
+        try:
+            with open(self.journal_dir / CURSORS_FILE, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def pending(self) -> List[Record]:
+        """Records not yet merged, in timestamp order."""
+        return self._read_pending(self._load_cursors())[0]
+
+    def _read_pending(self, cursors: Dict[str, int], stack: Optional[ExitStack] = None):
+        """Return (records, new_cursors, consumed) across all journals.
+
+        With a stack, each journal is locked exclusively until the stack
+        closes, and the paths of journals read to the end are in consumed.
+        """
+        records, new_cursors, consumed = [], {}, []
+        retire = stack is not None and fcntl is not None
+        if not self.journal_dir.exists():
+            return records, new_cursors, consumed
+        for entry in os.scandir(self.journal_dir):
+            if not entry.name.endswith(".jsonl"):
+                continue
+            with open(entry.path, "rb") as f:
+                if retire:
+                    lock = stack.enter_context(open(entry.path, "rb"))
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                f.seek(cursors.get(entry.name, 0))
+                data = f.read()
+            # Only consume complete lines; a record being written right now
+            # is picked up by the next merge.
+            complete = data[: data.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                if line.strip():
+                    records.append(Record(**json.loads(line)))
+            new_cursors[entry.name] = cursors.get(entry.name, 0) + len(complete)
+            if retire and len(complete) == len(data):
+                consumed.append(entry.path)
+                del new_cursors[entry.name]
+        records.sort(key=lambda r: (r.ts, r.writer, r.seq))
+        return records, new_cursors, consumed
+
+    def merge(self) -> Dict[str, int]:
+        """Fold pending records into the canonical markdown files.
+
+        Logs in segmented mode rotate as usual. Journals read to the end are
+        deleted once the markdown is written and their read positions are
+        dropped, so a crash mid-merge can duplicate records on the next
+        merge but never loses them. Appends wait while a merge runs.
+
+        Returns the number of merged records per log name.
+        """
+        merged: Dict[str, int] = {}
+        with file_lock(self.journal_dir / LOCK_FILE), ExitStack() as stack:
+            cursors = self._load_cursors()
+            records, new_cursors, consumed = self._read_pending(cursors, stack)
+            for record in records:
+                head = self.project_root / LOGS[record.log]
+                head.parent.mkdir(parents=True, exist_ok=True)
+                when = datetime.fromtimestamp(record.ts / 1e9)
+                body = f"{record.body.strip()}\n\n_Recorded by {record.writer}_"
+                SegmentedLog(head, self.project_root).append(
+                    record.title, body, when=when
+                )
+                merged[record.log] = merged.get(record.log, 0) + 1
+            if new_cursors != cursors:
+                write_atomic(
+                    self.journal_dir / CURSORS_FILE, json.dumps(new_cursors, indent=2)
+                )
+            for path in consumed:
+                os.unlink(path)
+        return merged
@@ -0,0 +1,12 @@
+"""The canonical logs a journal record may target, by short name.
+
+Kept free of imports so the CLI can list them as argument choices without
+loading ``lib.journal`` at startup; ``lib.journal`` re-exports ``LOGS``.
+"""
+
+LOGS = {
+    "troubleshooting_log": "memory-bank/project/troubleshooting_log.md",
+    "lessons_learned": "memory-bank/project/lessons_learned.md",
+    "error_documentation": "memory-bank/project/error_documentation.md",
+    "project_status": "memory-bank/status/project_status.md",
+}
@@ -0,0 +1,157 @@
+"""Markdown link checking for template rules and the memory-bank.
+
+Links found in each file are memoized per (path, mtime, size), so repeated
+lint runs in one process (the daemon, watch loops) only re-parse files that
+changed and otherwise just stat link targets (whose resolved paths are
+memoized too).
+
+Files of MMAP_THRESHOLD bytes or more (multi-megabyte reference docs) are
+scanned through mmap with a bytes regex: only link spans and the start of
+their lines are decoded, so memory stays flat however large the file.
+"""
+
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .shard import Shard, owns
+
+LINK_RE = re.compile(r"(?<!\!)\[[^\]]+\]\(([^)\s]+)\)")
+# Without the lookbehind, so the regex engine can jump between "[" bytes
+# (about 30x faster on large files); image links are skipped by hand
+LINK_RE_BYTES = re.compile(rb"\[[^\]]+\]\(([^)\s]+)\)")
+BANG = ord("!")
+MMAP_THRESHOLD = 1 << 20
+COUNT_CHUNK = 1 << 20
+
+# path -> ((mtime_ns, size), [(line, column, link), ...])
+_links_cache: Dict[str, Tuple[tuple, List[Tuple[int, int, str]]]] = {}
+# (base, link) -> resolved target; only existence is re-checked per run
+_target_cache: Dict[Tuple[Path, str], Path] = {}
+
+
+class BrokenLink(NamedTuple):
+    path: Path
+    line: int  # 1-based
+    column: int
+    link: str
+    target: Path
+
+
+def lint_files(
+    src_root: Path, root_dir: Path, shard: Optional[Shard] = None
+) -> List[Path]:
+    """Template rules and memory-bank files to lint (with a shard, only its own).
+
+    Shard keys are rules/... relative to src_root and memory-bank/...
+    relative to root_dir, so every node splits the files the same way.
+    """
+    files = [(src_root, path) for path in src_root.glob("rules/**/*.md")]
+    files += [(root_dir, path) for path in root_dir.glob("memory-bank/**/*.md")]
+    return [
+        path for base, path in files if owns(shard, path.relative_to(base).as_posix())
+    ]
+
+
+def file_links(path: Path) -> List[Tuple[int, int, str]]:
+    """(line, column, link) for every markdown link in a file, memoized."""
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _links_cache.get(str(path))
+    if cached and cached[0] == key:
+        return cached[1]
+
+    if st.st_size >= MMAP_THRESHOLD:
+        links = _mapped_file_links(path)
+    else:
+        with open(path, "r") as f:
+            links = text_links(f.read())
+    _links_cache[str(path)] = (key, links)
+    return links
+
+
+def text_links(content: str) -> List[Tuple[int, int, str]]:
+    """(line, column, link) for every markdown link in a text."""
+    links = []
+    line_number, counted = 1, 0
+    for match in LINK_RE.finditer(content):
+        # Line number (1-based), counting only newlines since the last match
+        line_number += content.count("\n", counted, match.start())
+        counted = match.start()
+        col_number = match.start() - content.rfind("\n", 0, match.start())
+        links.append((line_number, col_number, match.group(1)))
+    return links
+
+
+def _count_newlines(mapped, start, end):
+    """Newlines in mapped[start:end], copying at most COUNT_CHUNK bytes at a time."""
+    count = 0
+    for chunk in range(start, end, COUNT_CHUNK):
+        count += mapped[chunk : min(end, chunk + COUNT_CHUNK)].count(b"\n")
+    return count
+
+
+def _char_len(data: bytes) -> int:
+    return len(data) if data.isascii() else len(data.decode())
+
+
+def _mapped_file_links(path: Path) -> List[Tuple[int, int, str]]:
+    """file_links for a large file, matched on its bytes through mmap.
+
+    Lines and columns are counted as for the decoded text (columns in
+    characters), advancing from the previous match rather than rescanning.
+    """
+    links = []
+    with (
+        open(path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        line_number, col_number, counted, pos = 1, 1, 0, 0
+        while True:
+            match = LINK_RE_BYTES.search(mapped, pos)
+            if match is None:
+                break
+            start = match.start()
+            if start and mapped[start - 1] == BANG:  # An image
+                pos = start + 1
+                continue
+            raw = match.group(1)
+            link = raw.decode()
+            if not raw.isascii() and any(c.isspace() for c in link):
+                # The text regex's \s also excludes non-ASCII spaces
+                pos = start + 1
+                continue
+            last_newline = mapped.rfind(b"\n", counted, start)
+            if last_newline < 0:
+                col_number += _char_len(mapped[counted:start])
+            else:
+                line_number += _count_newlines(mapped, counted, last_newline + 1)
+                col_number = _char_len(mapped[last_newline + 1 : start]) + 1
+            counted = start
+            links.append((line_number, col_number, link))
+            pos = match.end()
+    return links
+
+
+def find_broken_links(
+    src_root: Path, root_dir: Path, shard: Optional[Shard] = None
+) -> List[BrokenLink]:
+    """Links in rules/ (relative to src_root) and memory-bank/ (relative to root_dir) whose target is missing."""
+    broken = []
+    for md_file in lint_files(src_root, root_dir, shard):
+        # Determine the base path depending on which directory the file is in
+        if "rules" in str(md_file):
+            base_path = src_root
+        else:
+            base_path = root_dir
+        for line_number, col_number, link in file_links(md_file):
+            target = _target_cache.get((base_path, link))
+            if target is None:
+                target = _target_cache[(base_path, link)] = (base_path / link).resolve()
+            if not target.exists():
+                broken.append(
+                    BrokenLink(md_file, line_number, col_number, link, target)
+                )
+    return broken
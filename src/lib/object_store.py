@@ -0,0 +1,143 @@
+"""Shared content-addressed store for generated rule files.
+
+Opt-in: with a store, rule outputs are written once into
+``<cache>/objects/<aa>/<sha256>`` and hardlinked into each project's rules
+tree, so many checkouts on one host share the same inodes (and page cache).
+Objects are read-only; editing a linked file in place would change every
+project sharing it. Editors that save by writing a new file and renaming it
+simply break the link.
+
+Where hardlinks are not possible (another filesystem, link limits, no
+support) the file is copied instead, so the result is always correct.
+"""
+
+import errno
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from .common import cache_dir, file_digest, tmp_sibling
+
+OBJECTS_DIR = "objects"
+
+
+class StoreStats(NamedTuple):
+    objects: int
+    bytes: int
+    links: int  # Project files sharing an object, beyond the object itself
+    saved_bytes: int  # Bytes not stored thanks to those links
+
+
+class ObjectStore:
+    """Content-addressed files, hardlinked into projects where possible."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else cache_dir() / OBJECTS_DIR
+
+    def object_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(self, path) -> str:
+        """Store a file's content (once) and return its digest."""
+        digest = file_digest(path)
+        obj = self.object_path(digest)
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            tmp = tmp_sibling(obj)
+            try:
+                shutil.copyfile(path, tmp)
+                os.chmod(tmp, 0o444)
+                os.replace(tmp, obj)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+        return digest
+
+    def put_bytes(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        obj = self.object_path(digest)
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            tmp = tmp_sibling(obj)
+            try:
+                tmp.write_bytes(data)
+                os.chmod(tmp, 0o444)
+                os.replace(tmp, obj)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+        return digest
+
+    def link(self, digest: str, dst) -> str:
+        """Atomically replace dst with the object; returns "link" or "copy"."""
+        obj = self.object_path(digest)
+        dst = Path(dst)
+        try:
+            if os.path.samefile(obj, dst):
+                return "link"
+        except FileNotFoundError:
+            pass
+        tmp = tmp_sibling(dst)
+        try:
+            try:
+                os.link(obj, tmp)
+                mode = "link"
+            except OSError as e:
+                if e.errno not in (
+                    errno.EXDEV,
+                    errno.EMLINK,
+                    errno.EPERM,
+                    errno.ENOTSUP,
+                ):
+                    raise
+                shutil.copyfile(obj, tmp)
+                mode = "copy"
+            os.replace(tmp, dst)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return mode
+
+    def install(self, src, dst) -> str:
+        """Store src and link it to dst; returns "link" or "copy"."""
+        return self.link(self.put(src), dst)
+
+    def objects(self):
+        if not self.root.exists():
+            return
+        for prefix in sorted(self.root.iterdir()):
+            if prefix.is_dir():
+                for obj in sorted(prefix.iterdir()):
+                    if not obj.name.startswith("."):
+                        yield obj
+
+    def verify(self, repair: bool = False) -> Dict[str, List[Path]]:
+        """Re-hash every object and report those whose content no longer matches.
+
+        With repair, corrupt objects are removed so the next sync stores
+        them afresh (files already linked to them must be regenerated).
+        Returns {"ok": [...], "corrupt": [...]}.
+        """
+        results: Dict[str, List[Path]] = {"ok": [], "corrupt": []}
+        for obj in self.objects():
+            with open(obj, "rb") as f:
+                digest = hashlib.file_digest(f, "sha256").hexdigest()
+            if digest == obj.name:
+                results["ok"].append(obj)
+            else:
+                results["corrupt"].append(obj)
+                if repair:
+                    obj.unlink()
+        return results
+
+    def stats(self) -> StoreStats:
+        objects = size = links = saved = 0
+        for obj in self.objects():
+            st = obj.stat()
+            objects += 1
+            size += st.st_size
+            links += st.st_nlink - 1
+            saved += (st.st_nlink - 2) * st.st_size if st.st_nlink > 2 else 0
+        return StoreStats(objects, size, links, saved)
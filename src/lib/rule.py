@@ -0,0 +1,111 @@
+"""Compact, immutable records of template rules.
+
+A ``Rule`` keeps only the frontmatter fields generators select and sort on,
+in a slots dataclass (no per-instance ``__dict__``). The few distinct
+activation, trigger and ``single_file`` values are interned, so every
+record shares the same string objects, and the name is derived from the
+path on demand. Frontmatter problems are found while loading and kept as
+``errors`` (usually the shared empty tuple), so ``validate()`` needs no
+second read. Bodies are not kept: ``Rule.body()`` re-reads the file and
+splits off its frontmatter again, so a daemon or fleet sync can hold a very
+large corpus of rules at a few hundred bytes each.
+"""
+
+import os
+import re
+import sys
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+from .common import (
+    FRONTMATTER_RE,
+    frontmatter_errors,
+    parse_frontmatter,
+    scan_tree,
+)
+
+PRIORITY_RE = re.compile(r"^(\d{1,2})-")
+DEFAULT_PRIORITY = 999
+
+# Activation -> editor trigger, as in common.derive_editor_fields
+TRIGGERS = {
+    "always": "always",
+    "glob": "glob",
+    "agent-requested": "model",
+    "manual": "manual",
+}
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def extract_priority(path: str) -> int:
+    """Priority from a ##-RuleName.md file name, or 999 without a prefix."""
+    match = PRIORITY_RE.match(os.path.basename(path))
+    return int(match.group(1)) if match else DEFAULT_PRIORITY
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    path: str
+    description: Optional[str]
+    activation: str  # Interned; "" when missing
+    globs: Optional[str]
+    # None when missing, True/False or an interned string
+    single_file: Union[None, bool, str]
+    priority: int
+    errors: Tuple[str, ...]  # Frontmatter problems, as validate_frontmatter finds
+
+    @classmethod
+    def load(cls, path) -> "Rule":
+        """Parse and check a rule file's frontmatter; the body is left on disk."""
+        path = os.fspath(path)
+        with open(path, "r") as f:
+            content = f.read()
+        match = FRONTMATTER_RE.match(content)
+        frontmatter = parse_frontmatter(match.group(1)) if match else {}
+        return cls(
+            path=path,
+            description=frontmatter.get("description", ""),
+            activation=_intern(frontmatter.get("activation") or ""),
+            globs=frontmatter.get("globs", ""),
+            single_file=_intern(frontmatter.get("single_file")),
+            priority=extract_priority(path),
+            errors=tuple(frontmatter_errors(frontmatter)),
+        )
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path).replace(".md", "")
+
+    @property
+    def trigger(self) -> str:
+        return TRIGGERS.get(self.activation, "")
+
+    def frontmatter(self) -> dict:
+        """The full frontmatter dictionary, re-read from disk."""
+        with open(self.path, "r") as f:
+            match = FRONTMATTER_RE.match(f.read())
+        return parse_frontmatter(match.group(1)) if match else {}
+
+    def validate(self):
+        """Raise ValueError for the first frontmatter problem, as validate_frontmatter."""
+        if self.errors:
+            raise ValueError(self.errors[0])
+
+    def body(self) -> str:
+        """The markdown body, read from disk (the file may have changed since load)."""
+        with open(self.path, "r") as f:
+            content = f.read()
+        match = FRONTMATTER_RE.match(content)
+        return match.group(2) if match else content
+
+
+def load_rules(rules_dir) -> List[Rule]:
+    """Records for every template rule (README.md excluded), sorted by path."""
+    return [
+        Rule.load(path)
+        for rel, path in sorted(scan_tree(rules_dir, ".md").items())
+        if path.name != "README.md"
+    ]
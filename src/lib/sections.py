@@ -0,0 +1,57 @@
+"""Split memory-bank markdown files into heading-delimited sections."""
+
+import re
+from typing import List, NamedTuple, Tuple
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+FENCE_RE = re.compile(r"^\s*(```|~~~)")
+
+
+class Section(NamedTuple):
+    """A heading and everything up to the next heading of the same or higher level."""
+
+    heading: str
+    level: int
+    line: int  # 1-based line number of the heading
+    text: str  # Heading line plus body, newline-terminated
+
+
+def split_sections(content: str, max_level: int = 6) -> Tuple[str, List[Section]]:
+    """Split markdown into a preamble and a list of sections.
+
+    Args:
+        content: Markdown text
+        max_level: Deepest heading level that starts a new section; deeper
+            headings stay inside the enclosing section's text
+
+    Returns:
+        (preamble, sections) where preamble is the text before the first
+        section heading. Joining preamble and every section's text
+        reproduces the input exactly.
+    """
+    lines = content.splitlines(keepends=True)
+    preamble: List[str] = []
+    sections: List[Section] = []
+    current = None  # (heading, level, line, [lines])
+    in_fence = False
+
+    for number, line in enumerate(lines, start=1):
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_RE.match(line)
+        if match and len(match.group(1)) <= max_level:
+            if current:
+                sections.append(
+                    Section(current[0], current[1], current[2], "".join(current[3]))
+                )
+            current = (match.group(2), len(match.group(1)), number, [line])
+        elif current:
+            current[3].append(line)
+        else:
+            preamble.append(line)
+
+    if current:
+        sections.append(
+            Section(current[0], current[1], current[2], "".join(current[3]))
+        )
+    return "".join(preamble), sections
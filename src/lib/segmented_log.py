@@ -0,0 +1,265 @@
+"""Segmented, rotating append logs for memory-bank markdown files.
+
+A segmented log keeps its canonical file (the *head*) small: it holds the
+preamble, the most recent ``keep`` entries and an index of archived segments.
+Older entries move into segment files in a sibling directory named after the
+head (``troubleshooting_log.md`` -> ``troubleshooting_log/0001.md``), which
+are only ever appended to. Rotation is either by size (numbered segments of
+roughly ``segment_bytes``) or by month (``2026-10.md``).
+
+Entries are level-2 heading sections; ``append`` titles them
+``## YYYY-MM-DD HH:MM <title>`` so monthly rotation and ``--since`` queries
+can read their dates.
+"""
+
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional
+
+from .common import write_atomic
+from .sections import Section, split_sections
+
+DEFAULT_KEEP = 20
+DEFAULT_SEGMENT_BYTES = 64 * 1024
+ROTATIONS = ("size", "monthly")
+
+INDEX_RE = re.compile(
+    r"^<!-- segment-index (?P<options>[^>]*?) -->\n(?P<body>.*?)^<!-- /segment-index -->\n?",
+    re.MULTILINE | re.DOTALL,
+)
+ROW_RE = re.compile(
+    r"^\| \[(?P<name>[^\]]+)\]\([^)]*\) \| (?P<entries>\d+) \| (?P<first>[^|]*?) \| (?P<last>[^|]*?) \|$",
+    re.MULTILINE,
+)
+DATE_RE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+
+
+class LogPolicy(NamedTuple):
+    rotate: str = "size"
+    keep: int = DEFAULT_KEEP
+    segment_bytes: int = DEFAULT_SEGMENT_BYTES
+
+
+class SegmentInfo(NamedTuple):
+    name: str  # Segment file stem, e.g. "0001" or "2026-10"
+    entries: int
+    first: str  # Date of the oldest entry, or "" when undated
+    last: str
+
+
+class Match(NamedTuple):
+    path: Path
+    line: int
+    heading: str
+
+
+def entry_date(heading: str) -> str:
+    """The YYYY-MM-DD date in an entry heading, or "" if it has none."""
+    match = DATE_RE.search(heading)
+    return match.group(1) if match else ""
+
+
+class SegmentedLog:
+    """A memory-bank markdown log split into a small head and archived segments."""
+
+    def __init__(self, head_path: Path, project_root: Path):
+        self.head_path = Path(head_path)
+        self.project_root = Path(project_root)
+        self.segment_dir = self.head_path.with_suffix("")
+
+    def _parse_index(self, content: str):
+        """Return (policy, segments, match) for the head's segment index block."""
+        match = INDEX_RE.search(content)
+        if not match:
+            return None, [], None
+        options = dict(
+            item.split("=", 1) for item in match.group("options").split() if "=" in item
+        )
+        policy = LogPolicy(
+            rotate=options.get("rotate", "size"),
+            keep=int(options.get("keep", DEFAULT_KEEP)),
+            segment_bytes=int(options.get("segment-bytes", DEFAULT_SEGMENT_BYTES)),
+        )
+        segments = [
+            SegmentInfo(m["name"], int(m["entries"]), m["first"], m["last"])
+            for m in ROW_RE.finditer(match.group("body"))
+        ]
+        return policy, segments, match
+
+    def _read(self):
+        """Parse the head into (prefix, entries, policy, segments)."""
+        content = self.head_path.read_text() if self.head_path.exists() else ""
+        policy, segments, match = self._parse_index(content)
+        if match:
+            content = content[: match.start()] + content[match.end() :]
+
+        preamble, sections = split_sections(content, max_level=2)
+        prefix = preamble
+        while sections and sections[0].level < 2:
+            prefix += sections.pop(0).text
+        return prefix, sections, policy, segments
+
+    def _write_head(self, prefix, entries: List[Section], policy, segments):
+        content = prefix + "".join(e.text.rstrip("\n") + "\n\n" for e in entries)
+        if policy:
+            index = self._render_index(policy, segments)
+            content = content.rstrip("\n")
+            content = content + "\n\n" + index if content else index
+        write_atomic(self.head_path, content)
+
+    def _render_index(self, policy: LogPolicy, segments: List[SegmentInfo]) -> str:
+        lines = [
+            f"<!-- segment-index rotate={policy.rotate} keep={policy.keep} "
+            f"segment-bytes={policy.segment_bytes} -->",
+            "## Archived Segments",
+            "",
+        ]
+        if segments:
+            lines.append("| Segment | Entries | First | Last |")
+            lines.append("|---|---|---|---|")
+            for seg in segments:
+                link = self.segment_path(seg.name).relative_to(self.project_root)
+                lines.append(
+                    f"| [{seg.name}]({link.as_posix()}) | {seg.entries} | {seg.first} | {seg.last} |"
+                )
+        else:
+            lines.append("_No archived segments yet._")
+        lines.append("<!-- /segment-index -->")
+        return "\n".join(lines) + "\n"
+
+    def segment_path(self, name: str) -> Path:
+        return self.segment_dir / f"{name}.md"
+
+    @property
+    def policy(self) -> Optional[LogPolicy]:
+        """The rotation policy, or None when the file is a plain log."""
+        return self._read()[2]
+
+    def init(self, policy: LogPolicy):
+        """Turn the file into a segmented log (or change its policy) and rotate."""
+        if policy.rotate not in ROTATIONS:
+            raise ValueError(
+                f"Invalid rotation: {policy.rotate}. Must be one of: size, monthly"
+            )
+        prefix, entries, _, segments = self._read()
+        self.head_path.parent.mkdir(parents=True, exist_ok=True)
+        self._rotate(prefix, entries, policy, segments)
+
+    def append(self, title: str, body: str, when: Optional[datetime] = None) -> Section:
+        """Append a dated entry, archiving the oldest entries if the head is full."""
+        when = when or datetime.now()
+        heading = f"{when:%Y-%m-%d %H:%M} {title}".strip()
+        text = f"## {heading}\n\n{body.strip()}\n\n"
+        prefix, entries, policy, segments = self._read()
+        if not policy:
+            # Plain log: a cheap append, no index to maintain
+            self.head_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.head_path, "a+") as f:
+                size = f.seek(0, 2)
+                f.seek(max(0, size - 2))
+                tail = f.read()
+                separator = (
+                    "\n" * (2 - (len(tail) - len(tail.rstrip("\n")))) if size else ""
+                )
+                f.write(separator + text)
+            return Section(heading, 2, 0, text)
+        entry = Section(heading, 2, 0, text)
+        self._rotate(prefix, entries + [entry], policy, segments)
+        return entry
+
+    def rotate(self):
+        """Archive entries beyond the policy's keep count."""
+        prefix, entries, policy, segments = self._read()
+        if not policy:
+            raise ValueError(
+                f"{self.head_path} is not a segmented log (run 'log init' first)"
+            )
+        self._rotate(prefix, entries, policy, segments)
+
+    def _rotate(self, prefix, entries, policy: LogPolicy, segments: List[SegmentInfo]):
+        overflow = max(0, len(entries) - policy.keep)
+        archived, entries = entries[:overflow], entries[overflow:]
+        segments = list(segments)
+
+        for entry in archived:
+            date = entry_date(entry.heading)
+            if policy.rotate == "monthly":
+                name = date[:7] if date else "undated"
+            elif (
+                segments
+                and self.segment_path(segments[-1].name).exists()
+                and (
+                    self.segment_path(segments[-1].name).stat().st_size
+                    < policy.segment_bytes
+                )
+            ):
+                name = segments[-1].name
+            else:
+                name = f"{len(segments) + 1:04d}"
+            self._append_to_segment(name, entry)
+
+            index = next((i for i, s in enumerate(segments) if s.name == name), None)
+            if index is None:
+                segments.append(SegmentInfo(name, 1, date, date))
+            else:
+                seg = segments[index]
+                segments[index] = SegmentInfo(
+                    name, seg.entries + 1, seg.first or date, date or seg.last
+                )
+
+        if policy.rotate == "monthly":
+            segments.sort(key=lambda s: s.name)
+        self._write_head(prefix, entries, policy, segments)
+
+    def _append_to_segment(self, name: str, entry: Section):
+        path = self.segment_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as f:
+            if f.tell() == 0:
+                title = self.head_path.stem.replace("_", " ").title()
+                f.write(f"# {title}: {name}\n\n")
+            f.write(entry.text.rstrip("\n") + "\n\n")
+
+    def query(self, pattern: str, since: Optional[str] = None) -> Iterator[Match]:
+        """Yield entries matching a regex, newest first, across head and segments.
+
+        Args:
+            pattern: Case-insensitive regular expression matched against entry text
+            since: Optional YYYY-MM-DD; older entries (and whole segments) are skipped
+
+        A log whose head file does not exist yet has no entries.
+        """
+        regex = re.compile(pattern, re.IGNORECASE)
+        try:
+            content = self.head_path.read_text()
+        except FileNotFoundError:
+            return
+        _, segments, match = self._parse_index(content)
+        if match:
+            # Blank out the index block but keep its lines so line numbers stay true
+            block = match.group(0)
+            content = (
+                content[: match.start()]
+                + "\n" * block.count("\n")
+                + content[match.end() :]
+            )
+
+        def matches(path, text):
+            _, sections = split_sections(text, max_level=2)
+            for section in reversed(sections):
+                if section.level != 2:
+                    continue
+                date = entry_date(section.heading)
+                if since and date and date < since:
+                    continue
+                if regex.search(section.text):
+                    yield Match(path, section.line, section.heading)
+
+        yield from matches(self.head_path, content)
+        for seg in reversed(segments):
+            if since and seg.last and seg.last < since:
+                continue
+            path = self.segment_path(seg.name)
+            if path.exists():
+                yield from matches(path, path.read_text())
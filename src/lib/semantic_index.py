@@ -0,0 +1,245 @@
+"""Offline semantic retrieval over memory-bank chunks.
+
+Chunks are embedded with a signed hashing-trick vectorizer (word unigrams and
+bigrams, sublinear term frequency, L2-normalized) so no model download, GPU or
+external service is needed. Vectors live in a memory-mapped ``.npy`` matrix
+next to per-row content hashes and byte offsets into a JSONL metadata file, so
+a query only touches the matrix and the metadata rows it returns.
+
+Requires numpy (``pip install llm-memory-bank[search]``).
+"""
+
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence
+
+import numpy as np
+
+from .sections import split_sections
+
+DEFAULT_DIM = 256
+CHUNK_MAX_CHARS = 2000
+# Scratch memory per scored block (its vectors plus their scores)
+QUERY_BLOCK_BYTES = 32 << 20
+
+VECTORS_FILE = "vectors.npy"
+HASHES_FILE = "hashes.npy"
+OFFSETS_FILE = "offsets.npy"
+CHUNKS_FILE = "chunks.jsonl"
+
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
+
+class Chunk(NamedTuple):
+    path: str  # Relative to the memory-bank directory's parent
+    line: int
+    heading: str
+    text: str
+
+
+class Hit(NamedTuple):
+    score: float
+    path: str
+    line: int
+    heading: str
+    preview: str
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens used by the vectorizer."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=1 << 16)
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little"
+    )
+
+
+def embed(texts: Sequence[str], dim: int = DEFAULT_DIM) -> np.ndarray:
+    """Embed texts into an (n, dim) float32 matrix of unit-length rows."""
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = tokenize(text)
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        if not features:
+            continue
+        hashes = np.fromiter(
+            (_feature_hash(f) for f in features), dtype=np.uint64, count=len(features)
+        )
+        columns = (hashes % np.uint64(dim)).astype(np.intp)
+        signs = np.where(hashes >> np.uint64(63), -1.0, 1.0).astype(np.float32)
+        vector = np.zeros(dim, dtype=np.float32)
+        np.add.at(vector, columns, signs)
+        vector = np.sign(vector) * np.log1p(np.abs(vector))
+        norm = np.linalg.norm(vector)
+        if norm:
+            matrix[row] = vector / norm
+    return matrix
+
+
+def chunk_hash(chunk: Chunk) -> bytes:
+    """Content hash used to reuse embeddings across rebuilds."""
+    return hashlib.blake2b(chunk.text.encode(), digest_size=16).digest()
+
+
+def chunk_markdown(content: str, path: str) -> List[Chunk]:
+    """Split a markdown file into heading sections, windowing long sections."""
+    preamble, sections = split_sections(content, max_level=3)
+    pieces = [(1, "", preamble)] + [(s.line, s.heading, s.text) for s in sections]
+
+    chunks = []
+    for line, heading, text in pieces:
+        if not text.strip():
+            continue
+        if len(text) <= CHUNK_MAX_CHARS:
+            chunks.append(Chunk(path, line, heading, text))
+            continue
+        # Window long sections on paragraph boundaries
+        window, window_line = "", line
+        for paragraph in re.split(r"(?<=\n)(?=\n)", text):
+            if window and len(window) + len(paragraph) > CHUNK_MAX_CHARS:
+                chunks.append(Chunk(path, window_line, heading, window))
+                window_line += window.count("\n")
+                window = ""
+            window += paragraph
+        if window.strip():
+            chunks.append(Chunk(path, window_line, heading, window))
+    return chunks
+
+
+def collect_chunks(memory_bank_dir: Path) -> List[Chunk]:
+    """Chunk every markdown file under a memory-bank directory."""
+    memory_bank_dir = Path(memory_bank_dir)
+    base = memory_bank_dir.parent
+    chunks = []
+    for md_file in sorted(memory_bank_dir.glob("**/*.md")):
+        with open(md_file, "r") as f:
+            content = f.read()
+        chunks.extend(chunk_markdown(content, str(md_file.relative_to(base))))
+    return chunks
+
+
+class SemanticIndex:
+    """Hashing-trick vector index stored as memory-mapped numpy arrays."""
+
+    def __init__(self, index_dir: Path):
+        self.index_dir = Path(index_dir)
+
+    def exists(self) -> bool:
+        return (self.index_dir / VECTORS_FILE).exists()
+
+    def build(self, memory_bank_dir: Path, dim: int = DEFAULT_DIM) -> Dict[str, int]:
+        """(Re)build the index, embedding only chunks whose hash is new.
+
+        Returns counts of reused, embedded and dropped chunks.
+        """
+        chunks = collect_chunks(memory_bank_dir)
+        hashes = [chunk_hash(c) for c in chunks]
+
+        previous: Dict[bytes, int] = {}
+        old_vectors = None
+        if self.exists():
+            old_vectors = np.load(self.index_dir / VECTORS_FILE, mmap_mode="r")
+            if old_vectors.shape[1] == dim:
+                raw = np.load(self.index_dir / HASHES_FILE).tobytes()
+                previous = {
+                    raw[row * 16 : row * 16 + 16]: row for row in range(len(raw) // 16)
+                }
+            else:
+                old_vectors = None
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        tmp_vectors = self.index_dir / (VECTORS_FILE + ".tmp")
+        vectors = np.lib.format.open_memmap(
+            tmp_vectors, mode="w+", dtype=np.float32, shape=(len(chunks), dim)
+        )
+
+        reused_rows = [(i, previous[h]) for i, h in enumerate(hashes) if h in previous]
+        new_rows = [i for i, h in enumerate(hashes) if h not in previous]
+        if reused_rows:
+            dst, src = map(np.array, zip(*reused_rows))
+            vectors[dst] = old_vectors[src]
+        for start in range(0, len(new_rows), 4096):
+            batch = new_rows[start : start + 4096]
+            vectors[batch] = embed([chunks[i].text for i in batch], dim)
+        vectors.flush()
+        del vectors, old_vectors
+
+        offsets = np.zeros(len(chunks), dtype=np.uint64)
+        tmp_chunks = self.index_dir / (CHUNKS_FILE + ".tmp")
+        with open(tmp_chunks, "wb") as f:
+            for row, chunk in enumerate(chunks):
+                offsets[row] = f.tell()
+                record = {
+                    "path": chunk.path,
+                    "line": chunk.line,
+                    "heading": chunk.heading,
+                    "preview": " ".join(chunk.text.split())[:200],
+                }
+                f.write(json.dumps(record).encode() + b"\n")
+
+        hash_matrix = np.frombuffer(b"".join(hashes), dtype=np.uint8).reshape(-1, 16)
+        np.save(self.index_dir / (HASHES_FILE + ".tmp.npy"), hash_matrix)
+        np.save(self.index_dir / (OFFSETS_FILE + ".tmp.npy"), offsets)
+        os.replace(
+            self.index_dir / (HASHES_FILE + ".tmp.npy"), self.index_dir / HASHES_FILE
+        )
+        os.replace(
+            self.index_dir / (OFFSETS_FILE + ".tmp.npy"), self.index_dir / OFFSETS_FILE
+        )
+        os.replace(tmp_chunks, self.index_dir / CHUNKS_FILE)
+        os.replace(tmp_vectors, self.index_dir / VECTORS_FILE)
+
+        return {
+            "reused": len(reused_rows),
+            "embedded": len(new_rows),
+            "dropped": len(previous.keys() - set(hashes)),
+        }
+
+    def search(self, queries: Sequence[str], k: int = 5) -> List[List[Hit]]:
+        """Return the top-k chunks by cosine similarity for each query."""
+        vectors = np.load(self.index_dir / VECTORS_FILE, mmap_mode="r")
+        n_rows, dim = vectors.shape
+        if n_rows == 0:
+            return [[] for _ in queries]
+        query_matrix = embed(queries, dim)
+        k = min(k, n_rows)
+        block_rows = max(
+            1, QUERY_BLOCK_BYTES // ((dim + len(queries)) * vectors.itemsize)
+        )
+
+        # Running top-k per query, merged block by block
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, n_rows, block_rows):
+            block = np.asarray(vectors[start : start + block_rows])
+            scores = query_matrix @ block.T  # (queries, rows)
+            take = min(k, scores.shape[1])
+            top = np.argpartition(scores, -take, axis=1)[:, -take:]
+            best_scores = np.concatenate(
+                [best_scores, np.take_along_axis(scores, top, axis=1)], axis=1
+            )
+            best_rows = np.concatenate([best_rows, top + start], axis=1)
+            keep = np.argsort(-best_scores, axis=1, kind="stable")[:, :k]
+            best_scores = np.take_along_axis(best_scores, keep, axis=1)
+            best_rows = np.take_along_axis(best_rows, keep, axis=1)
+
+        offsets = np.load(self.index_dir / OFFSETS_FILE, mmap_mode="r")
+        results = []
+        with open(self.index_dir / CHUNKS_FILE, "rb") as f:
+            for scores, rows in zip(best_scores, best_rows):
+                hits = []
+                for score, row in zip(scores.tolist(), rows.tolist()):
+                    if score <= 0:
+                        continue
+                    f.seek(int(offsets[row]))
+                    record = json.loads(f.readline())
+                    hits.append(Hit(score=score, **record))
+                results.append(hits)
+        return results
@@ -0,0 +1,149 @@
+"""Deterministic partitioning of work across CI nodes (``--shard i/N``).
+
+A work item (a rule file, a memory-bank file, a single-file output) is
+named by a stable, platform-independent key such as ``rules/core/foo.md``
+and belongs to shard ``hash(key) % N``, so every node computes the same
+split from the same tree without talking to the others. Keys are hashed
+with BLAKE2b rather than ``hash()``, which is salted per process.
+
+Each node writes a manifest, a JSON file holding its partial results
+(lint findings, or the change set of a generate). ``merge_manifests``
+checks that the manifests of one run cover every shard exactly once and
+combines them (the ``merge-shards`` command).
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from .common import write_atomic
+
+MANIFEST_VERSION = 1
+# The results each command's manifests carry
+RESULT_KEYS = {"lint": ("findings",), "generate": ("changes", "diffs")}
+
+
+class Shard(NamedTuple):
+    index: int  # 0-based
+    count: int
+
+    @classmethod
+    def parse(cls, text: str) -> "Shard":
+        """Shard from "i/N", with i counted from 1 (as in CI matrix indices)."""
+        number, sep, count = text.partition("/")
+        try:
+            number, count = int(number), int(count)
+        except ValueError:
+            number = count = 0
+        if not sep or count < 1 or not 1 <= number <= count:
+            raise ValueError(f"Invalid shard {text!r}: expected i/N with 1 <= i <= N")
+        return cls(number - 1, count)
+
+    def __str__(self):
+        return f"{self.index + 1}/{self.count}"
+
+    def owns(self, key: str) -> bool:
+        """Whether the work item named key belongs to this shard."""
+        return shard_of(key, self.count) == self.index
+
+
+def shard_of(key: str, count: int) -> int:
+    """The 0-based shard of a work item key, out of count."""
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count
+
+
+def owns(shard: Optional[Shard], key: str) -> bool:
+    """Whether the work item named key is processed: always, without a shard."""
+    return shard is None or shard.owns(key)
+
+
+def default_manifest(command: str, shard: Shard) -> Path:
+    """Manifest file name used when none is given, in the current directory."""
+    return Path(
+        f"llm-memory-bank-{command}-shard-{shard.index + 1}-of-{shard.count}.json"
+    )
+
+
+def write_manifest(path, command: str, shard: Shard, results: Dict):
+    """Write one shard's results (JSON-serializable) for merge_manifests."""
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "command": command,
+        "shard": str(shard),
+        **results,
+    }
+    write_atomic(path, json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+
+
+def read_manifest(path) -> Dict:
+    """A shard manifest, checked for the keys merge_manifests needs."""
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read shard manifest {path}: {e}")
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Not a version {MANIFEST_VERSION} shard manifest: {path}")
+    command = manifest.get("command")
+    if command not in RESULT_KEYS:
+        raise ValueError(f"Unknown command {command!r} in shard manifest: {path}")
+    missing = [key for key in ("shard", *RESULT_KEYS[command]) if key not in manifest]
+    if missing:
+        raise ValueError(
+            f"Shard manifest {path} is missing {', '.join(map(repr, missing))}"
+        )
+    return manifest
+
+
+def merge_manifests(paths: Iterable) -> Dict:
+    """Combine the manifests of every shard of one run into one result.
+
+    Lint findings are concatenated and sorted by position; change sets are
+    merged per outcome. Raises ValueError unless the manifests come from
+    the same command and shard count and cover each shard exactly once.
+    """
+    manifests = [read_manifest(path) for path in paths]
+    if not manifests:
+        raise ValueError("No shard manifests given")
+    commands = {manifest["command"] for manifest in manifests}
+    if len(commands) > 1:
+        raise ValueError(
+            f"Manifests of different commands: {', '.join(sorted(commands))}"
+        )
+    shards = [Shard.parse(manifest["shard"]) for manifest in manifests]
+    counts = {shard.count for shard in shards}
+    if len(counts) > 1:
+        raise ValueError(f"Manifests of different shard counts: {sorted(counts)}")
+    count = counts.pop()
+    seen = [shard.index for shard in shards]
+    duplicates = sorted({index + 1 for index in seen if seen.count(index) > 1})
+    if duplicates:
+        raise ValueError(
+            f"Shards given more than once: {', '.join(map(str, duplicates))}"
+        )
+    missing = sorted(set(range(1, count + 1)) - {index + 1 for index in seen})
+    if missing:
+        raise ValueError(f"Missing shards (of {count}): {', '.join(map(str, missing))}")
+
+    [command] = commands
+    merged = {"version": MANIFEST_VERSION, "command": command, "shards": count}
+    if command == "lint":
+        merged["findings"] = sorted(
+            (finding for manifest in manifests for finding in manifest["findings"]),
+            key=lambda finding: (finding["path"], finding["line"], finding["column"]),
+        )
+    else:
+        changes: Dict[str, List[str]] = {}
+        for manifest in manifests:
+            for outcome, paths in manifest["changes"].items():
+                changes.setdefault(outcome, []).extend(paths)
+        merged["changes"] = {
+            outcome: sorted(paths) for outcome, paths in sorted(changes.items())
+        }
+        merged["diffs"] = sorted(
+            (diff for manifest in manifests for diff in manifest["diffs"]),
+            key=lambda diff: diff["path"],
+        )
+    return merged
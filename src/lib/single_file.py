@@ -2,90 +2,135 @@
 
 import glob
 import os
+import posixpath
 import re
+import shutil
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 
-from .common import extract_frontmatter, validate_frontmatter
+from .common import (
+    open_atomic,
+    output_lock,
+    replace_dir,
+    tmp_sibling,
+)
+from .console import console
+from .glob_match import RuleMatcher
+from .rule import Rule, extract_priority
+
+# Directories never searched for files matching glob rules (besides hidden ones)
+SKIP_DIRS = {"node_modules", "__pycache__", "venv"}
+# A glob rule matching files in more directories is placed at their common ancestor
+MAX_RULE_DIRS = 8
+# Project folder holding the full text of agent-requested and manual rules
+ON_DEMAND_DIR = ".llm-rules"
+# First line of nested files written for glob rules; others are never overwritten
+GLOB_MARKER = "<!-- Generated by llm-memory-bank from glob-activated rules -->"
 
 
 def extract_priority_from_filename(filename: str) -> int:
     """Extract priority from filename in format ##-RuleName.md.
-    
+
     Args:
         filename: Base filename (not full path)
-        
+
     Returns:
         Priority as integer, or 999 if no priority prefix found
     """
-    # Extract just the filename without directory
-    basename = os.path.basename(filename)
-    
-    # Check if filename starts with ##- pattern
-    match = re.match(r'^(\d{1,2})-', basename)
-    if match:
-        return int(match.group(1))
-    
-    # Default priority for files without numeric prefix
-    return 999
-
-
-def transform_to_project_single_file(project_folder: str, dst_file: str) -> None:
-    """Transform rules into a single file, sorting by priority."""
-    # Get all .md files recursively from the rules directory in the current package
-    template_folder = Path(__file__).parent.parent
+    return extract_priority(filename)
+
+
+def transform_to_project_single_file(
+    project_folder: str, dst_file: str, template_folder: Optional[Path] = None
+) -> List[str]:
+    """Transform rules into a single file, sorting by priority.
+
+    Rules are read from template_folder/rules (default: this package).
+    Glob-activated rules are placed by a walk of project_folder: in a
+    CLAUDE.md next to the files they match, or inline for other outputs.
+    Agent-requested and manual rules are only indexed, one line each, with
+    their full text written under ON_DEMAND_DIR. Returns the paths written.
+    """
+    # Get all .md files recursively from the rules directory
+    template_folder = (
+        Path(template_folder) if template_folder else Path(__file__).parent.parent
+    )
     rules_dir = template_folder / "rules"
     rule_files = glob.glob(os.path.join(rules_dir, "**/*.md"), recursive=True)
 
-    # Group rules by target location
-    main_rules: List[Dict] = []  # For CLAUDE.md (single_file: true)
-    section_rules: Dict[str, List[Dict]] = {}  # For memory-bank sections
+    # Group rules by target location; bodies stay on disk until written
+    main_rules: List[Rule] = []  # For CLAUDE.md (single_file: true)
+    section_rules: Dict[str, List[Rule]] = {}  # For memory-bank sections
+    glob_rules: List[Rule] = []  # Placed by the files their globs match
+    on_demand: Dict[str, List[Rule]] = {}  # Indexed in the main file ("") or a section
 
     for file in rule_files:
-        with open(file, "r") as f:
-            content = f.read()
-            frontmatter, body = extract_frontmatter(content)
-            single_file_value = frontmatter.get("single_file", False)
+        rule = Rule.load(file)
+        single_file_value = rule.single_file
 
-            # Skip if single_file is false or "skip" (backward compatibility)
-            if single_file_value in [False, "false", "skip"]:
-                continue
+        # Skip if single_file is false or "skip" (backward compatibility)
+        if single_file_value in [False, "false", "skip"]:
+            continue
 
-            if frontmatter.get("activation") == "always":
-                # Validate frontmatter first
-                validate_frontmatter(frontmatter)
-                # Extract priority from filename instead of frontmatter
-                priority = extract_priority_from_filename(file)
-                # replace all markdown links to rules/ with just an emphasized subject
-                body = re.sub(
-                    r"\[([^\]]+)\]\(rules\/([^\)]+)\)",
-                    r"**\1**",
-                    body,
-                )
-                rule_data = {
-                    "name": os.path.basename(file).replace(".md", ""),
-                    "priority": priority,
-                    "description": frontmatter.get("description", ""),
-                    "body": body,
-                }
-
-                # Determine target location
-                if single_file_value == True or single_file_value == "true":
-                    main_rules.append(rule_data)
-                elif isinstance(
-                    single_file_value, str
-                ) and single_file_value.startswith("section:"):
-                    section_path = single_file_value[8:]  # Remove "section:" prefix
-                    if section_path not in section_rules:
-                        section_rules[section_path] = []
-                    section_rules[section_path].append(rule_data)
+        if rule.activation == "glob":
+            # Included unless opted out, since only the matched subtrees see them
+            rule.validate()
+            glob_rules.append(rule)
+        elif rule.activation in ("agent-requested", "manual"):
+            # Only indexed; the body goes to a file read when needed
+            rule.validate()
+            index_path = ""
+            if dst_file == "CLAUDE.md" and str(single_file_value).startswith(
+                "section:"
+            ):
+                index_path = single_file_value[8:]
+            on_demand.setdefault(index_path, []).append(rule)
+        elif rule.activation == "always" and single_file_value is not None:
+            rule.validate()
+
+            # Determine target location
+            if single_file_value == True or single_file_value == "true":
+                main_rules.append(rule)
+            elif isinstance(single_file_value, str) and single_file_value.startswith(
+                "section:"
+            ):
+                section_path = single_file_value[8:]  # Remove "section:" prefix
+                if section_path not in section_rules:
+                    section_rules[section_path] = []
+                section_rules[section_path].append(rule)
+
+    # Glob rules go to the topmost directories holding matching files; only
+    # Claude Code reads nested files, other outputs get them all inline
+    # CLAUDE.md files seen by the walk; it runs even without glob rules, so
+    # nested files of rules that are gone are found and removed
+    scoped_rules: Dict[str, List[Rule]] = {}
+    claude_files: List[str] = []
+    if dst_file == "CLAUDE.md":
+        scoped_rules = glob_rule_dirs(
+            project_folder, glob_rules, exclude=dst_file, excluded=claude_files
+        )
+    elif glob_rules:
+        scoped_rules = {"": glob_rules}
+    root_scoped = scoped_rules.pop("", [])
+    for rules in [root_scoped, *scoped_rules.values()]:
+        rules.sort(key=lambda rule: (rule.priority, rule.path))
 
     # Sort rules by priority
-    main_rules.sort(key=lambda x: x["priority"])
+    main_rules.sort(key=lambda rule: rule.priority)
+    for rules in on_demand.values():
+        rules.sort(key=lambda rule: (rule.priority, rule.path))
+    root_on_demand = on_demand.pop("", [])
+    section_paths = sorted(set(section_rules) | set(on_demand))
+
+    written = write_on_demand_rules(
+        project_folder,
+        rules_dir,
+        root_on_demand + [r for rules in on_demand.values() for r in rules],
+    )
 
     # Write main CLAUDE.md
     output_path = os.path.join(project_folder, dst_file)
-    with open(output_path, "w") as f:
+    with open_atomic(output_path) as f:
         # Add header if it's CLAUDE.md
         if dst_file == "CLAUDE.md":
             f.write("# CLAUDE.md\n\n")
@@ -94,9 +139,9 @@ def transform_to_project_single_file(project_folder: str, dst_file: str) -> None
             )
 
             # Add conditional loading instructions if there are section rules
-            if section_rules:
+            if section_paths or scoped_rules:
                 f.write("## Conditional Instructions\n\n")
-                for section_path in sorted(section_rules.keys()):
+                for section_path in sorted(set(section_paths) | set(scoped_rules)):
                     f.write(f"- When working with {section_path.replace('/', ' ')}, ")
                     f.write(
                         f"consult `/{section_path}/CLAUDE.md` for additional instructions.\n"
@@ -110,19 +155,35 @@ def transform_to_project_single_file(project_folder: str, dst_file: str) -> None
         for i, rule in enumerate(main_rules):
             if i > 0:
                 f.write("\n\n---\n\n")  # Extra newline before separator
+            f.write(render_rule_section(rule))
+
+        if root_scoped:
             f.write(
-                f"# Rule: {rule['name']}\n\n## {rule['description']}\n\n{prefix_headers(rule['body'].strip())}"
+                "\n\n## File-Scoped Rules\n\n"
+                if main_rules
+                else "## File-Scoped Rules\n\n"
             )
+            for i, rule in enumerate(root_scoped):
+                if i > 0:
+                    f.write("\n\n---\n\n")
+                f.write(render_rule_section(rule))
 
-    # Write section-specific files
-    for section_path, rules in section_rules.items():
-        rules.sort(key=lambda x: x["priority"])
+        if root_on_demand:
+            if main_rules or root_scoped:
+                f.write("\n\n")
+            f.write(render_rule_index(root_on_demand, rules_dir))
+    written.append(output_path)
+
+    # Write section-specific files, with any glob rules scoped to the same directory
+    for section_path in section_paths:
+        rules = section_rules.get(section_path, [])
+        rules.sort(key=lambda rule: rule.priority)
         section_output_path = os.path.join(project_folder, section_path, "CLAUDE.md")
 
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(section_output_path), exist_ok=True)
 
-        with open(section_output_path, "w") as f:
+        with open_atomic(section_output_path) as f:
             # Add header for section-specific CLAUDE.md
             f.write(
                 f"# {section_path.split('/')[-1].title()} Instructions for Claude Code\n\n"
@@ -131,12 +192,180 @@ def transform_to_project_single_file(project_folder: str, dst_file: str) -> None
                 f"These instructions apply when working with {section_path.replace('/', ' ')}.\n\n"
             )
 
+            rules = rules + scoped_rules.pop(section_path, [])
             for i, rule in enumerate(rules):
                 if i > 0:
                     f.write("\n\n---\n\n")
-                f.write(
-                    f"# Rule: {rule['name']}\n\n## {rule['description']}\n\n{prefix_headers(rule['body'].strip())}"
+                f.write(render_rule_section(rule))
+            if section_path in on_demand:
+                if rules:
+                    f.write("\n\n")
+                f.write(render_rule_index(on_demand[section_path], rules_dir))
+        written.append(section_output_path)
+
+    # Write nested files for the remaining glob-scoped directories
+    for directory, rules in sorted(scoped_rules.items()):
+        nested_path = os.path.join(project_folder, directory, "CLAUDE.md")
+        if os.path.exists(nested_path):
+            if not has_glob_marker(nested_path):
+                console.print(
+                    f"[cyan]Skipping {nested_path}: not generated from glob rules"
                 )
+                continue
+        with open_atomic(nested_path) as f:
+            f.write(f"{GLOB_MARKER}\n")
+            f.write(
+                f"# {directory.split('/')[-1].title()} Instructions for Claude Code\n\n"
+            )
+            f.write(
+                f"These instructions apply when working with files under {directory}/.\n\n"
+            )
+            for i, rule in enumerate(rules):
+                if i > 0:
+                    f.write("\n\n---\n\n")
+                f.write(render_rule_section(rule))
+        written.append(nested_path)
+
+    # Remove nested files generated for directories no glob rule maps to now
+    kept = {os.path.normpath(path) for path in written}
+    for rel in claude_files:
+        path = os.path.join(project_folder, rel)
+        if "/" in rel and os.path.normpath(path) not in kept and has_glob_marker(path):
+            os.remove(path)
+            console.print(f"[yellow]Removed {path}: no glob rule applies any more")
+
+    return written
+
+
+def has_glob_marker(path) -> bool:
+    """Whether a file was written for glob rules (starts with GLOB_MARKER)."""
+    with open(path, "r") as f:
+        return f.readline().rstrip("\n") == GLOB_MARKER
+
+
+def on_demand_path(rule: Rule, rules_dir) -> str:
+    """Project-relative path of a rule's on-demand file."""
+    path = Path(rule.path)
+    rel = (
+        path.relative_to(rules_dir).as_posix()
+        if path.is_relative_to(rules_dir)
+        else path.name
+    )
+    return f"{ON_DEMAND_DIR}/{rel}"
+
+
+def write_on_demand_rules(project_folder, rules_dir, rules: List[Rule]) -> List[str]:
+    """Write each rule in full under ON_DEMAND_DIR, replacing what was there.
+
+    The files are written to a new directory that then takes the place of
+    ON_DEMAND_DIR, under its own output_lock (every single-file output
+    shares it).
+    """
+    target = os.path.join(project_folder, ON_DEMAND_DIR)
+    with output_lock(project_folder, ON_DEMAND_DIR):
+        if not rules:
+            shutil.rmtree(target, ignore_errors=True)
+            return []
+        staging = tmp_sibling(target)
+        written = []
+        try:
+            for rule in rules:
+                rel = on_demand_path(rule, rules_dir)
+                path = os.path.join(staging, os.path.relpath(rel, ON_DEMAND_DIR))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w") as f:
+                    f.write(render_rule_section(rule) + "\n")
+                written.append(os.path.join(project_folder, rel))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        replace_dir(staging, target)
+    return written
+
+
+def render_rule_index(rules: List[Rule], rules_dir) -> str:
+    """One line per on-demand rule: name, description and where to read it."""
+    lines = [
+        "## On-Demand Rules\n",
+        "Read a rule's file when its description fits the task; read manual rules only when asked to.\n",
+    ]
+    for rule in rules:
+        manual = " (manual)" if rule.activation == "manual" else ""
+        description = " ".join((rule.description or "").split())
+        lines.append(
+            f"- **{rule.name}**{manual}: {description} — `/{on_demand_path(rule, rules_dir)}`"
+        )
+    return "\n".join(lines)
+
+
+def project_files(
+    project_folder, exclude: str = "", excluded: Optional[List[str]] = None
+) -> Iterator[str]:
+    """Posix paths of the project's files, relative to it, from one walk.
+
+    Hidden directories (.git, .cursor, ...), SKIP_DIRS and files named
+    exclude are left out; the paths of the latter are appended to excluded.
+    """
+    stack = [(project_folder, "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith(".") and entry.name not in SKIP_DIRS:
+                        stack.append((entry.path, f"{prefix}{entry.name}/"))
+                elif entry.name != exclude:
+                    yield prefix + entry.name
+                elif excluded is not None:
+                    excluded.append(prefix + entry.name)
+
+
+def glob_rule_dirs(
+    project_folder,
+    rules: List[Rule],
+    exclude: str = "",
+    excluded: Optional[List[str]] = None,
+) -> Dict[str, List[Rule]]:
+    """Map directory ("" for the root) -> glob rules to place there.
+
+    Each rule goes to the topmost directories containing files its globs
+    match; when that is more than MAX_RULE_DIRS directories, to their
+    common ancestor instead. Rules matching nothing are dropped. exclude
+    and excluded are passed to project_files.
+    """
+    matcher = RuleMatcher(rules)
+    dirs_by_rule: Dict[Rule, set] = {}
+    placed: Dict[str, List[Rule]] = {}
+    for path in project_files(project_folder, exclude, excluded):
+        directory = path.rpartition("/")[0]
+        for rule in matcher.match(path):
+            dirs_by_rule.setdefault(rule, set()).add(directory)
+
+    for rule, dirs in dirs_by_rule.items():
+        top: List[str] = []
+        for directory in sorted(
+            dirs, key=lambda d: (d.count("/"), d) if d else (-1, d)
+        ):
+            if not any(
+                t == "" or directory == t or directory.startswith(t + "/") for t in top
+            ):
+                top.append(directory)
+        if len(top) > MAX_RULE_DIRS:
+            top = [posixpath.commonpath(top)]
+        for directory in top:
+            placed.setdefault(directory, []).append(rule)
+    return placed
+
+
+def render_rule_section(rule: Rule) -> str:
+    """One rule as a section of a single-file output."""
+    # replace all markdown links to rules/ with just an emphasized subject
+    body = re.sub(r"\[([^\]]+)\]\(rules\/([^\)]+)\)", r"**\1**", rule.body())
+    return f"# Rule: {rule.name}\n\n## {rule.description}\n\n{prefix_headers(body.strip())}"
 
 
 def prefix_headers(markdown: str) -> str:
@@ -0,0 +1,324 @@
+"""Pre-commit checks of staged rules, memory-bank files and editor rule edits.
+
+Only staged files are checked, and their content is read from git's index
+rather than the worktree, so what is checked is exactly what is committed:
+
+- template rules (``rules/`` of this package's template, when it is in the
+  repository): frontmatter, as ``check`` validates it
+- links in staged template rules and memory-bank files, as ``lint``
+  resolves them: targets must exist in the index
+- links in other files to staged deletions and renames, found with one
+  ``git grep --cached`` for the removed file names
+- staged rule-directory editor files (``.cursor/rules``,
+  ``.windsurf/rules``): pulled back with ``transform_from_project`` and
+  rendered again, which must give the staged file, and the pulled rule must
+  pass the frontmatter checks
+
+Git runs at most four times, however many files are staged: for the
+staged list, the grep (only when files are deleted or renamed), one
+``cat-file --batch`` for all contents and one ``cat-file --batch-check``
+for all link targets. The checks stay within
+LATENCY_BUDGET_MS on large repositories (see benchmarks/staged_hook.py);
+interpreter startup comes on top unless the daemon serves the hook.
+"""
+
+import os
+import posixpath
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from .check import Finding, check_text
+from .commands import TEMPLATE_FOLDER
+from .editors import BUILTIN_EDITORS
+from .git_index import run_git
+from .lint import text_links
+
+LATENCY_BUDGET_MS = 100
+MEMORY_BANK_DIR = "memory-bank/"
+
+
+class StagedChange(NamedTuple):
+    status: str  # A, M, D, R, C, T (as git diff --name-status, without scores)
+    path: str  # Repository-relative; the new path of renames and copies
+    old_path: Optional[str] = None  # Renames and copies only
+
+
+def staged_changes(root, env=None) -> List[StagedChange]:
+    """Files staged for commit, with renames detected."""
+    fields = run_git(
+        root, "diff", "--cached", "--name-status", "-M", "-z", env=env
+    ).split(b"\0")
+    changes, i = [], 0
+    while i < len(fields) - 1:
+        status = fields[i].decode()[:1]
+        if status in "RC":
+            old, new = os.fsdecode(fields[i + 1]), os.fsdecode(fields[i + 2])
+            changes.append(StagedChange(status, new, old))
+            i += 3
+        else:
+            changes.append(StagedChange(status, os.fsdecode(fields[i + 1])))
+            i += 2
+    return changes
+
+
+def read_staged(root, paths: Iterable[str], env=None) -> Dict[str, bytes]:
+    """Staged content of each path, with one git cat-file --batch."""
+    paths = list(paths)
+    if not paths:
+        return {}
+    request = "".join(f":{path}\n" for path in paths).encode()
+    output = run_git(root, "cat-file", "--batch", input=request, env=env)
+    contents, pos = {}, 0
+    for path in paths:
+        end = output.index(b"\n", pos)
+        header = output[pos:end].split(b" ")
+        pos = end + 1
+        if header[-1] == b"missing":
+            continue
+        size = int(header[2])
+        contents[path] = output[pos : pos + size]
+        pos += size + 1
+    return contents
+
+
+def staged_exist(root, paths: Iterable[str], env=None) -> Set[str]:
+    """The paths present in the index, with one git cat-file --batch-check."""
+    paths = sorted(set(paths))
+    if not paths:
+        return set()
+    request = "".join(f":{path}\n" for path in paths).encode()
+    lines = run_git(
+        root, "cat-file", "--batch-check", input=request, env=env
+    ).splitlines()
+    return {path for path, line in zip(paths, lines) if not line.endswith(b" missing")}
+
+
+class StagedCheck:
+    """Classifies repository paths and runs the checks for one repository.
+
+    index_file replaces git's index, as GIT_INDEX_FILE does (git points
+    hooks at a temporary index for `commit -a` and `commit <paths>`).
+    """
+
+    def __init__(self, root, index_file=None):
+        self.root = Path(root)
+        self.env = (
+            dict(os.environ, GIT_INDEX_FILE=os.fspath(index_file))
+            if index_file
+            else None
+        )
+        template = os.path.relpath(TEMPLATE_FOLDER, self.root)
+        inside = template != ".." and not template.startswith("../")
+        # Template rules' links resolve against the template folder, as in lint
+        self.template = Path(template).as_posix() if inside else None
+        self.rules_prefix = (
+            "rules/" if self.template == "." else f"{self.template}/rules/"
+        )
+
+    def is_template_rule(self, path: str) -> bool:
+        return self.template is not None and path.startswith(self.rules_prefix)
+
+    def link_base(self, path: str) -> Optional[str]:
+        """Directory links in path are relative to, or None if its links are not checked."""
+        if not path.endswith(".md"):
+            return None
+        if self.is_template_rule(path):
+            return self.template
+        if path.startswith(MEMORY_BANK_DIR):
+            return "."
+        return None
+
+    def editor_for(self, path: str, editors):
+        """The rule-directory editor module whose rules directory holds path."""
+        for module in editors:
+            if path.startswith(module.RULES_DIR + "/") and path.endswith(
+                module.RULE_SUFFIX
+            ):
+                return module
+        return None
+
+    def resolve(self, base: str, link: str) -> str:
+        return posixpath.normpath(posixpath.join(base, link))
+
+    def run(self) -> List[Finding]:
+        root = self.root
+        changes = staged_changes(root, self.env)
+        removed = {}  # Deleted or renamed path -> new path (None when deleted)
+        staged = []
+        for change in changes:
+            if change.status == "D":
+                removed[change.path] = None
+            else:
+                staged.append(change.path)
+                if change.status == "R":
+                    removed[change.old_path] = change.path
+
+        editors = editor_modules(staged)
+        checked = [
+            path
+            for path in staged
+            if self.link_base(path) or self.editor_for(path, editors)
+        ]
+        referrers = self.referrers(removed, exclude=set(staged))
+        referring = set(referrers)
+        contents = read_staged(root, checked + referrers, self.env)
+
+        findings: List[Finding] = []
+        links = []  # (path, line, link, target)
+        with tempfile.TemporaryDirectory(prefix="llm-memory-bank-hook-") as tmp:
+            for path in checked + referrers:
+                content = contents.get(path)
+                if content is None:
+                    continue
+                try:
+                    text = content.decode()
+                except UnicodeDecodeError as e:
+                    findings.append(
+                        Finding(Path(path), f"Cannot read staged file: {e}")
+                    )
+                    continue
+                module = self.editor_for(path, editors)
+                if module is not None:
+                    findings += self.round_trip(path, content, module, tmp)
+                    continue
+                rule = (
+                    self.is_template_rule(path)
+                    and posixpath.basename(path) != "README.md"
+                )
+                if rule and path not in referring:
+                    findings += check_text(path, text)
+                base = self.link_base(path)
+                for line, _, link in text_links(text):
+                    links.append((path, line, link, self.resolve(base, link)))
+
+        # Every link target is looked up in the index at once
+        inside = {target for _, _, _, target in links if not target.startswith("../")}
+        present = staged_exist(root, inside, self.env)
+        for path, line, link, target in links:
+            if path in referring and target not in removed:
+                continue  # Only links to removed files matter in unstaged files
+            if target in present or (
+                target not in removed and (root / target).is_dir()
+            ):
+                continue
+            if target.startswith("../") and (root / target).exists():
+                continue
+            if target in removed:
+                moved = removed[target]
+                reason = f"renamed to {moved}" if moved else "deleted"
+                message = f"line {line}: link to {target}, which is {reason}: {link}"
+            else:
+                message = f"line {line}: broken link: {link} -> {target}"
+            findings.append(Finding(Path(path), message))
+        return sorted(
+            findings, key=lambda finding: (str(finding.path), finding.message)
+        )
+
+    def referrers(
+        self, removed: Dict[str, Optional[str]], exclude: Set[str]
+    ) -> List[str]:
+        """Unchanged linting files that may link to removed files (by file name)."""
+        if not removed:
+            return []
+        args = ["grep", "--cached", "-l", "-z", "-F"]
+        for path in sorted({posixpath.basename(path) for path in removed}):
+            args += ["-e", path]
+        args.append("--")
+        if self.template is not None:
+            args.append(f"{self.rules_prefix}*.md")
+        args.append(f"{MEMORY_BANK_DIR}*.md")
+        try:
+            output = run_git(self.root, *args, env=self.env)
+        except subprocess.CalledProcessError as e:
+            if e.returncode == 1:  # No matches
+                return []
+            raise
+        return [
+            path
+            for path in (os.fsdecode(name) for name in output.split(b"\0") if name)
+            if path not in exclude and path not in removed
+        ]
+
+    def round_trip(self, path: str, content: bytes, module, tmp: str) -> List[Finding]:
+        """Findings for an editor rule that does not survive a pull and a regenerate."""
+        staged_file = os.path.join(tmp, "staged" + module.RULE_SUFFIX)
+        pulled = os.path.join(tmp, "rule.md")
+        rendered = os.path.join(tmp, "rendered" + module.RULE_SUFFIX)
+        if os.path.exists(pulled):
+            os.unlink(pulled)
+        with open(staged_file, "wb") as f:
+            f.write(content)
+        module.transform_from_project(
+            staged_file, pulled, project_basename=self.root.name
+        )
+        if not os.path.exists(pulled):
+            return [Finding(Path(path), "Empty rule; a pull would skip it")]
+        with open(pulled, "r") as f:
+            findings = [
+                Finding(Path(path), f"After a pull: {finding.message}")
+                for finding in check_text(path, f.read())
+            ]
+        module.transform_to_project(pulled, rendered)
+        with open(rendered, "rb") as f:
+            again = f.read()
+        if again != content:
+            findings.append(Finding(Path(path), first_difference(content, again)))
+        return findings
+
+
+def first_difference(staged: bytes, again: bytes) -> str:
+    staged_lines = staged.decode().splitlines()
+    again_lines = again.decode().splitlines()
+    for number, (before, after) in enumerate(zip(staged_lines, again_lines), 1):
+        if before != after:
+            return (
+                f"line {number}: does not survive a pull and regenerate "
+                f"({before!r} would become {after!r})"
+            )
+    number = min(len(staged_lines), len(again_lines)) + 1
+    return (
+        f"line {number}: does not survive a pull and regenerate (lines added or lost)"
+    )
+
+
+def editor_modules(paths: List[str]):
+    """Rule-directory editor modules whose files may be among paths.
+
+    Built-in editors are loaded first; plugin editors (an entry point scan)
+    only when a staged file under a hidden directory is not theirs.
+    """
+    modules = [editor.load() for editor in BUILTIN_EDITORS if editor.load]
+    known = tuple(module.RULES_DIR + "/" for module in modules)
+    if any(path.startswith(".") and not path.startswith(known) for path in paths):
+        from .editors import available_editors
+
+        builtin = {editor.name for editor in BUILTIN_EDITORS}
+        modules += [
+            editor.load()
+            for name, editor in available_editors().items()
+            if name not in builtin and editor.load
+        ]
+    return modules
+
+
+def find_worktree(start: str) -> Optional[str]:
+    """The enclosing directory with a .git entry (a repository or linked worktree)."""
+    directory = os.path.abspath(start)
+    while True:
+        if os.path.exists(os.path.join(directory, ".git")):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def check_staged(root=None, index_file=None) -> List[Finding]:
+    """Findings for the files staged in the repository containing root (default: cwd)."""
+    start = os.fspath(root or os.getcwd())
+    top = find_worktree(start)
+    if top is None:
+        raise ValueError(f"Not in a git repository: {start}")
+    return StagedCheck(top, index_file).run()
@@ -0,0 +1,160 @@
+"""Record of the last template <-> project sync, per editor and rule.
+
+For every rule the store keeps two hashes taken at the last successful
+sync: the template file and the project (editor) file. Comparing current
+hashes against them classifies each rule without running any transform, so
+a sync only transforms the rules that actually moved and can tell which
+side changed.
+
+The store is a SQLite database at ``<project>/.llm-memory-bank/sync-state.db``.
+Syncs commit after each editor, while they still hold its output lock, so
+the next process to sync that editor sees their records.
+
+With use_git, hashes of files git tracks come from the blob IDs in git's
+index (see ``lib.git_index``): the database also maps every blob seen to
+its SHA-256, so clean tracked files are not read at all. Recorded hashes
+are SHA-256 either way, so the option can be switched freely.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from .common import file_digest
+from .git_index import GitIndex
+
+STATE_FILE = Path(".llm-memory-bank") / "sync-state.db"
+# Seconds to wait for another process's sync to commit before giving up
+BUSY_TIMEOUT = 300
+
+# Classifications
+NEW = "new"  # No record of a previous sync
+UNCHANGED = "unchanged"
+TEMPLATE_CHANGED = "template-changed"
+PROJECT_CHANGED = "project-changed"
+CONFLICT = "conflict"  # Both sides changed since the last sync
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rules (
+    editor TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    template_hash TEXT,
+    project_hash TEXT,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (editor, rule)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    blob TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL
+);
+"""
+
+
+class RuleState(NamedTuple):
+    template_hash: Optional[str]
+    project_hash: Optional[str]
+
+
+def hash_file(path) -> Optional[str]:
+    """SHA-256 of a file's bytes, or None if it does not exist."""
+    return file_digest(path)
+
+
+def classify(previous: Optional[RuleState], template_hash, project_hash) -> str:
+    """Classify a rule by comparing current hashes with the last sync."""
+    if previous is None:
+        return NEW
+    template_moved = template_hash != previous.template_hash
+    project_moved = project_hash != previous.project_hash
+    if template_moved and project_moved:
+        return CONFLICT
+    if template_moved:
+        return TEMPLATE_CHANGED
+    if project_moved:
+        return PROJECT_CHANGED
+    return UNCHANGED
+
+
+class SyncState:
+    """SQLite-backed sync state for one project folder."""
+
+    def __init__(self, project_folder, use_git: bool = False):
+        self.path = Path(project_folder) / STATE_FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+        self.db.executescript(_SCHEMA)
+        self.use_git = use_git
+        self.git_indexes: Dict[str, Optional[GitIndex]] = {}
+
+    def commit(self):
+        """Make the records so far visible to other processes."""
+        self.db.commit()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, editor: str, rule: str) -> Optional[RuleState]:
+        row = self.db.execute(
+            "SELECT template_hash, project_hash FROM rules"
+            " WHERE editor = ? AND rule = ?",
+            (editor, rule),
+        ).fetchone()
+        return RuleState(*row) if row else None
+
+    def rules(self, editor: str):
+        """All recorded rule names for an editor."""
+        return [
+            row[0]
+            for row in self.db.execute(
+                "SELECT rule FROM rules WHERE editor = ?", (editor,)
+            )
+        ]
+
+    def record(self, editor: str, rule: str, state: RuleState):
+        self.db.execute(
+            "INSERT OR REPLACE INTO rules"
+            " (editor, rule, template_hash, project_hash, synced_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (editor, rule, *state, time.time()),
+        )
+
+    def index_tree(self, root):
+        """With use_git, read the blob IDs of files under root from git (once per root)."""
+        key = str(root)
+        if self.use_git and key not in self.git_indexes:
+            self.git_indexes[key] = GitIndex.load(root)
+
+    def hash_file(self, path) -> Optional[str]:
+        """hash_file(path), looked up by blob ID for clean files of an indexed tree.
+
+        Only valid for files not written since their tree was indexed.
+        """
+        for index in self.git_indexes.values():
+            blob = index.blob(path) if index else None
+            if blob is None:
+                continue
+            row = self.db.execute(
+                "SELECT sha256 FROM blobs WHERE blob = ?", (blob,)
+            ).fetchone()
+            if row:
+                return row[0]
+            digest = hash_file(path)
+            if digest is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO blobs VALUES (?, ?)", (blob, digest)
+                )
+            return digest
+        return hash_file(path)
+
+    def forget(self, editor: str, rule: str):
+        self.db.execute(
+            "DELETE FROM rules WHERE editor = ? AND rule = ?", (editor, rule)
+        )
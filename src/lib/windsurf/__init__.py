@@ -2,7 +2,11 @@
 
 import re
 
-from ..common import create_windsurf_frontmatter, extract_frontmatter
+from ..common import WINDSURF_FRONTMATTER, dump_frontmatter, extract_frontmatter
+
+# Where rendered rules live in a project, and their file extension
+RULES_DIR = ".windsurf/rules"
+RULE_SUFFIX = ".md"
 
 
 def transform_to_project(src_path, dst_path):
@@ -16,8 +20,8 @@ def transform_to_project(src_path, dst_path):
     body = re.sub(r"\(rules/([^)]+)\.md\)", r"(.windsurf/rules/\1.md)", body)
     body = re.sub(r"\(memory-bank/", r"(memory-bank/", body)
 
-    # Apply Windsurf-specific frontmatter formatting (customized below)
-    windsurf_frontmatter = create_windsurf_frontmatter(frontmatter)
+    # Apply Windsurf-specific frontmatter formatting
+    windsurf_frontmatter = WINDSURF_FRONTMATTER.header(frontmatter)
 
     with open(dst_path, "w") as f:
         f.write(windsurf_frontmatter + "\n" + body)
@@ -72,70 +76,3 @@ def transform_from_project(
 
     with open(dst_path, "w") as f:
         f.write(dump_frontmatter(new_frontmatter, body))
-
-
-def dump_frontmatter(frontmatter, body):
-    """Dump frontmatter in new activation-based template format."""
-    if not frontmatter:
-        return body
-
-    lines = ["---"]
-
-    # Description (always include)
-    desc = frontmatter.get("description", "")
-    if desc:
-        # Always use unquoted single-line format
-        lines.append(f"description: {desc}")
-    else:
-        lines.append("description: ")
-
-    # Activation (always include)
-    activation = frontmatter.get("activation", "manual")
-    lines.append(f"activation: {activation}")
-
-    # Globs (only for glob activation)
-    if activation == "glob":
-        globs_value = frontmatter.get("globs", "")
-        if globs_value:
-            lines.append(f'globs: "{globs_value}"')
-        else:
-            lines.append("globs: ")
-
-    lines.append("---")
-
-    return "\n".join(lines) + "\n" + body
-
-
-def create_windsurf_frontmatter(frontmatter_dict):
-    """Create Windsurf-style frontmatter with new trigger values and globs omission."""
-    activation = frontmatter_dict.get("activation", "manual")
-    globs = frontmatter_dict.get("globs", None)
-    description = frontmatter_dict.get("description", "")
-
-    # Map activation to trigger
-    if activation == "always":
-        trigger = "always_on"
-    elif activation == "glob":
-        trigger = "glob"
-    elif activation == "agent-requested":
-        trigger = "model_decision"
-    elif activation == "manual":
-        trigger = "manual"
-    else:
-        trigger = activation  # fallback
-
-    lines = ["---"]
-    lines.append(f"trigger: {trigger}")
-
-    # Description
-    if description.strip():
-        lines.append(f"description: {description}")
-    else:
-        lines.append("description: ")
-
-    # Globs (only if present and non-empty, and only for glob activation)
-    if activation == "glob" and globs:
-        lines.append(f"globs: {globs}")
-
-    lines.append("---")
-    return "\n".join(lines)
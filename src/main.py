@@ -1,15 +1,61 @@
-import re
-import subprocess
-from pathlib import Path
+import os
+import sys
 
-import click
-from rich.console import Console
+from lib.daemon_client import run_via_daemon
 
-from lib import cursor, windsurf
-from lib.commands import rules_to_project_impl
-from lib.single_file import transform_to_project_single_file
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-console = Console()
+if __name__ == "__main__":
+    # Commands served by a running daemon are forwarded before click is
+    # even imported; without a daemon this returns and we run in-process.
+    run_via_daemon(sys.argv[1:], REPO_ROOT)
+
+from pathlib import Path  # noqa: E402
+
+import click  # noqa: E402
+
+from lib.console import console  # noqa: E402
+from lib.journal_logs import LOGS as JOURNAL_LOGS  # noqa: E402
+
+# Subcommands import their lib modules (and rich, via the console) only when
+# they run, so `--help` and light commands start fast. See benchmarks/startup.py.
+
+
+def to_shard(ctx, param, value):
+    """click callback parsing --shard i/N into a lib.shard.Shard."""
+    from lib.shard import Shard
+
+    if value is None:
+        return None
+    try:
+        return Shard.parse(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
+def shard_options(command):
+    """The --shard and --manifest options shared by sharded commands."""
+    command = click.option(
+        "--manifest",
+        type=click.Path(dir_okay=False, path_type=Path),
+        help="With --shard, write this shard's results here "
+        "(default: llm-memory-bank-<command>-shard-<i>-of-<N>.json)",
+    )(command)
+    return click.option(
+        "--shard",
+        callback=to_shard,
+        metavar="I/N",
+        help="Only process the work items of shard I of N (split by stable hash), "
+        "and write a manifest for merge-shards",
+    )(command)
+
+
+def save_manifest(command, shard, manifest, results):
+    from lib.shard import default_manifest, write_manifest
+
+    path = manifest or default_manifest(command, shard)
+    write_manifest(path, command, shard, results)
+    console.print(f"[green]Wrote shard {shard} manifest to {path}")
 
 
 @click.group()
@@ -19,62 +65,839 @@ def cli():
 
 @cli.command()
 @click.option(
-    "--all", is_flag=True, default=True, help="Generate rules for all supported editors"
+    "--all",
+    is_flag=True,
+    help="Generate rules for all editors (the default without --editor)",
+)
+@click.option(
+    "--editor",
+    "editors",
+    multiple=True,
+    help="Editor to generate for, repeatable: cursor, windsurf, claude-code, aider-chat "
+    "or a plugin editor",
+)
+@click.option(
+    "--sync-state",
+    is_flag=True,
+    help="Keep a sync-state database and only transform rules changed since the last run",
+)
+@click.option(
+    "--git-index",
+    is_flag=True,
+    help="With --sync-state, identify files git tracks by their blob IDs instead of hashing them",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Overwrite differing files that --compare or --sync-state would keep",
+)
+@click.option(
+    "--compare",
+    is_flag=True,
+    help="Report diffs for existing rule files that differ instead of overwriting them",
+)
+@click.option(
+    "--diff-json",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write --compare diffs and stats to this JSON file instead of showing them",
+)
+@click.option(
+    "--difftool",
+    help="External tool run once on all diffs, e.g. 'bcompare' (default: $LLM_MEMORY_BANK_DIFFTOOL)",
+)
+@click.option(
+    "--bundle",
+    is_flag=True,
+    help="Build a content-addressed archive of the outputs in the local cache instead",
+)
+@click.option(
+    "--compression",
+    type=click.Choice(["gzip", "xz", "none"]),
+    default="gzip",
+    show_default=True,
+    help="Compression of --bundle archives",
+)
+@click.option(
+    "--object-store",
+    is_flag=True,
+    help="Hardlink rule files from the shared content-addressed store in the cache",
 )
-def generate(all):
-    """Generate editor-specific rules in the output directory for all supported editors."""
-    output_folder = Path(__file__).parent.parent / "rules" # Root directory as str
+@shard_options
+def generate(
+    all,
+    editors,
+    sync_state,
+    git_index,
+    force,
+    compare,
+    diff_json,
+    difftool,
+    bundle,
+    compression,
+    object_store,
+    shard,
+    manifest,
+):
+    """Generate editor-specific rules in the output directory.
+
+    Only the selected editors' modules are loaded and only their outputs are
+    built; without --editor, all registered editors are generated.
+    """
+    from lib.check import RuleCheckError, ensure_valid
+    from lib.commands import TEMPLATE_FOLDER, generate_impl
+    from lib.common import write_atomic
+    from lib.diff_report import DiffReport
+    from lib.editors import select_editors
+
+    try:
+        selected = select_editors(() if all else editors)
+    except ValueError as e:
+        console.print(f"[red]{e}")
+        sys.exit(1)
+
+    # Broken rules fail here, before the bundle cache or sync state is touched
+    try:
+        ensure_valid(TEMPLATE_FOLDER / "rules")
+    except RuleCheckError as e:
+        print_findings(e.findings)
+        console.print(
+            f"[red]{len(e.findings)} errors in the rules; nothing was generated."
+        )
+        sys.exit(1)
+
+    if bundle and shard:
+        console.print("[red]--shard cannot be combined with --bundle")
+        sys.exit(1)
+
+    if bundle:
+        from lib.bundle import build_bundle
 
-    # Generate for single-file editors
-    transform_to_project_single_file(output_folder, "CLAUDE.md")
-    transform_to_project_single_file(output_folder, "CONVENTIONS.md")
+        path, cached = build_bundle(selected, compression)
+        console.print(f"[green]{'Cached' if cached else 'Built'} bundle {path}")
+        return
 
-    # Generate for multi-file editors
-    for editor, editor_module in [
-        ("cursor", cursor),
-        ("windsurf", windsurf),
-    ]:
-        rules_to_project_impl(
+    output_folder = Path(REPO_ROOT) / "rules"
+
+    report = DiffReport()
+    changes = {} if shard else None
+    state = None
+    if sync_state and any(not editor.output_file for editor in selected):
+        from lib.sync_state import SyncState
+
+        state = SyncState(output_folder, use_git=git_index)
+    try:
+        generate_impl(
             output_folder,
-            force=False,
-            compare=False,
-            editor_module=editor_module,
-            editor_name=editor,
+            selected,
+            force,
+            compare,
+            sync_state=state,
+            diff_report=report,
+            object_store=open_object_store() if object_store else None,
+            changes=changes,
+            check=False,
+            shard=shard,
         )
+    finally:
+        if state:
+            state.close()
+    if shard:
+        import json
+
+        results = {
+            "changes": {
+                outcome: sorted(os.path.relpath(path, output_folder) for path in paths)
+                for outcome, paths in changes.items()
+            },
+            "diffs": json.loads(report.to_json())["files"],
+        }
+        save_manifest("generate", shard, manifest, results)
+    if compare and diff_json:
+        write_atomic(diff_json, report.to_json())
+        console.print(f"[green]Wrote {len(report.diffs)} diffs to {diff_json}")
+    elif compare:
+        report.render(difftool)
+
+
+@cli.command("apply-bundle")
+@click.argument("bundle", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("project", type=click.Path(file_okay=False, path_type=Path))
+@click.option("--force", is_flag=True, help="Overwrite existing files that differ")
+@click.option(
+    "--compare", is_flag=True, help="Report diffs for existing files that differ"
+)
+@click.option(
+    "--difftool",
+    help="External tool run once on all diffs, e.g. 'bcompare' (default: $LLM_MEMORY_BANK_DIFFTOOL)",
+)
+@click.option(
+    "--object-store",
+    is_flag=True,
+    help="Hardlink rendered files from the shared content-addressed store in the cache",
+)
+def apply_bundle(bundle, project, force, compare, difftool, object_store):
+    """Unpack a bundle from `generate --bundle` into PROJECT.
+
+    Identical files are skipped; differing files are only overwritten with
+    --force, and memory-bank seed files are only added when missing.
+    """
+    from lib.bundle import apply_bundle as apply_bundle_impl
+    from lib.diff_report import DiffReport
+
+    report = DiffReport()
+    try:
+        results = apply_bundle_impl(
+            bundle,
+            project,
+            force,
+            compare,
+            diff_report=report,
+            object_store=open_object_store() if object_store else None,
+        )
+    except ValueError as e:
+        console.print(f"[red]{e}")
+        sys.exit(1)
+    for name in results["skipped"]:
+        console.print(f"[cyan]Skipping {project / name} (use --force or --compare)")
+    console.print(
+        f"[green]{len(results['created'])} created, {len(results['updated'])} updated, "
+        f"{len(results['unchanged'])} unchanged, {len(results['skipped'])} skipped"
+    )
+    if compare:
+        report.render(difftool)
+
+
+def open_object_store():
+    from lib.object_store import ObjectStore
+
+    return ObjectStore()
+
+
+@cli.group("object-store")
+def object_store_group():
+    """Inspect the shared content-addressed store used by --object-store."""
+    pass
+
+
+@object_store_group.command("verify")
+@click.option(
+    "--repair",
+    is_flag=True,
+    help="Delete corrupt objects so the next sync re-stores them",
+)
+def object_store_verify(repair):
+    """Re-hash every stored object and report any whose content changed."""
+    store = open_object_store()
+    results = store.verify(repair=repair)
+    for obj in results["corrupt"]:
+        action = "removed" if repair else "corrupt"
+        print(f"{obj}: {action} (content no longer matches its hash)")
+    if results["corrupt"]:
+        console.print(
+            f"[red]{len(results['corrupt'])} of {len(results['ok']) + len(results['corrupt'])} "
+            "objects corrupt. Files linked to them still hold the bad content; "
+            "regenerate with --force."
+        )
+        if not repair:
+            sys.exit(1)
+    else:
+        console.print(
+            f"[green]All {len(results['ok'])} objects in {store.root} are intact."
+        )
+
+
+@object_store_group.command("stats")
+def object_store_stats():
+    """Show object count, size and how much the hardlinks save."""
+    store = open_object_store()
+    stats = store.stats()
+    print(f"Store:        {store.root}")
+    print(f"Objects:      {stats.objects} ({stats.bytes} bytes)")
+    print(f"Links:        {stats.links}")
+    print(f"Bytes saved:  {stats.saved_bytes}")
 
 
 @cli.command()
-def lint():
+@click.argument("rule")
+@click.option(
+    "--editor", required=True, help="Rule-directory editor to render for, e.g. cursor"
+)
+def render(rule, editor):
+    """Print one template RULE rendered for an editor (e.g. core/05-meta-rules)."""
+    from lib.commands import render_rule, resolve_rule
+    from lib.editors import select_editors
+
+    try:
+        [selected] = select_editors([editor])
+        if selected.output_file:
+            raise ValueError(
+                f"{editor} is a single-file editor; run generate --editor {editor}"
+            )
+        rendered = render_rule(selected.load(), resolve_rule(rule))
+    except ValueError as e:
+        console.print(f"[red]{e}")
+        sys.exit(1)
+    sys.stdout.write(rendered)
+
+
+@cli.command("which-rules")
+@click.argument("paths", nargs=-1)
+@click.option(
+    "--git-diff",
+    metavar="REV",
+    help="Use the files changed since REV (git diff --name-only)",
+)
+@click.option(
+    "--json",
+    "as_json",
+    is_flag=True,
+    help="Print {path: [rules]} for every path as JSON",
+)
+def which_rules(paths, git_diff, as_json):
+    """List the glob-activated rules applying to each path.
+
+    Paths come from the arguments, --git-diff, or one per line on stdin.
+    """
+    import json
+    import subprocess
+
+    from lib.api import RuleSet
+
+    if git_diff:
+        try:
+            result = subprocess.run(
+                ["git", "diff", "--name-only", git_diff, "--"],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            console.print(f"[red]git diff failed: {getattr(e, 'stderr', '') or e}")
+            sys.exit(1)
+        paths = paths + tuple(result.stdout.splitlines())
+    elif not paths:
+        paths = tuple(
+            line.strip() for line in sys.stdin.read().splitlines() if line.strip()
+        )
+
+    ruleset = RuleSet()
+    matches = {
+        path: [ruleset.rule_name(rule) for rule in rules]
+        for path, rules in ruleset.which_rules(paths).items()
+    }
+    if as_json:
+        print(json.dumps(matches, indent=2))
+        return
+    for path, rules in matches.items():
+        if rules:
+            print(f"{path}: {', '.join(rules)}")
+
+
+@cli.group()
+def daemon():
+    """Run a local daemon that serves generate, lint, render and memory-bank queries."""
+    pass
+
+
+@daemon.command("run")
+@click.option(
+    "--poll",
+    default=1.0,
+    show_default=True,
+    help="Seconds between template change checks",
+)
+def daemon_run(poll):
+    """Serve requests in the foreground until stopped."""
+    from lib.daemon import RulesDaemon
+
+    server = RulesDaemon(cli, REPO_ROOT, poll_interval=poll)
+    console.print(f"[green]Serving on {server.socket_path}")
+    server.serve_forever()
+
+
+@daemon.command("start")
+def daemon_start():
+    """Start the daemon in the background (logs to .llm-memory-bank/daemon.log)."""
+    import subprocess
+    import time
+
+    from lib.daemon_client import PING, STATE_DIR, request, socket_path
+
+    path = socket_path(REPO_ROOT)
+    try:
+        pid = request(path, [PING], timeout=1).stdout.strip()
+        console.print(f"[yellow]Daemon already running (pid {pid})")
+        return
+    except (OSError, ValueError):
+        pass
+
+    os.makedirs(os.path.join(REPO_ROOT, STATE_DIR), exist_ok=True)
+    with open(os.path.join(REPO_ROOT, STATE_DIR, "daemon.log"), "a") as log_file:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "daemon", "run"],
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            pid = request(path, [PING], timeout=1).stdout.strip()
+            console.print(f"[green]Daemon started (pid {pid}) on {path}")
+            return
+        except (OSError, ValueError):
+            time.sleep(0.05)
+    console.print("[red]Daemon did not start; see .llm-memory-bank/daemon.log")
+    sys.exit(1)
+
+
+@daemon.command("stop")
+def daemon_stop():
+    """Stop a running daemon."""
+    from lib.daemon_client import STOP, request, socket_path
+
+    try:
+        request(socket_path(REPO_ROOT), [STOP], timeout=5)
+    except (OSError, ValueError):
+        console.print("[yellow]No daemon running.")
+        return
+    console.print("[green]Daemon stopped.")
+
+
+@daemon.command("status")
+def daemon_status():
+    """Report whether a daemon is serving this repository."""
+    from lib.daemon_client import PING, request, socket_path
+
+    path = socket_path(REPO_ROOT)
+    try:
+        pid = request(path, [PING], timeout=1).stdout.strip()
+    except (OSError, ValueError):
+        console.print("[yellow]No daemon running; commands run in-process.")
+        sys.exit(1)
+    console.print(f"[green]Daemon running (pid {pid}) on {path}")
+
+
+def print_findings(findings):
+    for finding in findings:
+        kind = "error" if finding.error else "warning"
+        print(f"{finding.path}: {kind}: {finding.message}")
+
+
+@cli.command()
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    help="Worker processes for large rule sets (default: one per CPU)",
+)
+@click.option(
+    "--strict",
+    is_flag=True,
+    help="Fail on warnings (duplicate filename priorities) too",
+)
+def check(jobs, strict):
+    """Validate the frontmatter of every rule and report all problems at once."""
+    from lib.check import check_rules
+    from lib.commands import TEMPLATE_FOLDER
+
+    findings = check_rules(TEMPLATE_FOLDER / "rules", jobs)
+    print_findings(findings)
+    errors = sum(finding.error for finding in findings)
+    warnings = len(findings) - errors
+    if errors or (strict and warnings):
+        console.print(f"[red]{errors} errors, {warnings} warnings.")
+        sys.exit(1)
+    if warnings:
+        console.print(f"[yellow]No errors, {warnings} warnings.")
+    else:
+        console.print("[green]All rules are valid!")
+
+
+@cli.command()
+@click.option(
+    "--index-file",
+    envvar="GIT_INDEX_FILE",
+    help="Index to read staged files from (default: $GIT_INDEX_FILE, set by git for hooks)",
+)
+def hook(index_file):
+    """Check the staged rules, memory-bank files and editor rule edits, for pre-commit.
+
+    Frontmatter, links (including links to staged deletions and renames)
+    and the round trip of .cursor/.windsurf edits through a pull are
+    checked on the staged content only. Exits 1 if anything fails.
+    """
+    from lib.staged import check_staged
+
+    try:
+        findings = check_staged(index_file=index_file)
+    except ValueError as e:
+        console.print(f"[red]{e}")
+        sys.exit(1)
+    print_findings(findings)
+    if findings:
+        console.print(f"[red]{len(findings)} problems in staged files.")
+        sys.exit(1)
+
+
+@cli.command()
+@shard_options
+def lint(shard, manifest):
     """Lint all markdown links in the project and warn if any are broken."""
+    from lib.lint import find_broken_links
+
     src_root = Path(__file__).parent.resolve()
-    root_dir = src_root.parent
-    md_files = list(src_root.glob("rules/**/*.md")) + list(
-        root_dir.glob("memory-bank/**/*.md")
-    )
-    broken = 0
-    for md_file in md_files:
-        with open(md_file, "r") as f:
-            content = f.read()
-        for match in re.finditer(r"(?<!\!)\[[^\]]+\]\(([^)\s]+)\)", content):
-            link = match.group(1)
-            # Determine the base path depending on which directory the file is in
-            if "rules" in str(md_file):
-                base_path = src_root
-            else:
-                base_path = root_dir
-            target = (base_path / link).resolve()
-            if not target.exists():
-                # Calculate line number (1-based)
-                line_number = content.count("\n", 0, match.start()) + 1
-                col_number = match.start() - content.rfind("\n", 0, match.start())
-                print(
-                    f"{md_file}:{line_number}:{col_number}: Broken link: {link} -> {target}"
-                )
-                broken += 1
-    if broken == 0:
+    broken = find_broken_links(src_root, src_root.parent, shard)
+    for b in broken:
+        print(f"{b.path}:{b.line}:{b.column}: Broken link: {b.link} -> {b.target}")
+    if not broken:
         console.print("[green]All markdown links are valid!")
     else:
-        console.print(f"[red]{broken} broken links found.")
+        console.print(f"[red]{len(broken)} broken links found.")
+    if shard:
+        root = src_root.parent
+        findings = [
+            {
+                "path": os.path.relpath(b.path, root),
+                "line": b.line,
+                "column": b.column,
+                "link": b.link,
+                "target": os.path.relpath(b.target, root),
+            }
+            for b in broken
+        ]
+        save_manifest("lint", shard, manifest, {"findings": findings})
+
+
+@cli.command("merge-shards")
+@click.argument(
+    "manifests",
+    nargs=-1,
+    required=True,
+    type=click.Path(dir_okay=False, path_type=Path),
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the merged results to this JSON file",
+)
+def merge_shards(manifests, output):
+    """Combine the manifests of every --shard of a lint or generate run.
+
+    Fails unless the manifests cover each shard of the run exactly once.
+    Lint findings are printed as lint prints them; for generate, the
+    merged change summary.
+    """
+    import json
+
+    from lib.common import write_atomic
+    from lib.shard import merge_manifests
+
+    try:
+        merged = merge_manifests(manifests)
+    except ValueError as e:
+        console.print(f"[red]{e}")
+        sys.exit(1)
+
+    if merged["command"] == "lint":
+        findings = merged["findings"]
+        for f in findings:
+            print(
+                f"{f['path']}:{f['line']}:{f['column']}: Broken link: {f['link']} -> {f['target']}"
+            )
+        if not findings:
+            console.print(
+                f"[green]All markdown links are valid ({merged['shards']} shards)!"
+            )
+        else:
+            console.print(f"[red]{len(findings)} broken links found.")
+    else:
+        summary = ", ".join(
+            f"{len(paths)} {outcome}" for outcome, paths in merged["changes"].items()
+        )
+        console.print(f"[green]{merged['shards']} shards: {summary or 'no changes'}")
+        if merged["diffs"]:
+            console.print(f"[yellow]{len(merged['diffs'])} files differ")
+    if output:
+        write_atomic(output, json.dumps(merged, indent=2, sort_keys=True) + "\n")
+        console.print(f"[green]Wrote merged results to {output}")
+
+
+@cli.group("memory-bank")
+def memory_bank():
+    """Query and maintain the memory-bank files of a project."""
+    pass
+
+
+project_option = click.option(
+    "--project",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=REPO_ROOT,
+    show_default="repository root",
+    help="Project folder containing memory-bank/",
+)
+
+
+def load_semantic_index():
+    """Import the numpy-backed index module, exiting cleanly if numpy is missing."""
+    try:
+        from lib import semantic_index
+    except ImportError:
+        console.print(
+            "[red]Semantic search requires numpy. Install with: pip install 'llm-memory-bank[search]'"
+        )
+        sys.exit(1)
+    return semantic_index
+
+
+@memory_bank.command()
+@project_option
+@click.option(
+    "--dim",
+    default=256,
+    show_default=True,
+    help="Vector dimensions (changing it re-embeds all chunks)",
+)
+def index(project, dim):
+    """Build or incrementally refresh the semantic index of memory-bank chunks."""
+    semantic_index = load_semantic_index()
+    idx = semantic_index.SemanticIndex(project / ".llm-memory-bank" / "index")
+    stats = idx.build(project / "memory-bank", dim=dim)
+    console.print(
+        f"[green]Indexed {stats['reused'] + stats['embedded']} chunks "
+        f"({stats['embedded']} embedded, {stats['reused']} reused, {stats['dropped']} dropped)"
+    )
+
+
+@memory_bank.command()
+@project_option
+@click.option("-k", "--top", default=5, show_default=True, help="Results per query")
+@click.argument("queries", nargs=-1, required=True)
+def search(project, top, queries):
+    """Semantic search of memory-bank chunks; each argument is a separate query."""
+    semantic_index = load_semantic_index()
+    idx = semantic_index.SemanticIndex(project / ".llm-memory-bank" / "index")
+    if not idx.exists():
+        console.print("[red]No index found. Run: python main.py memory-bank index")
+        sys.exit(1)
+    for query, hits in zip(queries, idx.search(queries, k=top)):
+        if len(queries) > 1:
+            console.print(f"[bold]{query}")
+        for hit in hits:
+            print(
+                f"{hit.path}:{hit.line}: {hit.score:.3f} {hit.heading or hit.preview[:60]}"
+            )
+
+
+@memory_bank.command()
+@project_option
+@click.option(
+    "--threshold",
+    default=0.6,
+    show_default=True,
+    help="Minimum Jaccard similarity of word-bigram shingles for entries to count as duplicates",
+)
+@click.option(
+    "--apply", is_flag=True, help="Remove duplicates instead of only proposing"
+)
+@click.argument("files", nargs=-1, type=click.Path(dir_okay=False, path_type=Path))
+def compact(project, threshold, apply, files):
+    """Find and merge near-duplicate entries in append-only memory-bank logs.
+
+    Defaults to lessons_learned.md, error_documentation.md and troubleshooting_log.md.
+    """
+    from lib.compact import DEFAULT_FILES, compact_file
+
+    paths = files or [project / f for f in DEFAULT_FILES]
+    total_bytes = total_tokens = 0
+    for path in paths:
+        if not path.exists():
+            continue
+        clusters, saved_bytes, saved_tokens = compact_file(path, threshold, apply)
+        for cluster in clusters:
+            console.print(
+                f"[yellow]{path}:{cluster.keep.line}: keeping entry, "
+                f"{len(cluster.drop)} near-duplicate(s) (similarity >= {cluster.similarity:.2f})"
+            )
+            for entry in cluster.drop:
+                print(f"  {path}:{entry.line}: {entry.text.splitlines()[0][:80]}")
+        total_bytes += saved_bytes
+        total_tokens += saved_tokens
+
+    verb = "Saved" if apply else "Would save"
+    console.print(f"[green]{verb} {total_bytes} bytes (~{total_tokens} tokens).")
+    if not apply and total_bytes:
+        console.print("[cyan]Run with --apply to remove the duplicates.")
+
+
+@memory_bank.group()
+def log():
+    """Append to and query segmented memory-bank logs."""
+    pass
+
+
+def resolve_log(project, name):
+    """Map a log name like 'troubleshooting_log' or a path to its head file."""
+    path = Path(name)
+    if path.suffix == ".md":
+        return path
+    matches = sorted((project / "memory-bank").glob(f"**/{name}.md"))
+    return matches[0] if matches else project / "memory-bank" / "project" / f"{name}.md"
+
+
+def open_log(project, name):
+    from lib.segmented_log import SegmentedLog
+
+    return SegmentedLog(resolve_log(project, name), project)
+
+
+@log.command("init")
+@project_option
+@click.option(
+    "--rotate",
+    type=click.Choice(["size", "monthly"]),
+    default="size",
+    show_default=True,
+)
+@click.option(
+    "--keep", default=20, show_default=True, help="Recent entries kept in the head file"
+)
+@click.option(
+    "--segment-kb",
+    default=64,
+    show_default=True,
+    help="Target segment size for size rotation",
+)
+@click.argument("name")
+def log_init(project, rotate, keep, segment_kb, name):
+    """Enable segmented mode for a log (e.g. troubleshooting_log) and archive old entries."""
+    from lib.segmented_log import LogPolicy
+
+    segmented = open_log(project, name)
+    segmented.init(LogPolicy(rotate=rotate, keep=keep, segment_bytes=segment_kb * 1024))
+    console.print(
+        f"[green]{segmented.head_path} is now a segmented log ({rotate}, keep {keep})"
+    )
+
+
+@log.command("append")
+@project_option
+@click.option("--title", required=True, help="Entry title (the date is prepended)")
+@click.argument("name")
+@click.argument("body", required=False)
+def log_append(project, title, name, body):
+    """Append an entry to a log; BODY defaults to stdin."""
+    if body is None:
+        body = sys.stdin.read()
+    entry = open_log(project, name).append(title, body)
+    console.print(f"[green]Appended: {entry.heading}")
+
+
+@log.command("rotate")
+@project_option
+@click.argument("name")
+def log_rotate(project, name):
+    """Archive entries beyond the log's keep count."""
+    try:
+        open_log(project, name).rotate()
+    except ValueError as e:
+        console.print(f"[red]{e}")
+        sys.exit(1)
+
+
+@log.command("query")
+@project_option
+@click.option("--since", help="Only entries dated YYYY-MM-DD or later")
+@click.option("--limit", default=20, show_default=True, help="Maximum entries to list")
+@click.argument("name")
+@click.argument("pattern")
+def log_query(project, since, limit, name, pattern):
+    """List entries matching PATTERN (regex), newest first, across all segments."""
+    import re
+
+    try:
+        re.compile(pattern)
+    except re.error as e:
+        raise click.BadParameter(f"Invalid regex: {e}", param_hint="PATTERN")
+    found = 0
+    for match in open_log(project, name).query(pattern, since=since):
+        print(f"{match.path}:{match.line}: {match.heading}")
+        found += 1
+        if found >= limit:
+            break
+    if not found:
+        console.print("[yellow]No matching entries.")
+
+
+@memory_bank.group()
+def journal():
+    """Lock-free appends from parallel agents, merged into the canonical logs."""
+    pass
+
+
+@journal.command("append")
+@project_option
+@click.option(
+    "--title", required=True, help="Entry title (the date is prepended on merge)"
+)
+@click.option("--writer", help="Writer id (default: $MEMORY_BANK_WRITER or host-pid)")
+@click.argument(
+    "log",
+    type=click.Choice(list(JOURNAL_LOGS)),
+)
+@click.argument("body", required=False)
+def journal_append(project, title, writer, log, body):
+    """Append an entry to this writer's journal; BODY defaults to stdin."""
+    from lib.journal import Journal
+
+    if body is None:
+        body = sys.stdin.read()
+    try:
+        record = Journal(project).append(log, title, body, writer=writer)
+    except ValueError as e:
+        console.print(f"[red]{e}")
+        sys.exit(1)
+    console.print(f"[green]Journaled for {record.log} as {record.writer}")
+
+
+@journal.command("merge")
+@project_option
+@click.option(
+    "--watch", type=float, help="Keep merging every N seconds instead of merging once"
+)
+def journal_merge(project, watch):
+    """Fold all writers' journals into the markdown logs in timestamp order."""
+    import time
+
+    from lib.journal import Journal
+
+    journal_store = Journal(project)
+    while True:
+        merged = journal_store.merge()
+        for log_name, count in sorted(merged.items()):
+            console.print(f"[green]Merged {count} entries into {log_name}")
+        if watch is None:
+            if not merged:
+                console.print("[green]Nothing to merge.")
+            break
+        time.sleep(watch)
+
+
+@journal.command("status")
+@project_option
+def journal_status(project):
+    """Show how many journaled entries are waiting to be merged."""
+    from lib.journal import Journal
+
+    pending = Journal(project).pending()
+    by_log = {}
+    for record in pending:
+        by_log[record.log] = by_log.get(record.log, 0) + 1
+    for log_name, count in sorted(by_log.items()):
+        print(f"{log_name}: {count} pending")
+    if not pending:
+        console.print("[green]No pending entries.")
 
 
 if __name__ == "__main__":
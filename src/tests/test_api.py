@@ -0,0 +1,140 @@
+"""Tests for the in-process Python API."""
+
+import pytest
+
+from lib.api import Project, RuleSet
+
+RULE = """---
+description: Always follow the example rule
+activation: always
+single_file: true
+---
+# Example
+
+See [the other rule](rules/core/02-other.md) and [nothing](rules/core/missing.md).
+"""
+
+OTHER = """---
+description: Another rule
+activation: always
+single_file: skip
+---
+# Other
+"""
+
+
+@pytest.fixture
+def ruleset(tmp_path):
+    root = tmp_path / "template" / "src"
+    (root / "rules" / "core").mkdir(parents=True)
+    (root / "rules" / "core" / "01-example.md").write_text(RULE)
+    (root / "rules" / "core" / "02-other.md").write_text(OTHER)
+    (root / "LLM-README.md").write_text("# Readme\n")
+    (tmp_path / "template" / "memory-bank").mkdir()
+    (tmp_path / "template" / "memory-bank" / "notes.md").write_text("# Notes\n")
+    return RuleSet(root)
+
+
+class TestRuleSet:
+    """Test template queries."""
+
+    def test_rules_render_and_lint(self, ruleset):
+        """Test listing, rendering by stem and structured lint findings."""
+        assert ruleset.rules() == ["core/01-example.md", "core/02-other.md"]
+        rendered = ruleset.render("01-example", "cursor")
+        assert rendered.startswith("---\ndescription: Always follow the example rule")
+        assert "# Example" in rendered
+        [finding] = ruleset.lint()
+        assert finding.link == "rules/core/missing.md"
+        assert finding.line == 8
+
+    def test_single_file_editor_cannot_render(self, ruleset):
+        """Test rendering for a single-file editor is a ValueError."""
+        with pytest.raises(ValueError):
+            ruleset.render("01-example", "claude-code")
+
+
+class TestProject:
+    """Test syncing a project against an explicit template."""
+
+    def test_sync_reports_changes_without_output(self, ruleset, tmp_path, capsys):
+        """Test syncs report created, unchanged and updated files and print nothing."""
+        project = Project(tmp_path / "project", ruleset)
+        changes = project.sync(["cursor", "claude-code"])
+        created = changes.paths("created")
+        assert (
+            tmp_path / "project" / ".cursor" / "rules" / "core" / "01-example.mdc"
+            in created
+        )
+        assert tmp_path / "project" / "CLAUDE.md" in created
+        assert tmp_path / "project" / "memory-bank" / "notes.md" in created
+        assert changes.changed
+        assert (
+            "Always follow the example rule"
+            in (tmp_path / "project" / "CLAUDE.md").read_text()
+        )
+        assert capsys.readouterr().out == ""
+
+        changes = project.sync(["cursor"], sync_state=True)
+        assert changes.summary() == {"unchanged": 2}
+        assert not changes.changed
+
+        template_rule = ruleset.rules_dir / "core" / "02-other.md"
+        template_rule.write_text(OTHER + "More.\n")
+        changes = project.sync(["cursor"], sync_state=True)
+        assert changes.summary() == {"updated": 1, "unchanged": 1}
+
+    def test_compare_collects_diffs(self, ruleset, tmp_path):
+        """Test compare mode leaves edited files alone and returns their diffs."""
+        project = Project(tmp_path / "project", ruleset)
+        project.sync(["windsurf"])
+        edited = tmp_path / "project" / ".windsurf" / "rules" / "core" / "02-other.md"
+        edited.write_text(edited.read_text() + "local edit\n")
+
+        changes = project.sync(["windsurf"], compare=True)
+        assert changes.paths("differs") == [edited]
+        assert "local edit" in edited.read_text()
+        assert project.sync(["windsurf"], force=True).paths("updated") == [edited]
+        assert "local edit" not in edited.read_text()
+
+        project.sync(["windsurf"], sync_state=True)
+        edited.write_text(edited.read_text() + "local edit\n")
+        changes = project.sync(["windsurf"], compare=True, sync_state=True)
+        assert changes.paths("differs") == [edited]
+        assert changes.diffs.summary()
+        assert "local edit" in edited.read_text()
+
+    def test_sync_without_state_overwrites(self, ruleset, tmp_path):
+        """Test a plain sync regenerates edited rule files, as it does CLAUDE.md."""
+        project = Project(tmp_path / "project", ruleset)
+        project.sync(["cursor", "claude-code"])
+        rule = tmp_path / "project" / ".cursor" / "rules" / "core" / "02-other.mdc"
+        claude = tmp_path / "project" / "CLAUDE.md"
+        for path in (rule, claude):
+            path.write_text(path.read_text() + "local edit\n")
+
+        changes = project.sync(["cursor", "claude-code"])
+        assert set(changes.paths("updated")) == {rule, claude}
+        assert "local edit" not in rule.read_text()
+        assert "local edit" not in claude.read_text()
+
+    def test_pull_updates_template(self, ruleset, tmp_path):
+        """Test pulling an edited rule back only writes the template when forced."""
+        project = Project(tmp_path / "project", ruleset)
+        project.sync(["cursor"])
+        edited = tmp_path / "project" / ".cursor" / "rules" / "core" / "02-other.mdc"
+        edited.write_text(edited.read_text() + "pulled line\n")
+        template_rule = ruleset.rules_dir / "core" / "02-other.md"
+
+        changes = project.pull("cursor")
+        assert template_rule in changes.paths("skipped")
+        assert "pulled line" not in template_rule.read_text()
+
+        changes = project.pull("cursor", force=True)
+        assert template_rule in changes.paths("updated")
+        assert "pulled line" in template_rule.read_text()
+
+    def test_unknown_editor(self, ruleset, tmp_path):
+        """Test unknown editors raise ValueError instead of exiting."""
+        with pytest.raises(ValueError):
+            Project(tmp_path / "project", ruleset).sync(["notepad"])
@@ -0,0 +1,127 @@
+"""Tests for content-addressed rule bundles."""
+
+import io
+import json
+import shutil
+import tarfile
+
+import pytest
+
+from lib.bundle import FORMAT_VERSION, MANIFEST_NAME, apply_bundle, build_bundle
+from lib.common import CACHE_ENV
+from lib.diff_report import DiffReport
+from lib.editors import select_editors
+from lib.object_store import ObjectStore
+
+
+def write_bundle(path, files):
+    """An uncompressed bundle holding files (name -> bytes) and no seed."""
+    manifest = json.dumps({"format": FORMAT_VERSION, "seed": []}).encode()
+    with tarfile.open(path, "w") as tar:
+        for name, data in [(MANIFEST_NAME, manifest), *files.items()]:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+class TestBuildBundle:
+    """Test bundle builds and caching."""
+
+    def test_bundle_is_deterministic_and_cached(self, cache):
+        """Test rebuilding gives identical bytes and the second build is a cache hit."""
+        editors = select_editors(["cursor", "claude-code"])
+        path, cached = build_bundle(editors)
+        assert not cached
+        assert path.name.startswith("rules-") and path.name.endswith(".tar.gz")
+        first = path.read_bytes()
+
+        assert build_bundle(editors) == (path, True)
+
+        # Without the inputs index the archive is rebuilt from scratch
+        shutil.rmtree(cache / "index")
+        path.unlink()
+        rebuilt, cached = build_bundle(editors)
+        assert rebuilt == path and not cached
+        assert rebuilt.read_bytes() == first
+
+    def test_bundle_contains_only_selected_editors(self, cache):
+        """Test a Windsurf-only bundle has no Cursor or single-file outputs."""
+        path, _ = build_bundle(select_editors(["windsurf"]), compression="none")
+        with tarfile.open(path) as tar:
+            names = tar.getnames()
+        assert any(name.startswith(".windsurf/rules/") for name in names)
+        assert not any(name.startswith(".cursor/") for name in names)
+        assert "CLAUDE.md" not in names
+        assert all(member.mtime == 0 for member in tarfile.open(path).getmembers())
+
+    def test_bundle_has_no_lock_files(self, cache):
+        """Test output locks taken while rendering stay out of the bundle."""
+        path, _ = build_bundle(select_editors([]), compression="none")
+        with tarfile.open(path) as tar:
+            names = tar.getnames()
+        assert not [name for name in names if name.startswith(".llm-memory-bank/")]
+        assert not [name for name in names if name.endswith(".lock")]
+
+
+class TestApplyBundle:
+    """Test streaming a bundle into a project."""
+
+    def test_apply_semantics(self, cache, tmp_path):
+        """Test create, skip-unchanged, compare, force and seed protection."""
+        bundle, _ = build_bundle(select_editors(["cursor", "claude-code"]))
+        project = tmp_path / "project"
+
+        results = apply_bundle(bundle, project)
+        assert "CLAUDE.md" in results["created"]
+        assert apply_bundle(bundle, project)["created"] == []
+
+        claude = project / "CLAUDE.md"
+        claude.write_text(claude.read_text() + "local\n")
+        seed = "memory-bank/project/lessons_learned.md"
+        assert seed in results["created"]
+        (project / seed).write_text("project notes\n")
+
+        report = DiffReport()
+        results = apply_bundle(bundle, project, compare=True, diff_report=report)
+        assert set(results["skipped"]) == {"CLAUDE.md", seed}
+        assert [d.path for d in report.diffs] == ["CLAUDE.md"]
+
+        results = apply_bundle(bundle, project, force=True)
+        assert results["updated"] == ["CLAUDE.md"]
+        assert not claude.read_text().endswith("local\n")
+        assert (project / seed).read_text() == "project notes\n"
+
+    def test_bytes_written_unchanged(self, tmp_path):
+        """Test files are written byte for byte and do not keep a store link's mode."""
+        name = ".cursor/rules/core/a.mdc"
+        old = write_bundle(tmp_path / "old.tar", {name: b"old \xff\n"})
+        new = write_bundle(tmp_path / "new.tar", {name: b"new \xfe\r\n"})
+        project = tmp_path / "project"
+        apply_bundle(old, project, object_store=ObjectStore(tmp_path / "objects"))
+        dst = project / name
+        assert dst.stat().st_nlink == 2 and not dst.stat().st_mode & 0o200
+
+        report = DiffReport()
+        apply_bundle(new, project, compare=True, diff_report=report)
+        assert [d.path for d in report.diffs] == [name]
+
+        assert apply_bundle(new, project, force=True)["updated"] == [name]
+        assert dst.read_bytes() == b"new \xfe\r\n"
+        assert dst.stat().st_nlink == 1 and dst.stat().st_mode & 0o200
+
+    def test_rejects_unsafe_paths(self, tmp_path):
+        """Test members escaping the project are refused."""
+        bundle = tmp_path / "evil.tar"
+        with tarfile.open(bundle, "w") as tar:
+            info = tarfile.TarInfo("../escape.md")
+            info.size = 1
+            tar.addfile(info, io.BytesIO(b"x"))
+        with pytest.raises(ValueError, match="Unsafe path"):
+            apply_bundle(bundle, tmp_path / "project")
@@ -0,0 +1,123 @@
+"""Tests for whole-corpus rule checks."""
+
+import pytest
+from click.testing import CliRunner
+
+from lib import check, commands
+from lib.check import RuleCheckError, check_rules
+from lib.commands import generate_impl
+from lib.editors import select_editors
+
+VALID = """---
+description: A valid rule
+activation: always
+single_file: true
+---
+# Valid
+"""
+
+BROKEN = """---
+description: Broken in several ways
+activation: glob
+single_file: sometimes
+priority: high
+---
+# Broken
+"""
+
+
+@pytest.fixture
+def template(tmp_path):
+    root = tmp_path / "src"
+    core = root / "rules" / "core"
+    core.mkdir(parents=True)
+    (core / "01-valid.md").write_text(VALID)
+    (core / "01-also-valid.md").write_text(VALID)
+    (core / "README.md").write_text("# Not a rule\n")
+    (root / "rules" / "extra").mkdir()
+    (root / "rules" / "extra" / "01-elsewhere.md").write_text(VALID)
+    return root
+
+
+def messages(findings):
+    return [(finding.path.name, finding.error, finding.message) for finding in findings]
+
+
+class TestCheckRules:
+    """Test findings for a template."""
+
+    def test_valid_template_only_warns_on_duplicates(self, template):
+        """Test duplicate priorities in one directory are warnings, across directories nothing."""
+        [finding] = check_rules(template / "rules")
+        assert finding.path.name == "01-valid.md"
+        assert not finding.error
+        assert "also used by 01-also-valid.md" in finding.message
+
+    def test_all_errors_are_collected(self, template):
+        """Test every problem of every file is reported, not just the first."""
+        core = template / "rules" / "core"
+        (core / "02-broken.md").write_text(BROKEN)
+        (core / "03-no-frontmatter.md").write_text("# Nothing\n")
+        (core / "100-too-far.md").write_text(VALID)
+        (core / "04-section.md").write_text(VALID.replace("true", "section:../outside"))
+
+        errors = [
+            finding for finding in check_rules(template / "rules") if finding.error
+        ]
+        found = [(name, message.split(":")[0]) for name, _, message in messages(errors)]
+        assert ("02-broken.md", "activation") in found  # glob without globs
+        assert ("02-broken.md", "Unknown single_file value") in found
+        assert ("02-broken.md", "priority field must be an integer") in found
+        assert (
+            "03-no-frontmatter.md",
+            "Missing required 'activation' field. Must be one of",
+        ) in found
+        assert ("04-section.md", "single_file") in found
+        assert (
+            "100-too-far.md",
+            "Filename priority 100 is out of range; use 0-99 (##-RuleName.md)",
+        ) in found
+        assert len(errors) == 6
+
+    def test_parallel_matches_serial(self, template, monkeypatch):
+        """Test checking in worker processes gives the same report."""
+        core = template / "rules" / "core"
+        for i in range(20):
+            (core / f"{i + 10:02d}-rule{i}.md").write_text(BROKEN if i % 3 else VALID)
+        serial = check_rules(template / "rules", jobs=1)
+        monkeypatch.setattr(check, "PARALLEL_THRESHOLD", 1)
+        assert check_rules(template / "rules", jobs=2) == serial
+
+
+class TestGenerate:
+    """Test generation refuses broken templates."""
+
+    def test_fails_before_writing(self, template, tmp_path):
+        """Test no output is written when any rule has errors."""
+        (template / "rules" / "extra" / "02-broken.md").write_text(BROKEN)
+        project = tmp_path / "project"
+        project.mkdir()
+        with pytest.raises(RuleCheckError) as raised:
+            generate_impl(project, select_editors([]), template_folder=template)
+        assert len(raised.value.findings) == 3
+        assert "(and 2 more)" in str(raised.value)
+        assert list(project.iterdir()) == []
+
+    def test_check_command(self, template, monkeypatch):
+        """Test the check command exits 1 on errors, and on warnings with --strict."""
+        import main
+
+        monkeypatch.setattr(commands, "TEMPLATE_FOLDER", template)
+        runner = CliRunner()
+        result = runner.invoke(main.cli, ["check"])
+        assert result.exit_code == 0
+        assert "01-valid.md: warning: Priority 01" in result.output
+        assert runner.invoke(main.cli, ["check", "--strict"]).exit_code == 1
+
+        (template / "rules" / "core" / "02-broken.md").write_text(BROKEN)
+        result = runner.invoke(main.cli, ["check"])
+        assert result.exit_code == 1
+        assert (
+            "02-broken.md: error: Unknown single_file value: 'sometimes'"
+            in result.output
+        )
@@ -0,0 +1,120 @@
+"""Tests for syncing project rules back into the template (project-to-rules)."""
+
+import subprocess
+
+import pytest
+
+from lib import cursor
+from lib.commands import (
+    DirtyTemplateError,
+    project_to_rules_impl,
+    rules_to_project_impl,
+)
+from lib.console import quiet
+
+RULE = """---
+description: Rule {name}
+activation: always
+---
+# Rule {name}
+
+Body of rule {name}.
+"""
+
+
+def git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def template(tmp_path):
+    """A committed template with one core rule."""
+    root = tmp_path / "template"
+    (root / "rules" / "core").mkdir(parents=True)
+    (root / "rules" / "core" / "a.md").write_text(RULE.format(name="a"))
+    git(root, "init", "-q")
+    git(root, "add", "rules")
+    git(root, "commit", "-q", "-m", "rules")
+    return root
+
+
+@pytest.fixture
+def project(tmp_path, template):
+    """A project with the template's rules generated for Cursor."""
+    root = tmp_path / "project"
+    root.mkdir()
+    with quiet():
+        rules_to_project_impl(
+            root, False, False, cursor, "cursor", template_folder=template
+        )
+    return root
+
+
+def pull(project, template, force=False):
+    changes = {}
+    with quiet():
+        project_to_rules_impl(
+            project,
+            force,
+            False,
+            cursor,
+            "cursor",
+            template_folder=template,
+            changes=changes,
+        )
+    return {
+        outcome: sorted(p.relative_to(template).as_posix() for p in paths)
+        for outcome, paths in changes.items()
+    }
+
+
+class TestProjectToRules:
+    """Test project-to-rules against a git template."""
+
+    def test_identical_rules_skipped(self, project, template):
+        """Test rules that round-trip unchanged leave the template alone."""
+        before = (template / "rules" / "core" / "a.md").read_text()
+        assert pull(project, template) == {"unchanged": ["rules/core/a.md"]}
+        assert (template / "rules" / "core" / "a.md").read_text() == before
+
+    def test_changed_rule_needs_force(self, project, template):
+        """Test project edits are skipped without --force and copied with it."""
+        rule = project / ".cursor" / "rules" / "core" / "a.mdc"
+        rule.write_text(rule.read_text() + "\nProject note.\n")
+
+        assert pull(project, template) == {"skipped": ["rules/core/a.md"]}
+        assert "Project note." not in (template / "rules/core/a.md").read_text()
+
+        assert pull(project, template, force=True) == {"updated": ["rules/core/a.md"]}
+        assert "Project note." in (template / "rules/core/a.md").read_text()
+
+    def test_new_rule_created_with_force(self, project, template):
+        """Test a rule only in the project is created in the template with --force."""
+        rule = project / ".cursor" / "rules" / "core" / "b.mdc"
+        rule.write_text((project / ".cursor/rules/core/a.mdc").read_text())
+
+        assert pull(project, template)["skipped"] == ["rules/core/b.md"]
+        assert not (template / "rules" / "core" / "b.md").exists()
+
+        assert pull(project, template, force=True)["created"] == ["rules/core/b.md"]
+        assert (template / "rules" / "core" / "b.md").exists()
+
+    def test_project_rules_stay_in_project(self, project, template):
+        """Test rules under a project/ directory are never copied to the template."""
+        local = project / ".cursor" / "rules" / "project" / "local.mdc"
+        local.parent.mkdir()
+        local.write_text((project / ".cursor/rules/core/a.mdc").read_text())
+
+        assert pull(project, template, force=True) == {"unchanged": ["rules/core/a.md"]}
+        assert not (template / "rules" / "project").exists()
+
+    def test_dirty_template_rejected(self, project, template):
+        """Test uncommitted template rule changes raise DirtyTemplateError."""
+        (template / "rules" / "core" / "a.md").write_text(RULE.format(name="edited"))
+        with pytest.raises(DirtyTemplateError):
+            pull(project, template, force=True)
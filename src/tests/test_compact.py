@@ -0,0 +1,96 @@
+"""Tests for near-duplicate compaction of memory-bank logs."""
+
+from lib.compact import compact_file, find_clusters, split_entries
+
+LOG = """# Lessons Learned
+
+## Cache invalidation
+
+Always clear the redis cache after changing the session schema, otherwise
+stale sessions fail to deserialize and users get logged out.
+
+## Cache invalidation again
+
+Always clear the redis cache after changing the session schema, otherwise
+stale sessions fail to deserialize and all users get logged out at once.
+
+## Migrations
+
+Run migrations before deploying the new application image.
+"""
+
+
+class TestSplitEntries:
+    """Test how log files are split into entries."""
+
+    def test_heading_entries(self):
+        """Test level-2 sections become entries."""
+        entries = split_entries(LOG)
+        assert len(entries) == 3
+        assert entries[0].text.startswith("## Cache invalidation\n")
+
+    def test_bullet_entries(self):
+        """Test a bullet list inside a section is split per bullet."""
+        entries = split_entries(
+            "# Log\n\n## Notes\n\n- first item\n- second item\n- third item\n"
+        )
+        assert [e.text.strip() for e in entries] == [
+            "- first item",
+            "- second item",
+            "- third item",
+        ]
+
+    def test_fenced_block_stays_in_entry(self):
+        """Test bullet-like lines inside a code fence do not start entries."""
+        entries = split_entries(
+            "# Log\n\n## Notes\n\n- first item\n```\n- not an item\n```\n"
+            "- second item\n"
+        )
+        assert [e.text for e in entries] == [
+            "- first item\n```\n- not an item\n```\n",
+            "- second item\n",
+        ]
+
+
+class TestCompact:
+    """Test duplicate detection and removal."""
+
+    def test_finds_near_duplicates(self):
+        """Test the two cache entries cluster and the longer one is kept."""
+        clusters = find_clusters(split_entries(LOG))
+        assert len(clusters) == 1
+        assert "at once" in clusters[0].keep.text
+        assert len(clusters[0].drop) == 1
+
+    def test_distinct_entries_not_clustered(self):
+        """Test unrelated entries are left alone."""
+        content = "## A\n\nDeploy with docker compose.\n\n## B\n\nWrite tests for the parser.\n"
+        assert find_clusters(split_entries(content)) == []
+
+    def test_chained_entries_not_dropped(self):
+        """Test only entries similar to the kept one are dropped, not a chain."""
+        words = [f"w{i}" for i in range(40)]
+        first = " ".join(words)
+        second = " ".join(words[4:] + ["p", "q", "r"])
+        third = " ".join(words[14:] + ["p", "q", "r", "s"])
+        content = f"## A\n\n{first}\n\n## B\n\n{second}\n\n## C\n\n{third}\n"
+        clusters = find_clusters(split_entries(content))
+        assert len(clusters) == 1
+        assert clusters[0].keep.text.startswith("## A")
+        assert [e.text[:4] for e in clusters[0].drop] == ["## B"]
+        assert clusters[0].similarity >= 0.6
+
+    def test_dry_run_and_apply(self, tmp_path):
+        """Test compact_file only rewrites the file with apply=True."""
+        path = tmp_path / "lessons_learned.md"
+        path.write_text(LOG)
+
+        clusters, saved_bytes, saved_tokens = compact_file(path)
+        assert len(clusters) == 1 and saved_bytes > 0 and saved_tokens > 0
+        assert path.read_text() == LOG
+
+        compact_file(path, apply=True)
+        result = path.read_text()
+        assert result.count("## Cache invalidation") == 1
+        assert "at once" in result
+        assert "## Migrations" in result
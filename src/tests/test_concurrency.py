@@ -0,0 +1,108 @@
+"""Tests for concurrent generation into one project."""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from lib.commands import generate_impl
+from lib.common import lock_dir, open_atomic
+from lib.console import quiet
+from lib.editors import select_editors
+from lib.sync_state import STATE_FILE, SyncState
+
+RULE = """---
+description: Rule {i}
+activation: {activation}
+{extra}single_file: true
+---
+# Rule {i}
+
+Body of rule {i}.
+"""
+
+
+@pytest.fixture
+def template(tmp_path):
+    root = tmp_path / "src"
+    core = root / "rules" / "core"
+    core.mkdir(parents=True)
+    for i in range(30):
+        activation = ("always", "glob", "agent-requested")[i % 3]
+        extra = 'globs: "*.py"\n' if activation == "glob" else ""
+        (core / f"{i:02d}-rule.md").write_text(
+            RULE.format(i=i, activation=activation, extra=extra)
+        )
+    (core / "README.md").write_text("# Core rules\n")
+    (tmp_path / "memory-bank" / "project").mkdir(parents=True)
+    (tmp_path / "memory-bank" / "project" / "notes.md").write_text("# Notes\n")
+    return root
+
+
+def generate(project, template, sync_state=False, runs=3):
+    with quiet():
+        for _ in range(runs):
+            state = SyncState(project) if sync_state else None
+            try:
+                generate_impl(
+                    project,
+                    select_editors([]),
+                    sync_state=state,
+                    template_folder=template,
+                    check=False,
+                )
+            finally:
+                if state is not None:
+                    state.close()
+
+
+def tree(root):
+    """Relative path -> bytes of every file, without the sync state."""
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and STATE_FILE.parts[0] not in path.relative_to(root).parts
+    }
+
+
+class TestConcurrentGenerate:
+    """Test concurrent runs on one workspace give the same result as one run."""
+
+    @pytest.mark.parametrize("sync_state", [False, True])
+    def test_parallel_runs(self, template, tmp_path, sync_state):
+        """Test parallel generates finish cleanly and match a single run."""
+        reference = tmp_path / "reference"
+        reference.mkdir()
+        generate(reference, template, runs=1)
+
+        project = tmp_path / "project"
+        project.mkdir()
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            futures = [
+                pool.submit(generate, project, template, sync_state) for _ in range(4)
+            ]
+            for future in futures:
+                future.result()
+
+        assert tree(project) == tree(reference)
+        assert not [path for path in project.rglob("*") if path.name.endswith(".tmp")]
+        assert (lock_dir(project) / ".cursor-rules.lock").exists()
+        assert not (project / STATE_FILE.parent / "locks").exists()
+
+
+class TestOpenAtomic:
+    """Test writes through a temporary file."""
+
+    def test_failed_write_keeps_file(self, tmp_path):
+        """Test an error while writing leaves the old content and no temporary file."""
+        path = tmp_path / "CLAUDE.md"
+        path.write_text("old\n")
+        with pytest.raises(RuntimeError):
+            with open_atomic(path) as f:
+                f.write("partial")
+                raise RuntimeError("interrupted")
+        assert path.read_text() == "old\n"
+        assert [p.name for p in tmp_path.iterdir()] == ["CLAUDE.md"]
+
+        with open_atomic(path) as f:
+            f.write("new\n")
+        assert path.read_text() == "new\n"
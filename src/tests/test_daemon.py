@@ -0,0 +1,123 @@
+"""Tests for the rules daemon, its client and the cached lint and render helpers."""
+
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from lib import cursor
+from lib.commands import render_rule, resolve_rule
+from lib.daemon import RulesDaemon
+from lib.common import CACHE_ENV
+from lib.daemon_client import (
+    PING,
+    SOCKET_NAME,
+    STATE_DIR,
+    STOP,
+    is_served,
+    request,
+    run_via_daemon,
+)
+from lib.lint import find_broken_links
+
+SRC_DIR = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    import main
+
+    server = RulesDaemon(main.cli, SRC_DIR.parent, socket_path=tmp_path / "d.sock")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            request(str(server.socket_path), [PING], timeout=1)
+            break
+        except OSError:
+            time.sleep(0.02)
+    yield server
+    request(str(server.socket_path), [STOP], timeout=5)
+    thread.join(timeout=5)
+
+
+class TestDaemon:
+    """Test commands served over the socket."""
+
+    def test_render_matches_in_process(self, daemon):
+        """Test a served render returns the same text and exit status."""
+        response = request(
+            str(daemon.socket_path), ["render", "05-meta-rules", "--editor", "cursor"]
+        )
+        assert response.exit == 0
+        assert response.stdout == render_rule(cursor, resolve_rule("05-meta-rules"))
+
+    def test_errors_keep_exit_status(self, daemon):
+        """Test failing commands report their exit code and the daemon keeps serving."""
+        response = request(
+            str(daemon.socket_path), ["render", "nope", "--editor", "cursor"]
+        )
+        assert response.exit == 1
+        assert "matches no rule" in response.stdout
+        response = request(str(daemon.socket_path), ["render", "--bogus"])
+        assert response.exit == 2
+        assert request(str(daemon.socket_path), [PING]).exit == 0
+
+    def test_client_environment(self, daemon, tmp_path):
+        """Test served commands see the client's cache, not the daemon's."""
+        own = os.environ.get(CACHE_ENV)
+        response = request(
+            str(daemon.socket_path),
+            ["generate", "--bundle", "--editor", "windsurf", "--compression", "none"],
+            env={CACHE_ENV: str(tmp_path / "client-cache")},
+        )
+        assert response.exit == 0, response.stdout
+        assert list((tmp_path / "client-cache").glob("rules-*.tar"))
+        assert os.environ.get(CACHE_ENV) == own
+
+    def test_stuck_daemon_falls_back(self, tmp_path, monkeypatch):
+        """Test a daemon that never answers times out into an in-process run."""
+        monkeypatch.delenv("LLM_MEMORY_BANK_NO_DAEMON", raising=False)
+        monkeypatch.setattr("lib.daemon_client.REQUEST_TIMEOUT", 0.1)
+        path = tmp_path / STATE_DIR / SOCKET_NAME
+        path.parent.mkdir()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(str(path))
+            server.listen(1)  # Connections are queued but never answered
+            assert run_via_daemon(["lint"], str(tmp_path)) is None
+
+    def test_served_commands(self):
+        """Test only read-mostly commands are forwarded, never --help."""
+        assert is_served(["lint"])
+        assert is_served(["memory-bank", "search", "x"])
+        assert not is_served(["memory-bank", "journal", "append"])
+        assert not is_served(["lint", "--help"])
+
+
+class TestCachedHelpers:
+    """Test lint and render caches notice changes."""
+
+    def test_broken_links_follow_file_changes(self, tmp_path):
+        """Test a fixed link stops being reported on the next run."""
+        rule = tmp_path / "rules" / "core" / "a.md"
+        rule.parent.mkdir(parents=True)
+        rule.write_text("See [b](rules/core/b.md).\n")
+        [broken] = find_broken_links(tmp_path, tmp_path)
+        assert (broken.line, broken.column, broken.link) == (1, 5, "rules/core/b.md")
+
+        (tmp_path / "rules" / "core" / "b.md").write_text("# B\n")
+        assert find_broken_links(tmp_path, tmp_path) == []
+
+    def test_render_rule_cache_invalidates(self, tmp_path):
+        """Test a changed template is re-rendered."""
+        rule = tmp_path / "rule.md"
+        rule.write_text("---\ndescription: One\nactivation: always\n---\n\nBody\n")
+        assert "description: One" in render_rule(cursor, rule)
+        rule.write_text(
+            "---\ndescription: Two words\nactivation: always\n---\n\nBody\n"
+        )
+        assert "description: Two words" in render_rule(cursor, rule)
@@ -0,0 +1,50 @@
+"""Tests for batched compare-mode diff reports."""
+
+import json
+
+from lib.diff_report import DiffReport, unified_diff
+
+
+class TestUnifiedDiff:
+    """Test the trimmed unified diff."""
+
+    def test_single_change_in_long_file(self):
+        """Test only the changed region and its context are emitted."""
+        old = [f"line {i}" for i in range(100)]
+        new = list(old)
+        new[50] = "changed"
+        lines = unified_diff(old, new, "a/x", "b/x")
+        assert lines[:3] == ["--- a/x", "+++ b/x", "@@ -48,7 +48,7 @@"]
+        assert "-line 50" in lines and "+changed" in lines
+        assert len(lines) == 3 + 7 + 1
+
+    def test_identical_inputs(self):
+        """Test identical inputs produce no diff."""
+        assert unified_diff(["a", "b"], ["a", "b"], "a/x", "b/x") == []
+
+
+class TestDiffReport:
+    """Test collecting and summarizing diffs."""
+
+    def test_summary_and_json(self):
+        """Test line stats and the JSON document."""
+        report = DiffReport()
+        report.add_text("rules/a.md", "one\ntwo\n", "one\nthree\nfour\n")
+        report.add_text("rules/b.md", "x\n", "")
+        assert report.summary() == {"files": 2, "added": 2, "removed": 2}
+
+        data = json.loads(report.to_json())
+        assert data["summary"]["files"] == 2
+        assert data["files"][0]["path"] == "rules/a.md"
+        assert data["files"][0]["diff"].startswith("--- a/rules/a.md\n+++ b/rules/a.md")
+
+    def test_difftool_runs_once(self, tmp_path):
+        """Test the external tool is run once on trees holding every pair."""
+        log = tmp_path / "calls"
+        report = DiffReport()
+        report.add_text("a.md", "old\n", "new\n")
+        report.add_text("core/b.md", "old\n", "new\n")
+        report.run_difftool(f'sh -c \'ls -R "$0" "$1" >> {log}\'')
+        output = log.read_text()
+        assert output.count("current:") == 1 and output.count("proposed:") == 1
+        assert "b.md" in output
@@ -0,0 +1,73 @@
+"""Tests for the editor registry."""
+
+import importlib.metadata
+import types
+
+import pytest
+
+from lib import editors
+from lib.commands import rules_to_project_impl
+
+
+@pytest.fixture(autouse=True)
+def clear_registry_cache():
+    editors.available_editors.cache_clear()
+    yield
+    editors.available_editors.cache_clear()
+
+
+class TestEditorRegistry:
+    """Test editor lookup and selection."""
+
+    def test_builtin_editors(self):
+        """Test the four built-in editors are registered in order."""
+        assert list(editors.available_editors()) == [
+            "cursor",
+            "windsurf",
+            "claude-code",
+            "aider-chat",
+        ]
+        assert editors.available_editors()["claude-code"].output_file == "CLAUDE.md"
+
+    def test_editor_modules_describe_their_layout(self):
+        """Test rule-directory editor modules expose where their rules go."""
+        cursor = editors.available_editors()["cursor"].load()
+        assert (cursor.RULES_DIR, cursor.RULE_SUFFIX) == (".cursor/rules", ".mdc")
+
+    def test_select_editors(self):
+        """Test selection keeps registry order and defaults to all editors."""
+        assert [e.name for e in editors.select_editors(["aider-chat", "cursor"])] == [
+            "cursor",
+            "aider-chat",
+        ]
+        assert len(editors.select_editors([])) == 4
+        with pytest.raises(ValueError, match="Unknown editor: vim"):
+            editors.select_editors(["vim"])
+
+    def test_select_editors_from_generator(self):
+        """Test a generator of names is only consumed once."""
+        names = (name for name in ["windsurf"])
+        assert [e.name for e in editors.select_editors(names)] == ["windsurf"]
+
+    def test_entry_point_editor(self, monkeypatch, tmp_path):
+        """Test a plugin module registered as an entry point can generate rules."""
+        plugin = types.ModuleType("zed_rules")
+        plugin.RULES_DIR = ".zed/rules"
+        plugin.RULE_SUFFIX = ".md"
+        plugin.transform_to_project = lambda src, dst: open(dst, "w").write(
+            "rendered\n"
+        )
+        entry_point = types.SimpleNamespace(name="zed", load=lambda: plugin)
+        monkeypatch.setattr(
+            importlib.metadata, "entry_points", lambda group: [entry_point]
+        )
+
+        editor = editors.available_editors()["zed"]
+        rules_to_project_impl(tmp_path, False, False, editor.load(), editor.name)
+        rendered = [
+            path
+            for path in (tmp_path / ".zed" / "rules").rglob("*.md")
+            if path.name != "README.md"
+        ]
+        assert rendered
+        assert all(path.read_text() == "rendered\n" for path in rendered)
@@ -0,0 +1,46 @@
+"""Tests for fast file comparison and memoized digests."""
+
+import os
+
+from lib.common import _cached_digest, file_digest, filecmp
+
+
+class TestFileCompare:
+    """Test filecmp and memoized digests."""
+
+    def test_filecmp(self, tmp_path):
+        """Test equal, different, different-size and missing files."""
+        a, b, c, d = (tmp_path / name for name in "abcd")
+        a.write_bytes(b"x" * 200_000)
+        b.write_bytes(b"x" * 200_000)
+        c.write_bytes(b"x" * 199_999 + b"y")
+        d.write_bytes(b"x")
+        assert filecmp(a, b)
+        assert not filecmp(a, c)
+        assert not filecmp(a, d)
+        assert not filecmp(a, tmp_path / "missing")
+
+    def test_digest_tracks_changes(self, tmp_path):
+        """Test a file rewritten within one mtime tick gets a new digest."""
+        path = tmp_path / "f"
+        path.write_text("one")
+        first = file_digest(path)
+        assert file_digest(path) == first
+        stat = path.stat()
+        path.write_text("two")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert file_digest(path) != first
+        assert file_digest(tmp_path / "missing") is None
+
+    def test_digest_memoized_for_settled_files(self, tmp_path):
+        """Test only files modified more than RACY_NS ago are memoized."""
+        path = tmp_path / "f"
+        path.write_text("one")
+        before = _cached_digest.cache_info()
+        file_digest(path)
+        assert _cached_digest.cache_info() == before
+
+        os.utime(path, ns=(0, 1))
+        assert file_digest(path) == file_digest(path)
+        after = _cached_digest.cache_info()
+        assert (after.misses - before.misses, after.hits - before.hits) == (1, 1)
@@ -3,10 +3,15 @@
 import pytest
 
 from lib.common import (
+    CURSOR_FRONTMATTER,
+    TEMPLATE_FRONTMATTER,
+    WINDSURF_FRONTMATTER,
+    FrontmatterCodec,
     create_cursor_frontmatter,
     create_windsurf_frontmatter,
     derive_editor_fields,
     extract_frontmatter,
+    dump_frontmatter,
     validate_frontmatter,
 )
 
@@ -431,3 +436,50 @@ class TestEdgeCases:
 
         with pytest.raises(ValueError):
             create_cursor_frontmatter(frontmatter)
+
+
+class TestFrontmatterCodecs:
+    """Test the table-driven header codecs."""
+
+    def test_windsurf_rule_files_use_current_triggers(self):
+        """Test lib.windsurf headers: always_on/model_decision, globs only on glob rules."""
+        assert WINDSURF_FRONTMATTER.header(
+            {"description": "Core", "activation": "always"}
+        ) == ("---\ntrigger: always_on\ndescription: Core\n---")
+        assert WINDSURF_FRONTMATTER.header({"activation": "glob", "globs": "*.py"}) == (
+            "---\ntrigger: glob\ndescription: \nglobs: *.py\n---"
+        )
+        assert WINDSURF_FRONTMATTER.header({"description": "Debug"}) == (
+            "---\ntrigger: manual\ndescription: Debug\n---"
+        )
+
+    def test_template_format_dump(self):
+        """Test pulled rules are written in the template format, globs quoted."""
+        frontmatter = {"description": "TS", "activation": "glob", "globs": "**/*.ts"}
+        dumped = dump_frontmatter(frontmatter, "# Body\n")
+        assert (
+            dumped
+            == '---\ndescription: TS\nactivation: glob\nglobs: "**/*.ts"\n---\n# Body\n'
+        )
+        assert extract_frontmatter(dumped)[0] == frontmatter
+        assert dump_frontmatter({}, "# Body\n") == "# Body\n"
+
+    def test_headers_are_cached(self):
+        """Test rendering the same header again is a cache hit, and errors are not cached."""
+        frontmatter = {"description": "Cached rule", "activation": "manual"}
+        first = CURSOR_FRONTMATTER.header(frontmatter)
+        hits = CURSOR_FRONTMATTER.render.cache_info().hits
+        assert CURSOR_FRONTMATTER.header(dict(frontmatter)) is first
+        assert CURSOR_FRONTMATTER.render.cache_info().hits == hits + 1
+        for _ in range(2):
+            with pytest.raises(ValueError, match="priority field must be an integer"):
+                CURSOR_FRONTMATTER.header({**frontmatter, "priority": "high"})
+
+    def test_unknown_activation_without_fallback(self):
+        """Test codecs without a fallback template reject unknown activations."""
+        codec = FrontmatterCodec({"always": "---\n{description}\n---"})
+        with pytest.raises(ValueError, match="Invalid activation type: sometimes"):
+            codec.header({"activation": "sometimes"})
+        assert TEMPLATE_FRONTMATTER.header({"activation": "sometimes"}) == (
+            "---\ndescription: \nactivation: sometimes\n---\n"
+        )
@@ -0,0 +1,97 @@
+"""Tests for git-index change detection."""
+
+import subprocess
+
+import pytest
+
+from lib import sync_state as sync_state_module
+from lib.api import Project, RuleSet
+from lib.git_index import GitIndex
+from lib.sync_state import SyncState, hash_file
+
+RULE = """---
+description: Indexed rule
+activation: always
+---
+# Indexed
+"""
+
+
+def git(root, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "template"
+    rules = root / "src" / "rules" / "core"
+    rules.mkdir(parents=True)
+    (rules / "01-clean.md").write_text(RULE)
+    (rules / "02-edited.md").write_text(RULE)
+    (root / "memory-bank").mkdir()
+    git(root, "init", "-q")
+    git(root, "add", ".")
+    git(root, "commit", "-q", "-m", "init")
+    return root
+
+
+class TestGitIndex:
+    """Test blob IDs read from git."""
+
+    def test_only_clean_tracked_files(self, repo):
+        """Test edited, deleted and untracked files have no blob ID."""
+        rules = repo / "src" / "rules"
+        (rules / "core" / "02-edited.md").write_text(RULE + "Edited.\n")
+        (rules / "core" / "03-new.md").write_text(RULE)
+        index = GitIndex.load(rules)
+        assert len(index.blob(rules / "core" / "01-clean.md")) == 40
+        assert index.blob(rules / "core" / "02-edited.md") is None
+        assert index.blob(rules / "core" / "03-new.md") is None
+
+        (rules / "core" / "01-clean.md").unlink()
+        assert GitIndex.load(rules).blobs == {}
+
+    def test_outside_git(self, tmp_path):
+        """Test directories outside a work tree have no index."""
+        (tmp_path / "plain").mkdir()
+        assert GitIndex.load(tmp_path / "plain") is None
+        assert GitIndex.load(tmp_path / "missing") is None
+
+
+class TestSyncStateHashes:
+    """Test sync state hashes through the git index."""
+
+    def test_blobs_are_hashed_once(self, repo, tmp_path, monkeypatch):
+        """Test a clean file is read once and then known by its blob across runs."""
+        rule = repo / "src" / "rules" / "core" / "01-clean.md"
+        with SyncState(tmp_path / "project", use_git=True) as state:
+            state.index_tree(rule.parent)
+            assert state.hash_file(rule) == hash_file(rule)
+
+        monkeypatch.setattr(
+            sync_state_module, "hash_file", lambda path: pytest.fail("read")
+        )
+        with SyncState(tmp_path / "project", use_git=True) as state:
+            state.index_tree(rule.parent)
+            assert state.hash_file(rule) is not None
+
+    def test_sync_with_git_index(self, repo, tmp_path):
+        """Test syncs classify rules the same with the git index."""
+        project = Project(tmp_path / "project", RuleSet(repo / "src"))
+        assert project.sync(["cursor"], sync_state=True, git_index=True).summary() == {
+            "created": 2
+        }
+        changes = project.sync(["cursor"], sync_state=True, git_index=True)
+        assert changes.summary() == {"unchanged": 2}
+
+        (repo / "src" / "rules" / "core" / "02-edited.md").write_text(
+            RULE + "Edited.\n"
+        )
+        changes = project.sync(["cursor"], sync_state=True, git_index=True)
+        assert changes.summary() == {"updated": 1, "unchanged": 1}
+        assert project.sync(["cursor"], sync_state=True).summary() == {"unchanged": 2}
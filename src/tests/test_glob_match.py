@@ -0,0 +1,143 @@
+"""Tests for matching paths to glob-activated rules."""
+
+import json
+import random
+import re
+
+import pytest
+from click.testing import CliRunner
+
+from lib import api
+from lib.glob_match import RuleMatcher, expand_braces, glob_to_regex, split_globs
+from lib.rule import load_rules
+
+RULES = {
+    "lang/typescript.md": '"**/*.{ts,tsx}"',
+    "lang/python.md": '"*.py"',
+    "area/api.md": '"src/api/**, docs/api/*.md"',
+    "area/tests.md": '"**/test_*.py,**/*.test.ts"',
+    "area/build.md": '"build/"',
+}
+
+
+@pytest.fixture
+def ruleset(tmp_path):
+    root = tmp_path / "src"
+    for rel, globs in RULES.items():
+        path = root / "rules" / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            f"---\ndescription: {rel}\nactivation: glob\nglobs: {globs}\n---\n# Body\n"
+        )
+    (root / "rules" / "core.md").write_text(
+        "---\ndescription: Core\nactivation: always\n---\n"
+    )
+    return api.RuleSet(root)
+
+
+def names(ruleset, rules):
+    return [ruleset.rule_name(rule) for rule in rules]
+
+
+class TestGlobs:
+    """Test glob translation."""
+
+    @pytest.mark.parametrize(
+        "glob, path, matches",
+        [
+            ("*.py", "a/b/c.py", True),
+            ("*.py", "c.pyc", False),
+            ("src/*.ts", "src/a.ts", True),
+            ("src/*.ts", "src/x/a.ts", False),
+            ("src/**/*.ts", "src/a.ts", True),
+            ("src/**/*.ts", "lib/src/a.ts", False),
+            ("build/", "x/build/out.js", True),
+            ("file?.[!x]d", "file1.md", True),
+            ("file?.[!x]d", "file1.xd", False),
+            ("./docs/**", "docs/a/b.md", True),
+        ],
+    )
+    def test_glob_to_regex(self, glob, path, matches):
+        """Test single globs against paths."""
+        assert bool(re.match(glob_to_regex(glob), path)) == matches
+
+    def test_split_and_expand(self):
+        """Test comma splitting and nested brace expansion."""
+        assert split_globs(' "**/*.ts" , *.py,') == ['"**/*.ts"', "*.py"]
+        assert expand_braces("a/{b,c/{d,e}}.md") == ["a/b.md", "a/c/d.md", "a/c/e.md"]
+        assert expand_braces("a{b.md") == ["a{b.md"]
+
+
+class TestRuleMatcher:
+    """Test the indexed matcher."""
+
+    def test_rules_per_path(self, ruleset):
+        """Test each path gets all and only its glob rules, in rule order."""
+        matches = ruleset.which_rules(
+            [
+                "src/api/tests/test_views.py",
+                "web/app.test.ts",
+                "./docs/api/index.md",
+                "README.md",
+            ]
+        )
+        assert {path: names(ruleset, rules) for path, rules in matches.items()} == {
+            "src/api/tests/test_views.py": [
+                "area/api.md",
+                "area/tests.md",
+                "lang/python.md",
+            ],
+            "web/app.test.ts": ["area/tests.md", "lang/typescript.md"],
+            "./docs/api/index.md": ["area/api.md"],
+            "README.md": [],
+        }
+
+    def test_index_matches_brute_force(self, ruleset):
+        """Test indexed lookups agree with testing every glob against every path."""
+        rules = load_rules(ruleset.rules_dir)
+        matcher = RuleMatcher(rules)
+        globs = [
+            (rule, re.compile(glob_to_regex(expanded)))
+            for rule in matcher.rules
+            for glob in split_globs(rule.globs)
+            for expanded in expand_braces(glob)
+        ]
+        parts = [
+            "src",
+            "api",
+            "docs",
+            "build",
+            "web",
+            "test_x.py",
+            "a.ts",
+            "b.tsx",
+            "c.test.ts",
+            "d.md",
+        ]
+        rng = random.Random(7)
+        for _ in range(500):
+            path = "/".join(rng.choice(parts) for _ in range(rng.randint(1, 5)))
+            expected = {rule.path for rule, regex in globs if regex.match(path)}
+            assert {rule.path for rule in matcher.match(path)} == expected, path
+
+
+class TestWhichRulesCommand:
+    """Test the which-rules command."""
+
+    def test_stdin_and_json(self, ruleset, monkeypatch):
+        """Test paths from stdin in text output and arguments in JSON output."""
+        import main
+
+        monkeypatch.setattr(api, "TEMPLATE_FOLDER", ruleset.root)
+        runner = CliRunner()
+        result = runner.invoke(main.cli, ["which-rules"], input="a.py\nREADME.md\n")
+        assert result.exit_code == 0
+        assert result.output == "a.py: lang/python.md\n"
+
+        result = runner.invoke(
+            main.cli, ["which-rules", "--json", "build/x.js", "b.md"]
+        )
+        assert json.loads(result.output) == {
+            "build/x.js": ["area/build.md"],
+            "b.md": [],
+        }
@@ -0,0 +1,93 @@
+"""Tests for per-writer memory-bank journals."""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from lib.journal import LOGS, Journal
+
+WRITERS = 4
+RECORDS = 25
+
+
+def write_records(project, writer):
+    journal = Journal(project)
+    for i in range(RECORDS):
+        journal.append("lessons_learned", f"{writer}-{i}", "body", writer=writer)
+
+
+def merge(project):
+    return Journal(project).merge()
+
+
+class TestJournal:
+    """Test journal appends and merges."""
+
+    def test_merge_is_ordered_and_exactly_once(self, tmp_path):
+        """Test records from several writers merge in order and only once."""
+        journal = Journal(tmp_path)
+        journal.append("lessons_learned", "one", "first", writer="a")
+        journal.append("lessons_learned", "two", "second", writer="b")
+        journal.append("lessons_learned", "three", "third", writer="a")
+        assert len(journal.pending()) == 3
+
+        assert journal.merge() == {"lessons_learned": 3}
+        assert journal.pending() == []
+        assert journal.merge() == {}
+
+        content = (tmp_path / LOGS["lessons_learned"]).read_text()
+        assert (
+            content.index(" one\n")
+            < content.index(" two\n")
+            < content.index(" three\n")
+        )
+        assert "_Recorded by b_" in content
+
+    def test_concurrent_writers(self, tmp_path):
+        """Test parallel writers and merges record each entry once, in order."""
+        writers = [f"w{k}" for k in range(WRITERS)]
+        with ProcessPoolExecutor(max_workers=WRITERS) as pool:
+            futures = [pool.submit(write_records, tmp_path, w) for w in writers]
+            futures += [pool.submit(merge, tmp_path) for _ in range(2)]
+            for future in futures:
+                future.result()
+        Journal(tmp_path).merge()
+        assert Journal(tmp_path).pending() == []
+
+        content = (tmp_path / LOGS["lessons_learned"]).read_text()
+        for writer in writers:
+            titles = [f" {writer}-{i}\n" for i in range(RECORDS)]
+            assert [content.count(title) for title in titles] == [1] * RECORDS
+            positions = [content.index(title) for title in titles]
+            assert positions == sorted(positions)
+
+    def test_seq_orders_writer_records(self, tmp_path):
+        """Test seq increases per writer, continuing across instances."""
+        journal = Journal(tmp_path)
+        a = journal.append("lessons_learned", "a", "x", writer="w")
+        b = journal.append("lessons_learned", "b", "x", writer="w")
+        assert journal.append("lessons_learned", "c", "x", writer="v").seq == 0
+        d = Journal(tmp_path).append("lessons_learned", "d", "x", writer="w")
+        assert a.seq == 0 < b.seq < d.seq
+
+    def test_merge_retires_journals(self, tmp_path):
+        """Test merged journals are deleted and later appends start new ones."""
+        journal = Journal(tmp_path)
+        journal.append("lessons_learned", "one", "first", writer="a")
+        journal.append("lessons_learned", "two", "second", writer="b")
+        journal.merge()
+        assert sorted(p.name for p in journal.journal_dir.iterdir()) == ["merge.lock"]
+
+        journal.append("lessons_learned", "three", "third", writer="a")
+        assert [r.title for r in journal.pending()] == ["three"]
+        assert journal.merge() == {"lessons_learned": 1}
+        content = (tmp_path / LOGS["lessons_learned"]).read_text()
+        assert [content.count(f" {t}\n") for t in ("one", "two", "three")] == [1] * 3
+
+    def test_rejects_unknown_log_and_writer(self, tmp_path):
+        """Test invalid log names and writer ids raise ValueError."""
+        journal = Journal(tmp_path)
+        with pytest.raises(ValueError):
+            journal.append("nope", "t", "b", writer="a")
+        with pytest.raises(ValueError):
+            journal.append("lessons_learned", "t", "b", writer="../x")
@@ -0,0 +1,58 @@
+"""Tests for markdown link extraction in lint."""
+
+import pytest
+
+from lib import lint
+
+CONTENT = (
+    "# Title\n"
+    "See [a](rules/a.md) and ![img](skip.png).\n"
+    "Ünïcödé prefix → [b](memory-bank/b.md)\n"
+    "[spaced](bad link) then [c](c.md)\n"
+    "[nested [d](d.md)\n"
+    "[nbsp](x\u00a0y) is not a link\n"
+    "\n" * 3 + "tail [e](https://example.com/e)"
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    lint._links_cache.clear()
+    yield
+    lint._links_cache.clear()
+
+
+class TestFileLinks:
+    """Test the text and memory-mapped scanners agree."""
+
+    def test_mapped_scan_matches_text_scan(self, tmp_path, monkeypatch):
+        """Test lines, character columns and links are identical on both paths."""
+        path = tmp_path / "doc.md"
+        path.write_text(CONTENT * 50)
+        expected = lint.file_links(path)
+        assert expected[:4] == [
+            (2, 5, "rules/a.md"),
+            (3, 18, "memory-bank/b.md"),
+            (4, 25, "c.md"),
+            (5, 1, "d.md"),
+        ]
+
+        lint._links_cache.clear()
+        monkeypatch.setattr(lint, "MMAP_THRESHOLD", 1)
+        monkeypatch.setattr(lint, "COUNT_CHUNK", 7)  # Exercise chunked newline counting
+        assert lint.file_links(path) == expected
+
+    def test_large_files_are_mapped(self, tmp_path, monkeypatch):
+        """Test files at the threshold take the mmap path and small ones do not."""
+        monkeypatch.setattr(lint, "MMAP_THRESHOLD", 100)
+        calls = []
+        original = lint._mapped_file_links
+        monkeypatch.setattr(
+            lint, "_mapped_file_links", lambda p: calls.append(p) or original(p)
+        )
+        small, large = tmp_path / "small.md", tmp_path / "large.md"
+        small.write_text("[a](a.md)\n")
+        large.write_text("[a](a.md)\n" * 10)
+        lint.file_links(small)
+        assert lint.file_links(large) == [(line, 1, "a.md") for line in range(1, 11)]
+        assert calls == [large]
@@ -0,0 +1,124 @@
+"""Tests for placing glob-activated rules in nested CLAUDE.md files."""
+
+import pytest
+
+from lib import single_file
+from lib.single_file import GLOB_MARKER, transform_to_project_single_file
+
+
+def rule(activation, description, extra=""):
+    return f"---\ndescription: {description}\nactivation: {activation}\n{extra}---\n# {description}\n"
+
+
+@pytest.fixture
+def template(tmp_path):
+    rules = tmp_path / "template" / "rules"
+    rules.mkdir(parents=True)
+    (rules / "01-core.md").write_text(rule("always", "Core", "single_file: true\n"))
+    (rules / "10-python.md").write_text(rule("glob", "Python style", 'globs: "*.py"\n'))
+    (rules / "20-docs.md").write_text(rule("glob", "Docs style", 'globs: "docs/**"\n'))
+    (rules / "30-config.md").write_text(rule("glob", "Config", 'globs: "*.toml"\n'))
+    (rules / "40-rust.md").write_text(rule("glob", "Rust", 'globs: "**/*.rs"\n'))
+    (rules / "50-opted-out.md").write_text(
+        rule("glob", "Opted out", 'globs: "*.py"\nsingle_file: skip\n')
+    )
+    return tmp_path / "template"
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    for rel in [
+        "pyproject.toml",
+        "src/pkg/a.py",
+        "src/pkg/sub/b.py",
+        "docs/guide/intro.md",
+        "node_modules/x/c.py",
+        ".venv/lib/d.py",
+    ]:
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text("")
+    return root
+
+
+class TestNestedClaude:
+    """Test glob rules are scoped to the directories they match."""
+
+    def test_rules_placed_by_matches(self, template, project):
+        """Test topmost matching directories get nested files and the root gets root matches."""
+        written = transform_to_project_single_file(
+            project, "CLAUDE.md", template_folder=template
+        )
+        assert sorted(written) == sorted(
+            str(project / rel)
+            for rel in ["CLAUDE.md", "src/pkg/CLAUDE.md", "docs/guide/CLAUDE.md"]
+        )
+
+        root = (project / "CLAUDE.md").read_text()
+        assert (
+            "consult `/src/pkg/CLAUDE.md`" in root
+            and "consult `/docs/guide/CLAUDE.md`" in root
+        )
+        assert "## File-Scoped Rules\n\n# Rule: 30-config" in root
+        assert "Python style" not in root and "Rust" not in root
+
+        nested = (project / "src" / "pkg" / "CLAUDE.md").read_text()
+        assert nested.startswith(GLOB_MARKER + "\n# Pkg Instructions")
+        assert "# Rule: 10-python" in nested and "Opted out" not in nested
+        assert "Docs style" in (project / "docs" / "guide" / "CLAUDE.md").read_text()
+        assert not (project / "src" / "pkg" / "sub" / "CLAUDE.md").exists()
+
+    def test_hand_written_files_are_kept(self, template, project):
+        """Test an existing CLAUDE.md without the marker is never overwritten."""
+        own = project / "docs" / "guide" / "CLAUDE.md"
+        own.write_text("# Our docs notes\n")
+        written = transform_to_project_single_file(
+            project, "CLAUDE.md", template_folder=template
+        )
+        assert str(own) not in written
+        assert own.read_text() == "# Our docs notes\n"
+
+        # Generated files are refreshed
+        transform_to_project_single_file(project, "CLAUDE.md", template_folder=template)
+        assert (
+            (project / "src" / "pkg" / "CLAUDE.md").read_text().startswith(GLOB_MARKER)
+        )
+
+    def test_stale_files_removed(self, template, project):
+        """Test generated nested files no glob rule maps to any more are deleted."""
+        transform_to_project_single_file(project, "CLAUDE.md", template_folder=template)
+        own = project / "src" / "CLAUDE.md"
+        own.write_text("# Our notes\n")
+
+        (template / "rules" / "20-docs.md").unlink()
+        transform_to_project_single_file(project, "CLAUDE.md", template_folder=template)
+        assert not (project / "docs" / "guide" / "CLAUDE.md").exists()
+        assert (project / "src" / "pkg" / "CLAUDE.md").exists()
+
+        # Also once no glob rule is left; hand-written files stay
+        for name in ["10-python.md", "30-config.md", "40-rust.md", "50-opted-out.md"]:
+            (template / "rules" / name).unlink()
+        transform_to_project_single_file(project, "CLAUDE.md", template_folder=template)
+        assert not (project / "src" / "pkg" / "CLAUDE.md").exists()
+        assert own.read_text() == "# Our notes\n"
+        assert (project / "CLAUDE.md").exists()
+
+    def test_many_directories_hoisted(self, template, project, monkeypatch):
+        """Test a rule matching too many directories goes to their common ancestor."""
+        monkeypatch.setattr(single_file, "MAX_RULE_DIRS", 1)
+        (project / "src" / "other").mkdir()
+        (project / "src" / "other" / "e.py").write_text("")
+        transform_to_project_single_file(project, "CLAUDE.md", template_folder=template)
+        assert "10-python" in (project / "src" / "CLAUDE.md").read_text()
+        assert not (project / "src" / "pkg" / "CLAUDE.md").exists()
+
+    def test_other_outputs_inline_glob_rules(self, template, project):
+        """Test single-file outputs other than CLAUDE.md carry all glob rules inline."""
+        written = transform_to_project_single_file(
+            project, "CONVENTIONS.md", template_folder=template
+        )
+        assert written == [str(project / "CONVENTIONS.md")]
+        content = (project / "CONVENTIONS.md").read_text()
+        for name in ("10-python", "20-docs", "30-config", "40-rust"):
+            assert f"# Rule: {name}" in content
+        assert "Opted out" not in content
@@ -0,0 +1,59 @@
+"""Tests for the hardlinking content-addressed object store."""
+
+import errno
+import os
+
+from lib import cursor
+from lib.commands import rules_to_project_impl
+from lib.common import scan_tree
+from lib.object_store import ObjectStore
+
+
+class TestObjectStore:
+    """Test storing, linking and verifying objects."""
+
+    def test_projects_share_inodes(self, tmp_path):
+        """Test two projects synced through the store share each rule file."""
+        store = ObjectStore(tmp_path / "objects")
+        for name in ("a", "b"):
+            rules_to_project_impl(
+                tmp_path / name, False, False, cursor, "cursor", object_store=store
+            )
+        rules_a = scan_tree(tmp_path / "a" / ".cursor" / "rules", ".mdc")
+        rules_b = scan_tree(tmp_path / "b" / ".cursor" / "rules", ".mdc")
+        assert rules_a and rules_a.keys() == rules_b.keys()
+        for rel, path in rules_a.items():
+            assert os.path.samefile(path, rules_b[rel])
+
+        stats = store.stats()
+        assert stats.links == 2 * len(rules_a)
+        assert stats.saved_bytes == sum(
+            path.stat().st_size for path in rules_a.values()
+        )
+
+    def test_copy_fallback(self, tmp_path, monkeypatch):
+        """Test files are copied when hardlinks are not possible."""
+        store = ObjectStore(tmp_path / "objects")
+        src = tmp_path / "rule.md"
+        src.write_text("rule\n")
+
+        def no_link(*args):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        monkeypatch.setattr(os, "link", no_link)
+        assert store.install(src, tmp_path / "dst.md") == "copy"
+        assert (tmp_path / "dst.md").read_text() == "rule\n"
+        assert (tmp_path / "dst.md").stat().st_nlink == 1
+
+    def test_verify_detects_and_repairs_corruption(self, tmp_path):
+        """Test an object edited in place is reported and removed with repair."""
+        store = ObjectStore(tmp_path / "objects")
+        digest = store.put_bytes(b"rule\n")
+        obj = store.object_path(digest)
+        assert store.verify()["ok"] == [obj]
+
+        obj.chmod(0o644)
+        obj.write_bytes(b"edited\n")
+        assert store.verify()["corrupt"] == [obj]
+        store.verify(repair=True)
+        assert not obj.exists()
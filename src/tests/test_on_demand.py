@@ -0,0 +1,85 @@
+"""Tests for the on-demand index of agent-requested and manual rules."""
+
+import pytest
+
+from lib.single_file import ON_DEMAND_DIR, transform_to_project_single_file
+
+
+def rule(activation, description, extra=""):
+    return (
+        f"---\ndescription: {description}\nactivation: {activation}\n{extra}---\n"
+        f"# {description}\n\nFull body of {description}. See [core](rules/core/01-core.md).\n"
+    )
+
+
+@pytest.fixture
+def template(tmp_path):
+    rules = tmp_path / "template" / "rules"
+    (rules / "core").mkdir(parents=True)
+    (rules / "workflow").mkdir()
+    (rules / "core" / "01-core.md").write_text(
+        rule("always", "Core", "single_file: true\n")
+    )
+    (rules / "core" / "20-review.md").write_text(
+        rule("agent-requested", "Review checklist")
+    )
+    (rules / "core" / "30-release.md").write_text(rule("manual", "Release steps"))
+    (rules / "core" / "40-hidden.md").write_text(
+        rule("manual", "Hidden", "single_file: false\n")
+    )
+    (rules / "workflow" / "10-plan.md").write_text(
+        rule("agent-requested", "Planning", "single_file: section:workflow\n")
+    )
+    return tmp_path / "template"
+
+
+class TestOnDemandRules:
+    """Test on-demand rules are indexed, not inlined."""
+
+    def test_index_and_bodies(self, template, tmp_path):
+        """Test one index line per rule, full bodies in separate files."""
+        project = tmp_path / "project"
+        project.mkdir()
+        transform_to_project_single_file(project, "CLAUDE.md", template_folder=template)
+
+        main = (project / "CLAUDE.md").read_text()
+        assert (
+            "- **20-review**: Review checklist — `/.llm-rules/core/20-review.md`"
+            in main
+        )
+        assert (
+            "- **30-release** (manual): Release steps — `/.llm-rules/core/30-release.md`"
+            in main
+        )
+        assert "Full body of Review" not in main
+        assert "Hidden" not in main and "Planning" not in main
+        assert "consult `/workflow/CLAUDE.md`" in main
+
+        section = (project / "workflow" / "CLAUDE.md").read_text()
+        assert "- **10-plan**: Planning — `/.llm-rules/workflow/10-plan.md`" in section
+
+        body = (project / ON_DEMAND_DIR / "core" / "20-review.md").read_text()
+        assert body.startswith("# Rule: 20-review\n\n## Review checklist")
+        assert "Full body of Review checklist. See **core**." in body
+        assert not (project / ON_DEMAND_DIR / "core" / "40-hidden.md").exists()
+
+    def test_stale_bodies_removed(self, template, tmp_path):
+        """Test removed rules disappear from the on-demand folder on the next run."""
+        project = tmp_path / "project"
+        project.mkdir()
+        transform_to_project_single_file(project, "CLAUDE.md", template_folder=template)
+        (template / "rules" / "core" / "30-release.md").unlink()
+        transform_to_project_single_file(project, "CLAUDE.md", template_folder=template)
+        assert not (project / ON_DEMAND_DIR / "core" / "30-release.md").exists()
+        assert "30-release" not in (project / "CLAUDE.md").read_text()
+
+    def test_other_outputs_index_everything(self, template, tmp_path):
+        """Test CONVENTIONS.md indexes section rules too, as it has no section files."""
+        project = tmp_path / "project"
+        project.mkdir()
+        transform_to_project_single_file(
+            project, "CONVENTIONS.md", template_folder=template
+        )
+        content = (project / "CONVENTIONS.md").read_text()
+        assert content.count("`/.llm-rules/") == 3
+        assert not (project / "workflow").exists()
@@ -0,0 +1,84 @@
+"""Tests for compact rule records."""
+
+import dataclasses
+
+import pytest
+
+from lib.common import extract_frontmatter
+from lib.rule import Rule, load_rules
+
+RULE = """---
+description: Style guide
+activation: glob
+globs: "*.py"
+single_file: section:src/python
+---
+
+# Style
+
+Body text with ünïcode.
+"""
+
+
+@pytest.fixture
+def rules_dir(tmp_path):
+    (tmp_path / "core").mkdir()
+    (tmp_path / "core" / "07-style.md").write_text(RULE)
+    (tmp_path / "core" / "plain.md").write_text("# No frontmatter\n")
+    (tmp_path / "README.md").write_text("# Readme\n")
+    return tmp_path
+
+
+class TestRule:
+    """Test loading and using Rule records."""
+
+    def test_fields_and_lazy_body(self, rules_dir):
+        """Test fields come from the frontmatter and the body matches extract_frontmatter."""
+        path = rules_dir / "core" / "07-style.md"
+        rule = Rule.load(path)
+        assert rule.name == "07-style"
+        assert rule.priority == 7
+        assert rule.description == "Style guide"
+        assert (rule.activation, rule.trigger, rule.globs) == ("glob", "glob", "*.py")
+        assert rule.single_file == "section:src/python"
+        assert rule.body() == extract_frontmatter(path.read_text())[1]
+        assert rule.frontmatter()["globs"] == "*.py"
+
+        # The body is read when asked for, so edits show up without reloading
+        path.write_text(RULE + "More.\n")
+        assert rule.body().endswith("More.\n")
+
+    def test_body_after_frontmatter_edit(self, rules_dir):
+        """Test body() splits the current file, not at the offset seen on load."""
+        path = rules_dir / "core" / "07-style.md"
+        rule = Rule.load(path)
+        body = rule.body()
+        path.write_text(path.read_text().replace("Style guide", "A longer style guide"))
+        assert rule.body() == body
+
+    def test_validate(self, rules_dir):
+        """Test frontmatter problems found on load are raised by validate()."""
+        rule = Rule.load(rules_dir / "core" / "07-style.md")
+        assert rule.errors == ()
+        rule.validate()
+
+        plain = Rule.load(rules_dir / "core" / "plain.md")
+        with pytest.raises(ValueError, match="Missing required 'activation'"):
+            plain.validate()
+
+    def test_compact_and_immutable(self, rules_dir):
+        """Test records have no __dict__, cannot be changed and share interned values."""
+        first, plain = load_rules(rules_dir)
+        second = Rule.load(rules_dir / "core" / "07-style.md")
+        assert not hasattr(first, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            first.priority = 1
+        assert first.activation is second.activation
+        assert first.single_file is second.single_file
+
+    def test_without_frontmatter(self, rules_dir):
+        """Test files without frontmatter load with defaults and the whole file as body."""
+        rule = Rule.load(rules_dir / "core" / "plain.md")
+        assert (rule.activation, rule.trigger, rule.single_file) == ("", "", None)
+        assert rule.priority == 999
+        assert rule.body() == "# No frontmatter\n"
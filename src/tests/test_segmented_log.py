@@ -0,0 +1,110 @@
+"""Tests for segmented memory-bank logs."""
+
+from datetime import datetime
+
+import pytest
+from click.testing import CliRunner
+
+from lib.segmented_log import LogPolicy, SegmentedLog
+
+
+class TestSegmentedLog:
+    """Test rotation, appends and queries on segmented logs."""
+
+    def make_log(self, tmp_path):
+        head = tmp_path / "memory-bank" / "project" / "troubleshooting_log.md"
+        head.parent.mkdir(parents=True)
+        head.write_text("# Troubleshooting Log\n\nIntro text.\n")
+        return SegmentedLog(head, tmp_path)
+
+    def test_plain_append(self, tmp_path):
+        """Test appends to a file without an index are plain appends."""
+        log = self.make_log(tmp_path)
+        log.append("First", "body one", when=datetime(2026, 1, 2, 3, 4))
+        content = log.head_path.read_text()
+        assert content.endswith(
+            "Intro text.\n\n## 2026-01-02 03:04 First\n\nbody one\n\n"
+        )
+        assert log.policy is None
+
+    def test_size_rotation_keeps_recent_entries(self, tmp_path):
+        """Test entries beyond keep move to numbered segments."""
+        log = self.make_log(tmp_path)
+        log.init(LogPolicy(rotate="size", keep=2))
+        for day in range(1, 6):
+            log.append(f"Entry {day}", "details", when=datetime(2026, 1, day))
+
+        head = log.head_path.read_text()
+        assert "Entry 4" in head and "Entry 5" in head
+        assert "Entry 1" not in head
+        assert "[0001](memory-bank/project/troubleshooting_log/0001.md)" in head
+        segment = log.segment_path("0001").read_text()
+        assert segment.startswith("# Troubleshooting Log: 0001\n")
+        assert all(f"Entry {day}" in segment for day in (1, 2, 3))
+
+    def test_monthly_rotation(self, tmp_path):
+        """Test monthly rotation archives entries by their heading date."""
+        log = self.make_log(tmp_path)
+        log.init(LogPolicy(rotate="monthly", keep=1))
+        log.append("Old", "x", when=datetime(2026, 1, 15))
+        log.append("New", "x", when=datetime(2026, 2, 15))
+        assert "Old" in log.segment_path("2026-01").read_text()
+        assert "New" in log.head_path.read_text()
+
+    def test_query_across_segments(self, tmp_path):
+        """Test queries search head and segments, newest first, honouring since."""
+        log = self.make_log(tmp_path)
+        log.init(LogPolicy(rotate="size", keep=1))
+        log.append("Timeout in worker", "x", when=datetime(2026, 1, 1))
+        log.append("Timeout in api", "x", when=datetime(2026, 3, 1))
+
+        matches = list(log.query("timeout"))
+        assert [m.heading for m in matches] == [
+            "2026-03-01 00:00 Timeout in api",
+            "2026-01-01 00:00 Timeout in worker",
+        ]
+        assert len(list(log.query("timeout", since="2026-02-01"))) == 1
+
+    def test_query_missing_log(self, tmp_path):
+        """Test querying a log that does not exist yet finds nothing."""
+        log = SegmentedLog(tmp_path / "memory-bank" / "project" / "x.md", tmp_path)
+        assert list(log.query("timeout")) == []
+
+    def test_append_creates_log(self, tmp_path):
+        """Test appending to a log that does not exist yet creates it."""
+        import main
+
+        result = CliRunner().invoke(
+            main.cli,
+            ["memory-bank", "log", "append", "--project", str(tmp_path)]
+            + ["--title", "t", "troubleshooting_log", "body"],
+        )
+        assert result.exit_code == 0, result.output
+        head = tmp_path / "memory-bank" / "project" / "troubleshooting_log.md"
+        assert head.read_text().startswith("## ")
+
+    def test_init_empty_log(self, tmp_path):
+        """Test initialising an empty file starts the head with the index."""
+        head = tmp_path / "log.md"
+        head.write_text("")
+        SegmentedLog(head, tmp_path).init(LogPolicy())
+        assert head.read_text().startswith("<!-- segment-index ")
+
+    def test_query_command(self, tmp_path):
+        """Test log query reports missing logs and rejects invalid patterns."""
+        import main
+
+        runner = CliRunner()
+        args = ["memory-bank", "log", "query", "--project", str(tmp_path)]
+        result = runner.invoke(main.cli, [*args, "troubleshooting_log", "timeout"])
+        assert result.exit_code == 0
+        assert "No matching entries." in result.output
+
+        result = runner.invoke(main.cli, [*args, "troubleshooting_log", "foo("])
+        assert result.exit_code == 2
+        assert "Invalid regex" in result.output
+
+    def test_invalid_rotation(self, tmp_path):
+        """Test unknown rotation modes are rejected."""
+        with pytest.raises(ValueError):
+            self.make_log(tmp_path).init(LogPolicy(rotate="weekly"))
@@ -0,0 +1,93 @@
+"""Tests for markdown sections and the memory-bank semantic index."""
+
+import pytest
+
+from lib.sections import split_sections
+
+np = pytest.importorskip("numpy")
+
+from lib.semantic_index import SemanticIndex, chunk_markdown, embed  # noqa: E402
+
+
+class TestSplitSections:
+    """Test heading-based section splitting."""
+
+    def test_sections_roundtrip(self):
+        """Test preamble and sections join back to the original content."""
+        content = "intro\n# Title\n\ntext\n## Sub\n\nmore\n"
+        preamble, sections = split_sections(content)
+        assert preamble == "intro\n"
+        assert [s.heading for s in sections] == ["Title", "Sub"]
+        assert preamble + "".join(s.text for s in sections) == content
+
+    def test_headings_in_code_fences_ignored(self):
+        """Test that '#' lines inside fenced code are not headings."""
+        content = "# Title\n\n```bash\n# not a heading\n```\n"
+        _, sections = split_sections(content)
+        assert len(sections) == 1
+
+    def test_max_level(self):
+        """Test deeper headings stay inside their parent section."""
+        _, sections = split_sections("## A\n### B\n## C\n", max_level=2)
+        assert [s.heading for s in sections] == ["A", "C"]
+
+
+class TestSemanticIndex:
+    """Test index build and search."""
+
+    def write_bank(self, root):
+        bank = root / "memory-bank"
+        (bank / "project").mkdir(parents=True)
+        (bank / "project" / "tech.md").write_text(
+            "# Tech\n\n## Database\n\nWe use PostgreSQL with connection pooling.\n\n"
+            "## Frontend\n\nReact components styled with Tailwind CSS.\n"
+        )
+        return bank
+
+    def test_embed_is_normalized(self):
+        """Test embeddings are unit length and deterministic."""
+        vectors = embed(["postgres connection pool", "react tailwind"], dim=64)
+        assert vectors.shape == (2, 64)
+        assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+        assert np.array_equal(
+            vectors, embed(["postgres connection pool", "react tailwind"], dim=64)
+        )
+
+    def test_chunk_markdown(self):
+        """Test chunks carry heading and line numbers."""
+        chunks = chunk_markdown("# A\n\ntext\n## B\n\nmore\n", "memory-bank/x.md")
+        assert [(c.heading, c.line) for c in chunks] == [("A", 1), ("B", 4)]
+
+    def test_search_ranks_relevant_chunk_first(self, tmp_path):
+        """Test the best hit for a query is the section that mentions it."""
+        bank = self.write_bank(tmp_path)
+        index = SemanticIndex(tmp_path / "index")
+        index.build(bank, dim=128)
+        [hits] = index.search(["postgresql connection pooling"], k=2)
+        assert hits[0].heading == "Database"
+        assert hits[0].score > hits[1].score
+
+    def test_search_in_small_blocks(self, tmp_path, monkeypatch):
+        """Test scoring block by block finds the same hits as one block."""
+        from lib import semantic_index
+
+        bank = self.write_bank(tmp_path)
+        index = SemanticIndex(tmp_path / "index")
+        index.build(bank, dim=128)
+        expected = index.search(["postgresql", "tailwind"], k=3)
+        monkeypatch.setattr(semantic_index, "QUERY_BLOCK_BYTES", 1)  # One row per block
+        assert index.search(["postgresql", "tailwind"], k=3) == expected
+
+    def test_incremental_rebuild(self, tmp_path):
+        """Test unchanged chunks are reused on rebuild."""
+        bank = self.write_bank(tmp_path)
+        index = SemanticIndex(tmp_path / "index")
+        first = index.build(bank, dim=128)
+        assert first["reused"] == 0 and first["embedded"] > 0
+
+        (bank / "project" / "testing.md").write_text(
+            "# Testing\n\nPytest with fixtures.\n"
+        )
+        second = index.build(bank, dim=128)
+        assert second["reused"] == first["embedded"]
+        assert second["embedded"] == 1
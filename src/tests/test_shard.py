@@ -0,0 +1,221 @@
+"""Tests for --shard partitioning and merging shard manifests."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from lib.commands import generate_impl
+from lib.console import quiet
+from lib.editors import select_editors
+from lib.lint import find_broken_links
+from lib.shard import Shard, merge_manifests, shard_of, write_manifest
+
+RULE = """---
+description: Rule {i}
+activation: always
+single_file: true
+---
+# Rule {i}
+
+See [rule {next}](rules/core/{next:02d}-rule.md) and [missing](rules/core/gone-{i}.md).
+"""
+
+
+@pytest.fixture
+def template(tmp_path):
+    root = tmp_path / "src"
+    core = root / "rules" / "core"
+    core.mkdir(parents=True)
+    for i in range(24):
+        (core / f"{i:02d}-rule.md").write_text(RULE.format(i=i, next=(i + 1) % 24))
+    memory_bank = tmp_path / "memory-bank"
+    memory_bank.mkdir()
+    for i in range(6):
+        (memory_bank / f"notes{i}.md").write_text(
+            f"[rule](src/rules/core/{i:02d}-rule.md)\n"
+        )
+    return root
+
+
+def tree(root):
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+def generate(project, template, shard=None):
+    changes = {}
+    with quiet():
+        generate_impl(
+            project,
+            select_editors([]),
+            template_folder=template,
+            changes=changes,
+            shard=shard,
+        )
+    return {
+        outcome: sorted(path.relative_to(project).as_posix() for path in paths)
+        for outcome, paths in changes.items()
+    }
+
+
+class TestShard:
+    """Test parsing shards and splitting work items."""
+
+    def test_parse(self):
+        """Test i/N is 1-based and out-of-range or malformed shards are rejected."""
+        assert Shard.parse("1/4") == Shard(0, 4)
+        assert str(Shard.parse("4/4")) == "4/4"
+        for text in ["0/4", "5/4", "1/0", "4", "a/b", "1/2/3"]:
+            with pytest.raises(ValueError, match="Invalid shard"):
+                Shard.parse(text)
+
+    def test_stable_partition(self):
+        """Test each key belongs to exactly one shard, the same in every process."""
+        keys = [f"rules/core/{i:02d}-rule.md" for i in range(200)]
+        shards = [Shard(index, 4) for index in range(4)]
+        assert all(sum(shard.owns(key) for shard in shards) == 1 for key in keys)
+        assert all(any(shard.owns(key) for key in keys) for shard in shards)
+        # BLAKE2b, not hash(): fixed across runs and platforms
+        assert [shard_of(key, 4) for key in ["rules/core/foo.md", "CLAUDE.md"]] == [
+            1,
+            1,
+        ]
+
+
+class TestShardedRuns:
+    """Test the shards of a run add up to the unsharded run."""
+
+    def test_generate(self, template, tmp_path):
+        """Test every shard writing into one project gives the unsharded outputs."""
+        reference = tmp_path / "reference"
+        reference.mkdir()
+        expected = generate(reference, template)
+
+        project = tmp_path / "project"
+        project.mkdir()
+        for index in range(3):
+            manifest = tmp_path / f"generate-{index}.json"
+            changes = generate(project, template, Shard(index, 3))
+            write_manifest(
+                manifest, "generate", Shard(index, 3), {"changes": changes, "diffs": []}
+            )
+        assert tree(project) == tree(reference)
+        merged = merge_manifests(
+            tmp_path / f"generate-{index}.json" for index in range(3)
+        )
+        assert merged["changes"] == expected
+
+        # A shard only clears its own outputs
+        gone = next(
+            i for i in range(24) if Shard(0, 3).owns(f"rules/core/{i:02d}-rule.md")
+        )
+        (template / "rules" / "core" / f"{gone:02d}-rule.md").unlink()
+        generate(project, template, Shard(0, 3))
+        assert not (
+            project / ".cursor" / "rules" / "core" / f"{gone:02d}-rule.mdc"
+        ).exists()
+        assert len(list((project / ".cursor" / "rules" / "core").iterdir())) == 23
+
+        # Its other outputs are regenerated in place, as in an unsharded run
+        kept = next(
+            i
+            for i in range(24)
+            if i != gone and Shard(0, 3).owns(f"rules/core/{i:02d}-rule.md")
+        )
+        edited = project / ".cursor" / "rules" / "core" / f"{kept:02d}-rule.mdc"
+        edited.write_text("local edit\n")
+        changes = generate(project, template, Shard(0, 3))
+        assert edited.relative_to(project).as_posix() in changes["updated"]
+        assert edited.read_text() != "local edit\n"
+
+    def test_lint(self, template, tmp_path):
+        """Test the merged lint findings of all shards are the unsharded findings."""
+        root = template.parent
+        expected = sorted(
+            (str(b.path), b.line, b.column) for b in find_broken_links(template, root)
+        )
+        assert len(expected) == 24
+
+        for index in range(4):
+            findings = [
+                {
+                    "path": str(b.path),
+                    "line": b.line,
+                    "column": b.column,
+                    "link": b.link,
+                    "target": "",
+                }
+                for b in find_broken_links(template, root, Shard(index, 4))
+            ]
+            write_manifest(
+                tmp_path / f"lint-{index}.json",
+                "lint",
+                Shard(index, 4),
+                {"findings": findings},
+            )
+        merged = merge_manifests(sorted(tmp_path.glob("lint-*.json")))
+        assert [
+            (f["path"], f["line"], f["column"]) for f in merged["findings"]
+        ] == expected
+
+
+class TestMergeShards:
+    """Test manifests must cover a run exactly once."""
+
+    def write(self, tmp_path, name, command, shard):
+        path = tmp_path / name
+        results = (
+            {"findings": []} if command == "lint" else {"changes": {}, "diffs": []}
+        )
+        write_manifest(path, command, Shard.parse(shard), results)
+        return path
+
+    def test_incomplete_runs_fail(self, tmp_path):
+        """Test missing, repeated and mismatched shards raise ValueError."""
+        one = self.write(tmp_path, "a.json", "lint", "1/3")
+        two = self.write(tmp_path, "b.json", "lint", "2/3")
+        with pytest.raises(ValueError, match=r"Missing shards \(of 3\): 3"):
+            merge_manifests([one, two])
+        with pytest.raises(ValueError, match="more than once: 2"):
+            merge_manifests([one, two, two])
+        with pytest.raises(ValueError, match="different shard counts"):
+            merge_manifests([one, self.write(tmp_path, "c.json", "lint", "1/2")])
+        with pytest.raises(ValueError, match="different commands"):
+            merge_manifests([one, self.write(tmp_path, "d.json", "generate", "2/3")])
+        (tmp_path / "e.json").write_text("{}")
+        with pytest.raises(ValueError, match="Not a version 1 shard manifest"):
+            merge_manifests([tmp_path / "e.json"])
+
+    def test_manifest_keys_checked(self, tmp_path):
+        """Test manifests without the keys of their command raise ValueError."""
+        path = tmp_path / "a.json"
+        write_manifest(path, "generate", Shard(0, 1), {"changes": {}})
+        with pytest.raises(ValueError, match="is missing 'diffs'"):
+            merge_manifests([path])
+        write_manifest(path, "bundle", Shard(0, 1), {})
+        with pytest.raises(ValueError, match="Unknown command 'bundle'"):
+            merge_manifests([path])
+
+    def test_merge_shards_command(self, tmp_path):
+        """Test merge-shards prints merged findings, writes them, and exits 1 on gaps."""
+        import main
+
+        paths = [
+            str(self.write(tmp_path, f"{i}.json", "lint", f"{i}/2")) for i in (1, 2)
+        ]
+        output = tmp_path / "merged.json"
+        runner = CliRunner()
+        result = runner.invoke(
+            main.cli, ["merge-shards", *paths, "--output", str(output)]
+        )
+        assert result.exit_code == 0
+        assert "All markdown links are valid (2 shards)!" in result.output
+        assert json.loads(output.read_text())["findings"] == []
+
+        result = runner.invoke(main.cli, ["merge-shards", paths[0]])
+        assert result.exit_code == 1
+        assert "Missing shards (of 2): 2" in result.output
@@ -127,7 +127,7 @@ This is rule 2"""
 
     @patch("glob.glob")
     def test_transform_no_always_rules(self, mock_glob, tmp_path):
-        """Test handling when no rules have activation: always."""
+        """Test manual rules are only indexed when no rules have activation: always."""
         # Create test rule
         rule = """---
 description: Rule 1
@@ -152,8 +152,13 @@ This should not appear"""
             output_path = tmp_path / output_file
             assert output_path.exists()
             content = output_path.read_text()
-            # Should be empty or have minimal content when no rules match
-            assert "Rule" not in content
+            # Only a one-line index entry; the body goes to an on-demand file
+            assert "This should not appear" not in content
+            assert "- **rule** (manual): Rule 1 — `/.llm-rules/rule.md`" in content
+            assert (
+                "This should not appear"
+                in (tmp_path / ".llm-rules" / "rule.md").read_text()
+            )
 
     @patch("glob.glob")
     def test_transform_with_section_rules(self, mock_glob, tmp_path):
@@ -296,7 +301,9 @@ API specific instructions"""
             assert "Memory Bank Content 1" in mb_content
             assert "Memory Bank Content 2" in mb_content
             # Check priority order (5 comes before 15)
-            assert mb_content.index("Memory Bank Content 1") < mb_content.index("Memory Bank Content 2")
+            assert mb_content.index("Memory Bank Content 1") < mb_content.index(
+                "Memory Bank Content 2"
+            )
 
             # Verify api/docs/CLAUDE.md
             api_output = tmp_path / "api" / "docs" / "CLAUDE.md"
@@ -382,7 +389,9 @@ Some content"""
             transform_to_project_single_file(str(tmp_path), "CONVENTIONS.md")
             conventions_content = (tmp_path / "CONVENTIONS.md").read_text()
             assert "# CLAUDE.md" not in conventions_content
-            assert "This file provides guidance to Claude Code" not in conventions_content
+            assert (
+                "This file provides guidance to Claude Code" not in conventions_content
+            )
 
     @patch("glob.glob")
     def test_no_main_rules_with_sections(self, mock_glob, tmp_path):
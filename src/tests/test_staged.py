@@ -0,0 +1,162 @@
+"""Tests for the pre-commit checks of staged files."""
+
+import os
+import subprocess
+
+import pytest
+from click.testing import CliRunner
+
+from lib import cursor, staged
+from lib.staged import check_staged, staged_changes
+
+RULE = """---
+description: Linked rule
+activation: always
+---
+# Rule
+
+See [the other rule](rules/core/02-other.md) and [notes](../memory-bank/notes.md).
+"""
+
+OTHER = """---
+description: Other rule
+activation: manual
+---
+# Other
+"""
+
+NOTES = "# Notes\n\nRead [the rule](src/rules/core/02-other.md).\n"
+
+
+def git(root, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    root = tmp_path / "repo"
+    core = root / "src" / "rules" / "core"
+    core.mkdir(parents=True)
+    (core / "01-rule.md").write_text(RULE)
+    (core / "02-other.md").write_text(OTHER)
+    (root / "memory-bank").mkdir()
+    (root / "memory-bank" / "notes.md").write_text(NOTES)
+    (root / ".cursor" / "rules" / "core").mkdir(parents=True)
+    mdc = root / ".cursor" / "rules" / "core" / "02-other.mdc"
+    cursor.transform_to_project(core / "02-other.md", mdc)
+    git(root, "init", "-q")
+    git(root, "add", ".")
+    git(root, "commit", "-q", "-m", "init")
+    monkeypatch.setattr(staged, "TEMPLATE_FOLDER", root / "src")
+    return root
+
+
+def messages(findings):
+    return [(finding.path.as_posix(), finding.message) for finding in findings]
+
+
+class TestStagedChecks:
+    """Test checks of the staged content."""
+
+    def test_nothing_staged(self, repo):
+        """Test a clean index has no findings and lists no changes."""
+        assert staged_changes(repo) == []
+        assert check_staged(repo) == []
+
+    def test_staged_content_is_checked(self, repo):
+        """Test frontmatter and links come from the index, not the worktree."""
+        rule = repo / "src" / "rules" / "core" / "01-rule.md"
+        broken = (
+            RULE.replace("activation: always\n", "") + "[gone](rules/core/09-gone.md)\n"
+        )
+        rule.write_text(broken)
+        git(repo, "add", ".")
+        rule.write_text(RULE)  # Unstaged fix: the commit would still be broken
+
+        found = messages(check_staged(repo / "src"))
+        assert len(found) == 2
+        assert found[0][0] == "src/rules/core/01-rule.md"
+        assert found[0][1].startswith("Missing required 'activation' field")
+        assert found[1][1] == (
+            "line 7: broken link: rules/core/09-gone.md -> src/rules/core/09-gone.md"
+        )
+
+    def test_links_to_deleted_and_renamed_files(self, repo):
+        """Test unchanged files linking to a removed rule are reported."""
+        git(repo, "mv", "src/rules/core/02-other.md", "src/rules/core/03-other.md")
+        found = messages(check_staged(repo))
+        assert found == [
+            (
+                "memory-bank/notes.md",
+                "line 3: link to src/rules/core/02-other.md, which is renamed to "
+                "src/rules/core/03-other.md: src/rules/core/02-other.md",
+            ),
+            (
+                "src/rules/core/01-rule.md",
+                "line 7: link to src/rules/core/02-other.md, which is renamed to "
+                "src/rules/core/03-other.md: rules/core/02-other.md",
+            ),
+        ]
+
+        git(repo, "rm", "-q", "--cached", "src/rules/core/03-other.md")
+        found = messages(check_staged(repo))
+        assert [message.split(", which ")[1] for _, message in found] == [
+            "is deleted: src/rules/core/02-other.md",
+            "is deleted: rules/core/02-other.md",
+        ]
+
+    def test_editor_round_trip(self, repo):
+        """Test staged editor rules must survive a pull and a regenerate."""
+        mdc = repo / ".cursor" / "rules" / "core" / "02-other.mdc"
+        mdc.write_text(mdc.read_text() + "More guidance.\n")
+        git(repo, "add", ".")
+        assert check_staged(repo) == []
+
+        mdc.write_text(
+            mdc.read_text().replace("globs: \n", "globs: \nowner: docs-team\n")
+        )
+        git(repo, "add", ".")
+        [(path, message)] = messages(check_staged(repo))
+        assert path == ".cursor/rules/core/02-other.mdc"
+        assert "line 4: does not survive a pull and regenerate" in message
+
+    def test_index_file(self, repo, tmp_path):
+        """Test an alternate index, as git gives hooks for `commit -a`, is read instead."""
+        index = tmp_path / "next-index"
+        index.write_bytes((repo / ".git" / "index").read_bytes())
+        (repo / "memory-bank" / "notes.md").write_text("[missing](nowhere.md)\n")
+        subprocess.run(
+            ["git", "add", "."],
+            cwd=repo,
+            env={**os.environ, "GIT_INDEX_FILE": str(index)},
+            check=True,
+        )
+        assert check_staged(repo) == []
+        [(path, message)] = messages(check_staged(repo, index_file=index))
+        assert message == "line 1: broken link: nowhere.md -> nowhere.md"
+
+    def test_outside_git(self, tmp_path):
+        """Test running outside a repository is a ValueError."""
+        with pytest.raises(ValueError, match="Not in a git repository"):
+            check_staged(tmp_path)
+
+    def test_hook_command(self, repo, monkeypatch):
+        """Test the hook command exits 1 when a staged file fails."""
+        import main
+
+        monkeypatch.chdir(repo)
+        runner = CliRunner()
+        assert runner.invoke(main.cli, ["hook"]).exit_code == 0
+        (repo / "memory-bank" / "notes.md").write_text("[missing](nowhere.md)\n")
+        git(repo, "add", ".")
+        result = runner.invoke(main.cli, ["hook"])
+        assert result.exit_code == 1
+        assert (
+            "notes.md: error: line 1: broken link: nowhere.md -> nowhere.md"
+            in result.output
+        )
@@ -0,0 +1,50 @@
+"""Tests that CLI startup stays lazy."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent
+
+
+class TestLazyStartup:
+    """Test heavy modules are only imported by the commands that need them."""
+
+    def loaded_modules(self, *args):
+        code = (
+            "import sys\n"
+            f"sys.argv = ['main.py', *{list(args)!r}]\n"
+            "import main\n"
+            "try:\n"
+            "    main.cli()\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print(' '.join(sys.modules), file=sys.stderr)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=SRC_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return set(result.stderr.split())
+
+    def test_help_does_not_load_rich_or_editors(self):
+        """Test `lint --help` imports neither the heavy nor the sync modules."""
+        modules = self.loaded_modules("lint", "--help")
+        heavy = {m.split(".")[0] for m in modules} & {"rich", "numpy", "sqlite3"}
+        assert not heavy
+        assert not modules & {
+            "lib.commands",
+            "lib.cursor",
+            "lib.windsurf",
+            "lib.single_file",
+        }
+
+    def test_console_created_on_first_use(self):
+        """Test printing through the shared console loads rich."""
+        modules = self.loaded_modules(
+            "memory-bank", "journal", "status", "--project", str(SRC_DIR)
+        )
+        assert "rich.console" in modules
@@ -0,0 +1,89 @@
+"""Tests for the sync-state database and change-aware rules-to-project."""
+
+from lib import cursor
+from lib.commands import rules_to_project_impl
+from lib.common import scan_tree
+from lib.sync_state import (
+    CONFLICT,
+    NEW,
+    PROJECT_CHANGED,
+    TEMPLATE_CHANGED,
+    UNCHANGED,
+    RuleState,
+    SyncState,
+    classify,
+    hash_file,
+)
+
+
+class TestClassify:
+    """Test rule classification against the last sync."""
+
+    def test_classifications(self):
+        """Test each combination of template and project changes."""
+        previous = RuleState("t", "p")
+        assert classify(None, "t", "p") == NEW
+        assert classify(previous, "t", "p") == UNCHANGED
+        assert classify(previous, "t2", "p") == TEMPLATE_CHANGED
+        assert classify(previous, "t", "p2") == PROJECT_CHANGED
+        assert classify(previous, "t2", "p2") == CONFLICT
+
+
+class TestSyncState:
+    """Test the SQLite store."""
+
+    def test_record_get_forget(self, tmp_path):
+        """Test rows persist across connections and can be removed."""
+        with SyncState(tmp_path) as state:
+            state.record("cursor", "core/a.md", RuleState("t", "p"))
+        with SyncState(tmp_path) as state:
+            assert state.get("cursor", "core/a.md") == RuleState("t", "p")
+            assert state.rules("cursor") == ["core/a.md"]
+            state.forget("cursor", "core/a.md")
+            assert state.get("cursor", "core/a.md") is None
+
+    def test_hash_file_missing(self, tmp_path):
+        """Test hashing a missing file gives None."""
+        assert hash_file(tmp_path / "missing") is None
+
+
+class TestIncrementalSync:
+    """Test rules-to-project with a sync state."""
+
+    def test_local_edits_survive_resync(self, tmp_path):
+        """Test a rule edited in the project is not overwritten on the next sync."""
+        with SyncState(tmp_path) as state:
+            rules_to_project_impl(
+                tmp_path, False, False, cursor, "cursor", sync_state=state
+            )
+
+        outputs = scan_tree(tmp_path / ".cursor" / "rules", ".mdc")
+        assert outputs
+        edited = next(iter(outputs.values()))
+        edited.write_text(edited.read_text() + "\nLocal note.\n")
+
+        with SyncState(tmp_path) as state:
+            rules_to_project_impl(
+                tmp_path, False, False, cursor, "cursor", sync_state=state
+            )
+        assert edited.read_text().endswith("\nLocal note.\n")
+        assert (
+            scan_tree(tmp_path / ".cursor" / "rules", ".mdc").keys() == outputs.keys()
+        )
+
+
+class TestScanTree:
+    """Test the single-pass rule inventory."""
+
+    def test_scan_tree(self, tmp_path):
+        """Test nested files are keyed by posix relative path and filtered by suffix."""
+        (tmp_path / "core").mkdir()
+        (tmp_path / "core" / "a.md").write_text("a")
+        (tmp_path / "b.md").write_text("b")
+        (tmp_path / "c.txt").write_text("c")
+        found = scan_tree(tmp_path, ".md")
+        assert found == {
+            "core/a.md": tmp_path / "core" / "a.md",
+            "b.md": tmp_path / "b.md",
+        }
+        assert scan_tree(tmp_path / "missing", ".md") == {}